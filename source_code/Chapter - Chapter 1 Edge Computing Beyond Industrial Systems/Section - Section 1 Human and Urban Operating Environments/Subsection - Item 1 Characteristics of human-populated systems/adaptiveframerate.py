@@ -4,28 +4,52 @@ import asyncio, time, signal, json
 import paho.mqtt.client as mqtt
 from datetime import datetime
 from inference import PersonDetector  # optimized ONNX/TensorRT wrapper
+from batchinfer import BatchInferenceEngine
 
 BROKER='mqtt.example.local'
-TOPIC_STATE='edge/node/occupancy'
-CAM_DEVICE='/dev/video0'
+TOPIC_STATE='edge/node/{cam}/occupancy'
+CAM_DEVICES=[f'/dev/video{i}' for i in range(8)]
 MIN_FPS=1
 MAX_FPS=15
 CPU_TEMP_THRESHOLD=80.0  # C
+BATCH_MAX=16             # frames per detector call
+BATCH_WAIT_S=0.010       # max time the first frame waits for a batch to fill
+COUNT_ALPHA=0.3          # EMA smoothing of per-camera occupancy
 
 detector = PersonDetector(model_path='/opt/models/person.onnx')
 client = mqtt.Client()
 
-async def capture_and_infer(fps):
-    # camera capture backend; use v4l2 or gstreamer in production
-    frame_interval = 1.0 / fps
-    while True:
-        ts = time.time()
-        frame = await get_frame_async(CAM_DEVICE)  # non-blocking camera API
-        count = detector.detect_count(frame)
-        payload = {'ts': datetime.utcnow().isoformat(), 'count': count}
-        client.publish(TOPIC_STATE, json.dumps(payload), qos=1)
-        # adjust sleep to maintain target fps
-        await asyncio.sleep(max(0, frame_interval - (time.time() - ts)))
+class CameraStream:
+    """Capture loop for one camera; fps is retuned in place, never restarted."""
+    def __init__(self, device, engine, fps=MIN_FPS):
+        self.device = device
+        self.engine = engine
+        self.fps = fps
+        self.recent = 0.0  # exp moving avg of occupancy
+        self._retuned = asyncio.Event()
+
+    def set_fps(self, fps):
+        if fps != self.fps:
+            self.fps = fps
+            self._retuned.set()  # wake a long sleep so the new rate applies now
+
+    async def run(self):
+        # camera capture backend; use v4l2 or gstreamer in production
+        while True:
+            ts = time.time()
+            frame = await get_frame_async(self.device)  # non-blocking camera API
+            count = await self.engine.infer(frame)
+            self.recent = COUNT_ALPHA * count + (1 - COUNT_ALPHA) * self.recent
+            payload = {'ts': datetime.utcnow().isoformat(), 'count': count}
+            client.publish(TOPIC_STATE.format(cam=self.device.rsplit('/', 1)[-1]),
+                           json.dumps(payload), qos=1)
+            # adjust sleep to maintain target fps
+            delay = max(0, 1.0 / self.fps - (time.time() - ts))
+            self._retuned.clear()
+            try:
+                await asyncio.wait_for(self._retuned.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
 
 def cpu_temp_celsius():
     # portable read for Linux sysfs; handle missing files gracefully
@@ -37,25 +61,25 @@ def cpu_temp_celsius():
 
 async def controller():
     # simple controller: increase fps on occupancy, decrease on idle or thermal high
-    fps = MIN_FPS
-    task = asyncio.create_task(capture_and_infer(fps))
+    engine = BatchInferenceEngine(detector, max_batch=BATCH_MAX, max_wait_s=BATCH_WAIT_S)
+    engine.start()
+    streams = [CameraStream(dev, engine) for dev in CAM_DEVICES]
+    tasks = [asyncio.create_task(s.run()) for s in streams]
     try:
         while True:
-            # occupancy trending: subscribe or infer locally (here local poll)
-            recent = await detector.recent_count_avg()  # exp moving avg
             temp = cpu_temp_celsius()
-            if temp > CPU_TEMP_THRESHOLD:
-                fps = MIN_FPS
-            elif recent >= 3:
-                fps = min(MAX_FPS, fps + 2)
-            elif recent == 0:
-                fps = max(MIN_FPS, fps - 1)
-            # restart capture task if fps changed
-            task.cancel()
-            task = asyncio.create_task(capture_and_infer(fps))
+            for s in streams:
+                if temp > CPU_TEMP_THRESHOLD:
+                    s.set_fps(MIN_FPS)
+                elif s.recent >= 3:
+                    s.set_fps(min(MAX_FPS, s.fps + 2))
+                elif s.recent < 0.5:
+                    s.set_fps(max(MIN_FPS, s.fps - 1))
             await asyncio.sleep(2.0)
     finally:
-        task.cancel()
+        for t in tasks:
+            t.cancel()
+        await engine.stop()
 
 def main():
     client.connect(BROKER)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Shared micro-batching inference engine: one detector serves many camera streams.
+import asyncio
+
+class BatchInferenceEngine:
+    """Gather frames from all cameras into deadline-bounded batches, run one call."""
+    def __init__(self, detector, max_batch=16, max_wait_s=0.010):
+        self.detector = detector
+        self.max_batch = max_batch      # upper bound on frames per detector call
+        self.max_wait_s = max_wait_s    # latency budget for filling a batch
+        self.batches = 0
+        self.frames = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def infer(self, frame):
+        # returns this frame's count once its batch has been evaluated
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((frame, fut))
+        return await fut
+
+    def _detect(self, frames):
+        # prefer a native batched call; fall back to per-frame detection
+        batch_fn = getattr(self.detector, 'detect_count_batch', None)
+        if batch_fn is not None:
+            return batch_fn(frames)
+        return [self.detector.detect_count(f) for f in frames]
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_s
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            frames = [frame for frame, _ in batch]
+            try:
+                # run off the event loop so capture coroutines keep filling the next batch
+                counts = await loop.run_in_executor(None, self._detect, frames)
+            except Exception as exc:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            self.batches += 1
+            self.frames += len(batch)
+            for (_, fut), count in zip(batch, counts):
+                if not fut.done():  # caller may have been cancelled
+                    fut.set_result(count)
\ No newline at end of file
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Benchmark: per-frame detection loop vs shared micro-batching engine (stub detector).
+import asyncio, time, argparse
+from batchinfer import BatchInferenceEngine
+
+WARMUP_S = 0.5
+
+class StubDetector:
+    """Fixed per-call overhead plus per-frame cost, like a GPU/NPU launch."""
+    def __init__(self, call_s=0.004, frame_s=0.0005):
+        self.call_s = call_s
+        self.frame_s = frame_s
+    def detect_count(self, frame):
+        time.sleep(self.call_s + self.frame_s)
+        return 1
+    def detect_count_batch(self, frames):
+        time.sleep(self.call_s + self.frame_s * len(frames))
+        return [1] * len(frames)
+
+def p99(xs):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(0.99 * len(xs)))] if xs else float('nan')
+
+async def camera(fps, infer, latencies, warm_until, stop_at):
+    interval = 1.0 / fps
+    while time.perf_counter() < stop_at:
+        ts = time.perf_counter()
+        await infer(object())  # capture is free in the stub
+        if ts >= warm_until:  # skip executor/thread start-up
+            latencies.append(time.perf_counter() - ts)  # capture-to-publish
+        await asyncio.sleep(max(0, interval - (time.perf_counter() - ts)))
+
+async def run(mode, cams, fps, duration, det):
+    latencies = []
+    warm_until = time.perf_counter() + WARMUP_S
+    stop_at = warm_until + duration
+    if mode == 'serial':
+        async def infer(frame):
+            return det.detect_count(frame)  # today's loop: blocks the event loop
+        engine = None
+    else:
+        engine = BatchInferenceEngine(det, max_batch=cams)
+        engine.start()
+        infer = engine.infer
+    await asyncio.gather(*(camera(fps, infer, latencies, warm_until, stop_at) for _ in range(cams)))
+    if engine is not None:
+        await engine.stop()
+    return len(latencies) / duration, p99(latencies) * 1e3
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--fps', type=float, default=15)
+    ap.add_argument('--duration', type=float, default=5.0)
+    args = ap.parse_args()
+    det = StubDetector()
+    print(f"{'cams':>4} {'mode':>7} {'frames/s':>9} {'p99 ms':>8}")
+    for cams in (1, 8, 16):
+        for mode in ('serial', 'batched'):
+            fps_out, lat = asyncio.run(run(mode, cams, args.fps, args.duration, det))
+            print(f"{cams:>4} {mode:>7} {fps_out:>9.1f} {lat:>8.1f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
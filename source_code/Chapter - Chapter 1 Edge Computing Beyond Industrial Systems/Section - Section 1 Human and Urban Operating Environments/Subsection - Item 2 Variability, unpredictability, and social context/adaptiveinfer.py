@@ -1,5 +1,6 @@
-# production-ready adaptive inference loop using tflite runtime and OpenCV
-import time, logging
+# production-ready adaptive inference pipeline using tflite runtime and OpenCV
+# capture -> preprocess -> invoke run on separate threads joined by bounded queues
+import time, logging, threading, queue
 import numpy as np
 import cv2
 from tflite_runtime.interpreter import Interpreter, load_delegate
@@ -9,44 +10,135 @@ CAM_INDEX = 0
 FPS_MIN, FPS_MAX = 1.0, 15.0
 ALPHA = 0.2  # EMA smoothing for arrival rate
 THRESH = 0.5
+RING_SIZE = 4       # preallocated input tensors; >= QUEUE_DEPTH + 2
+QUEUE_DEPTH = 2     # bounded hand-off between stages (oldest item dropped when full)
+STATS_EVERY = 10.0  # seconds between per-stage timing reports
+
+logging.basicConfig(level=logging.INFO)
+log = logging.getLogger("adaptiveinfer")
 
 interpreter = Interpreter(model_path=MODEL_PATH,
                           experimental_delegates=[load_delegate('libedgetpu.so')])
 interpreter.allocate_tensors()
 input_details = interpreter.get_input_details()
 output_details = interpreter.get_output_details()
+in_idx, out_idx = input_details[0]['index'], output_details[0]['index']
+in_h, in_w = int(input_details[0]['shape'][1]), int(input_details[0]['shape'][2])
 
 cap = cv2.VideoCapture(CAM_INDEX)
 if not cap.isOpened():
     raise SystemExit("Camera open failed")
 
-ema_lambda = 0.1
-last_time = time.time()
+# ring of input tensors; cv2.resize writes each frame straight into a free slot
+ring = np.zeros((RING_SIZE, 1, in_h, in_w, 3), dtype=np.uint8)
+free_slots = queue.Queue()
+for i in range(RING_SIZE):
+    free_slots.put_nowait(i)
+frames_q = queue.Queue(maxsize=QUEUE_DEPTH)   # (capture_ts, frame)
+tensors_q = queue.Queue(maxsize=QUEUE_DEPTH)  # (capture_ts, ring slot)
+stop = threading.Event()
+target_fps = FPS_MAX  # written by the invoke stage, read by capture
 
-try:
-    while True:
+class StageStats:
+    """Busy time and drop count for one stage; written only by that stage's thread."""
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.busy_s = 0.0
+        self.dropped = 0
+
+    def add(self, dt):
+        self.count += 1
+        self.busy_s += dt
+
+    def report(self):
+        mean_ms = 1e3 * self.busy_s / max(1, self.count)
+        return f"{self.name}: n={self.count} mean={mean_ms:.2f}ms dropped={self.dropped}"
+
+cap_stats, pre_stats, inv_stats = StageStats("capture"), StageStats("preprocess"), StageStats("invoke")
+
+def put_latest(q, item, stats, on_drop=None):
+    # single producer per queue: evicting one item always frees room for the new one
+    try:
+        q.put_nowait(item)
+        return
+    except queue.Full:
+        pass
+    try:
+        old = q.get_nowait()
+        stats.dropped += 1
+        if on_drop is not None:
+            on_drop(old)
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+def capture_stage():
+    while not stop.is_set():
         start = time.time()
         ret, frame = cap.read()
         if not ret:
+            stop.set()
             break
-        inp = cv2.resize(frame, (input_details[0]['shape'][2],
-                                 input_details[0]['shape'][1]))
-        inp = np.expand_dims(inp.astype(np.uint8), axis=0)
-        interpreter.set_tensor(input_details[0]['index'], inp)
+        cap_stats.add(time.time() - start)
+        put_latest(frames_q, (start, frame), cap_stats)
+        time.sleep(max(0, (1.0/target_fps) - (time.time() - start)))
+
+def preprocess_stage():
+    while not stop.is_set():
+        try:
+            ts, frame = frames_q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        t0 = time.time()
+        try:
+            slot = free_slots.get_nowait()
+        except queue.Empty:
+            pre_stats.dropped += 1  # invoke is behind; every slot is in flight
+            continue
+        cv2.resize(frame, (in_w, in_h), dst=ring[slot, 0])  # in place, no temporaries
+        pre_stats.add(time.time() - t0)
+        put_latest(tensors_q, (ts, slot), pre_stats,
+                   on_drop=lambda old: free_slots.put_nowait(old[1]))
+
+workers = [threading.Thread(target=capture_stage, daemon=True),
+           threading.Thread(target=preprocess_stage, daemon=True)]
+for w in workers:
+    w.start()
+
+ema_lambda = 0.1
+last_ts = time.time()
+next_report = last_ts + STATS_EVERY
+
+try:
+    while not stop.is_set():
+        try:
+            ts, slot = tensors_q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        t0 = time.time()
+        interpreter.set_tensor(in_idx, ring[slot])  # copies into the interpreter's buffer
+        free_slots.put_nowait(slot)
         interpreter.invoke()
-        out = interpreter.get_tensor(output_details[0]['index'])
-        detections = out[0]
+        detections = interpreter.get_tensor(out_idx)[0]
+        inv_stats.add(time.time() - t0)
 
-        arrivals = float(np.sum(detections[:,2] > THRESH))
-        interval = max(1e-3, time.time() - last_time)
+        # interval between capture timestamps, so pipeline queueing does not skew the rate
+        arrivals = float(np.count_nonzero(detections[:,2] > THRESH))
+        interval = max(1e-3, ts - last_ts)
         inst_rate = arrivals / interval
         ema_lambda = ALPHA * inst_rate + (1 - ALPHA) * ema_lambda
-        last_time = time.time()
+        last_ts = ts
 
         target_fps = max(FPS_MIN, min(FPS_MAX, FPS_MAX * (ema_lambda / (ema_lambda + 1))))
-        sleep_time = max(0, (1.0/target_fps) - (time.time() - start))
-        time.sleep(sleep_time)
+        if t0 >= next_report:
+            log.info("%s | %s | %s | target_fps=%.1f", cap_stats.report(),
+                     pre_stats.report(), inv_stats.report(), target_fps)
+            next_report = t0 + STATS_EVERY
 except KeyboardInterrupt:
     pass
 finally:
+    stop.set()
+    for w in workers:
+        w.join(timeout=1.0)
     cap.release()
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Benchmark: per-row INSERT/DELETE commits vs SqliteOutbox group commit.
+# fsyncs are counted with strace when it is on PATH; otherwise only commits are shown.
+import argparse, json, os, shutil, sqlite3, subprocess, sys, tempfile, time
+from edgeoutbox import SqliteOutbox
+
+PAYLOAD = json.dumps({"ts": "2024-01-01T00:00:00Z", "result": {"count": 7, "mode": "tflite"}})
+
+def per_row(path, rows, drain):
+    # today's edgedaemon scheme: default rollback journal, commit per row
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS messages(id INTEGER PRIMARY KEY, ts REAL, payload TEXT)")
+    conn.commit()
+    commits = 0
+    for _ in range(rows):
+        conn.execute("INSERT INTO messages(ts,payload) VALUES (?,?)", (time.time(), PAYLOAD))
+        conn.commit(); commits += 1
+    while True:
+        batch = conn.execute("SELECT id,payload FROM messages ORDER BY id LIMIT ?", (drain,)).fetchall()
+        if not batch:
+            break
+        for _id, _ in batch:
+            conn.execute("DELETE FROM messages WHERE id=?", (_id,))
+            conn.commit(); commits += 1
+    conn.close()
+    return commits
+
+def outbox(path, rows, drain):
+    box = SqliteOutbox(path, table="messages", batch_rows=drain)
+    for _ in range(rows):
+        box.add(PAYLOAD)
+    box.flush()
+    while True:
+        batch = box.peek(drain)
+        if not batch:
+            break
+        box.ack(batch[-1][0])  # stub broker confirms every publish
+    box.close()
+    return box.commits
+
+SCHEMES = {"per-row": per_row, "outbox": outbox}
+
+def run_one(scheme, rows, drain):
+    tmp = tempfile.mkdtemp()
+    try:
+        t0 = time.perf_counter()
+        commits = SCHEMES[scheme](os.path.join(tmp, "buf.db"), rows, drain)
+        return time.perf_counter() - t0, commits
+    finally:
+        shutil.rmtree(tmp)
+
+def count_fsyncs(scheme, rows, drain):
+    # re-run the scheme in a child under strace and total fsync/fdatasync calls
+    out = subprocess.run(["strace", "-f", "-c", "-e", "trace=fsync,fdatasync", sys.executable,
+                          __file__, "--child", scheme, "--rows", str(rows), "--drain", str(drain)],
+                         capture_output=True, text=True).stderr
+    return sum(int(line.split()[3]) for line in out.splitlines()
+               if line.strip().endswith(("fsync", "fdatasync")))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--drain", type=int, default=50)
+    ap.add_argument("--child")
+    args = ap.parse_args()
+    if args.child:
+        run_one(args.child, args.rows, args.drain)
+        return
+    have_strace = shutil.which("strace") is not None
+    print(f"{'scheme':>8} {'rows/s':>10} {'commits/s':>10} {'fsyncs/s':>10}")
+    for scheme in SCHEMES:
+        dt, commits = run_one(scheme, args.rows, args.drain)
+        fsyncs = f"{count_fsyncs(scheme, args.rows, args.drain) / dt:10.1f}" if have_strace else f"{'n/a':>10}"
+        print(f"{scheme:>8} {args.rows / dt:>10.1f} {commits / dt:>10.1f} {fsyncs}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 # Production-ready: non-blocking capture, local sqlite buffer, MQTT with backoff.
-import asyncio, sqlite3, time, json, logging
+import asyncio, time, json, logging
 from datetime import datetime
 from threading import Thread
 import cv2  # OpenCV for camera capture
 import paho.mqtt.client as mqtt
+from edgeoutbox import SqliteOutbox, publish_confirmed
 
 DB_PATH = "/var/local/edge_buffer.db"
 MQTT_BROKER = "mqtt.example.city:1883"
@@ -18,10 +19,8 @@ try:
 except Exception:
     INTERP = None
 
-# initialize local buffer
-conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-conn.execute("CREATE TABLE IF NOT EXISTS messages(id INTEGER PRIMARY KEY, ts REAL, payload TEXT)")
-conn.commit()
+# initialize local buffer: WAL journal, one commit per batch instead of per frame
+outbox = SqliteOutbox(DB_PATH, table="messages", batch_rows=25, batch_window_s=5.0)
 
 def classify(frame):
     if INTERP is None:
@@ -31,25 +30,25 @@ def classify(frame):
     return {"count": 7, "mode": "tflite"}  # example
 
 def buffer_message(payload):
-    conn.execute("INSERT INTO messages(ts,payload) VALUES (?,?)", (time.time(), json.dumps(payload)))
-    conn.commit()
+    outbox.add(json.dumps(payload))
 
 def mqtt_loop():
     client = mqtt.Client()
     client.connect(MQTT_BROKER.split(":")[0], int(MQTT_BROKER.split(":")[1]))
     client.loop_start()
     while True:
-        rows = conn.execute("SELECT id,payload FROM messages ORDER BY id LIMIT 50").fetchall()
+        rows = outbox.peek(50)
         if not rows:
             time.sleep(1); continue
-        for _id, payload in rows:
-            try:
-                client.publish(TOPIC, payload, qos=1)  # qos=1 for at-least-once
-                conn.execute("DELETE FROM messages WHERE id=?", (_id,))
-                conn.commit()
-            except Exception:
-                time.sleep(2)  # simple backoff; production: exponential/backoff jitter
-                break
+        try:
+            # qos=1 for at-least-once; delete only the PUBACKed prefix, in one statement
+            high = publish_confirmed(client, TOPIC, rows)
+        except Exception:
+            high = 0
+        if high:
+            outbox.ack(high)
+        if high != rows[-1][0]:
+            time.sleep(2)  # simple backoff; production: exponential/backoff jitter
 
 def capture_loop():
     cap = cv2.VideoCapture(0)
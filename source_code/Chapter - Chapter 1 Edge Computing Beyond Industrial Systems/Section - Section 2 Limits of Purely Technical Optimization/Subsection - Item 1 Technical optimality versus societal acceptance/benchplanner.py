@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Benchmark: scalar evaluate_candidates vs columnar evaluate_candidates_vec.
+import argparse, time
+import numpy as np
+from planner import CandidateTable, evaluate_candidates, evaluate_candidates_vec
+
+DEVICES = {"jetson": {"max_resolution": 2160, "flops": 40.0, "max_power": 30.0},
+           "coral":  {"max_resolution": 1080, "flops": 8.0,  "max_power": 4.0},
+           "rpi":    {"max_resolution": 720,  "flops": 2.0,  "max_power": 7.0}}
+
+def make_sweep(n, seed=0):
+    # resolution x model x device configurations, flattened and sampled to n rows
+    rng = np.random.default_rng(seed)
+    names = np.array(sorted(DEVICES))
+    table = CandidateTable(ids=range(n),
+                           device_type=names[rng.integers(0, len(names), n)],
+                           resolution=rng.choice([240, 360, 480, 720, 1080, 2160], n),
+                           model_flops=rng.choice([0.5, 1.0, 2.0, 4.0, 8.0], n),
+                           base_accuracy=rng.uniform(0.6, 0.95, n),
+                           power_draw=rng.uniform(1.0, 30.0, n))
+    audits = {"default": {"privacy": 0.2, "fairness": 0.1, "opacity": 0.3, "regulatory": 0.1}}
+    for cid in rng.choice(n, size=min(n, 100), replace=False):
+        audits[int(cid)] = dict(zip(("privacy", "fairness", "opacity", "regulatory"), rng.uniform(0, 1, 4)))
+    return table, audits
+
+def as_dicts(table):
+    names = table.device_names[table.device_codes]
+    return [{"id": table.ids[i], "device_type": names[i], "resolution": table.resolution[i],
+             "model_flops": table.model_flops[i], "base_accuracy": table.base_accuracy[i],
+             "power_draw": table.power_draw[i]} for i in range(len(table))]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--scalar-max", type=int, default=100_000, help="largest n timed on the scalar path")
+    args = ap.parse_args()
+    telemetry = {"device_profiles": DEVICES}
+    print(f"{'n':>9} {'scalar s':>9} {'vector s':>9} {'speedup':>8} {'match':>6}")
+    for n in (1_000, 100_000, 1_000_000):
+        table, audits = make_sweep(n)
+        t0 = time.perf_counter()
+        top = evaluate_candidates_vec(table, telemetry, audits, k=args.k)
+        t_vec = time.perf_counter() - t0
+        if n > args.scalar_max:
+            print(f"{n:>9} {'-':>9} {t_vec:>9.4f} {'-':>8} {'-':>6}")
+            continue
+        cands = as_dicts(table)
+        t0 = time.perf_counter()
+        best = evaluate_candidates(cands, telemetry, audits)
+        t_sc = time.perf_counter() - t0
+        match = (best is None and not top) or (best is not None and top and
+                 best["cand"]["id"] == top[0]["cand"] and best["U"] == top[0]["U"])
+        print(f"{n:>9} {t_sc:>9.4f} {t_vec:>9.4f} {t_sc / t_vec:>8.1f} {str(match):>6}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -3,13 +3,21 @@
 # Assumes telemetry via MQTT, container orchestration via docker API, and audit scores supplied.
 
 import docker, math, json, time
-from typing import Dict, List
+import numpy as np
+from typing import Dict, List, Optional, Sequence
 
 # Weights tuned by city/operator; can be updated via governance API.
 WEIGHTS = {"w_T": 1.0, "w_A": 2.0, "w_E": 0.5, "w_S": 3.0}
 SOCIAL_LIMITS = {"S_max": 1.0, "A_min": 0.7}
 
-client = docker.from_env(timeout=10)  # control-plane to start/stop containers
+client = None  # control-plane to start/stop containers
+
+def docker_client():
+    # connect on first use so planning sweeps and benchmarks need no daemon
+    global client
+    if client is None:
+        client = docker.from_env(timeout=10)
+    return client
 
 def compute_U(metrics: Dict, social: Dict, weights: Dict = WEIGHTS) -> float:
     # metrics: measured latency, accuracy, energy (normalized 0..1)
@@ -44,4 +52,67 @@ def telemetry_predict(cand: Dict, telemetry: Dict) -> Dict:
     return {"latency": latency, "accuracy": accuracy, "energy": energy}
 
 # Example usage: compute plan and launch container if approved.
-# Orchestrator would call evaluate_candidates periodically or on policy change.
\ No newline at end of file
+# Orchestrator would call evaluate_candidates periodically or on policy change.
+
+# ---- Columnar path: score every candidate in one pass with NumPy ----
+
+class CandidateTable:
+    """Candidates stored column-wise; row i of every array describes candidate i."""
+    def __init__(self, ids: Sequence, device_type: Sequence[str], resolution, model_flops,
+                 base_accuracy, power_draw, source: Optional[List[Dict]] = None):
+        self.ids = list(ids)
+        self.row_of = {cid: i for i, cid in enumerate(self.ids)}
+        # device types as small integer codes, so profile lookups become fancy indexing
+        self.device_names, self.device_codes = np.unique(np.asarray(device_type), return_inverse=True)
+        self.resolution = np.asarray(resolution, dtype=np.float64)
+        self.model_flops = np.asarray(model_flops, dtype=np.float64)
+        self.base_accuracy = np.asarray(base_accuracy, dtype=np.float64)
+        self.power_draw = np.asarray(power_draw, dtype=np.float64)
+        self.source = source  # original dicts, when built from them
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_dicts(cls, candidates: List[Dict]) -> "CandidateTable":
+        col = lambda k: [c[k] for c in candidates]
+        return cls(col("id"), col("device_type"), col("resolution"), col("model_flops"),
+                   col("base_accuracy"), col("power_draw"), source=candidates)
+
+def telemetry_predict_columns(table: CandidateTable, telemetry: Dict) -> Dict:
+    # same model as telemetry_predict, one profile lookup per device type
+    profiles = [telemetry["device_profiles"][d] for d in table.device_names]
+    prof = lambda k: np.array([p[k] for p in profiles], dtype=np.float64)[table.device_codes]
+    latency = np.minimum(1.0, (table.resolution/prof("max_resolution")) * (table.model_flops/prof("flops")))
+    accuracy = np.maximum(0.0, table.base_accuracy - 0.2*latency)
+    energy = np.minimum(1.0, table.power_draw/prof("max_power"))
+    return {"latency": latency, "accuracy": accuracy, "energy": energy}
+
+def social_columns(table: CandidateTable, audits: Dict) -> np.ndarray:
+    # start from the default audit and overwrite only the candidates audited by id
+    score = lambda a: (a["privacy"]*0.4 + a["fairness"]*0.3 +
+                       a["opacity"]*0.2 + a["regulatory"]*0.1)
+    S = np.full(len(table), score(audits["default"]), dtype=np.float64)
+    for cid, social in audits.items():
+        row = table.row_of.get(cid)
+        if row is not None:
+            S[row] = score(social)
+    return S
+
+def evaluate_candidates_vec(table: CandidateTable, telemetry: Dict, audits: Dict,
+                            k: int = 1, weights: Dict = WEIGHTS) -> List[Dict]:
+    """Top-k admissible candidates by U, best first; matches evaluate_candidates for k=1."""
+    m = telemetry_predict_columns(table, telemetry)
+    A = m["accuracy"]
+    S = social_columns(table, audits)
+    U = (weights["w_T"]*(1.0 - m["latency"]) + weights["w_A"]*A -
+         weights["w_E"]*m["energy"] - weights["w_S"]*S)
+    ok = np.flatnonzero((S <= SOCIAL_LIMITS["S_max"]) & (A >= SOCIAL_LIMITS["A_min"]))
+    if k < ok.size:
+        # keep everything tied with the k-th best so the tie-break below stays exact
+        kth = -np.partition(-U[ok], k - 1)[k - 1]
+        ok = ok[U[ok] >= kth]
+    # ties resolve to the earliest candidate, like the scalar loop's strict '>'
+    ok = ok[np.lexsort((ok, -U[ok]))][:k]
+    return [{"cand": table.source[i] if table.source is not None else table.ids[i],
+             "U": float(U[i]), "S": float(S[i]), "A": float(A[i])} for i in ok]
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Benchmark: client-per-publish and one-client-per-message vs EdgePublisher
+# (events, last-value-wins state, binary batches) against a local stub broker.
+# CPU is the publishing process only (time.process_time, all threads).
+import argparse, json, multiprocessing as mp, socket, struct, threading, time
+import paho.mqtt.client as mqtt
+from edgepublisher import EdgePublisher, unpack_batch
+
+BATCH_TOPIC = "edge/batch"
+
+def _read_exact(sock, n):
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError
+        buf += chunk
+    return buf
+
+def _serve(conn, received):
+    # just enough MQTT 3.1.1: CONNECT, PUBLISH qos0/1, PINGREQ, DISCONNECT
+    try:
+        while True:
+            head = _read_exact(conn, 1)[0]
+            length, mult = 0, 1
+            while True:
+                b = _read_exact(conn, 1)[0]
+                length += (b & 0x7F) * mult; mult <<= 7
+                if not b & 0x80:
+                    break
+            body = _read_exact(conn, length) if length else b""
+            kind = head >> 4
+            if kind == 1:
+                conn.sendall(b"\x20\x02\x00\x00")
+            elif kind == 3:
+                (tl,) = struct.unpack_from(">H", body)
+                topic = body[2:2+tl].decode()
+                pos = 2 + tl
+                if (head >> 1) & 3:
+                    conn.sendall(b"\x40\x02" + body[pos:pos+2]); pos += 2
+                n = len(unpack_batch(body[pos:])) if topic == BATCH_TOPIC else 1
+                with received.get_lock():
+                    received.value += n
+            elif kind == 12:
+                conn.sendall(b"\xd0\x00")
+            elif kind == 14:
+                return
+    except ConnectionError:
+        pass
+    finally:
+        conn.close()
+
+def stub_broker(port, received, ready):
+    srv = socket.socket(); srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    srv.bind(("127.0.0.1", port)); srv.listen(64); ready.set()
+    while True:
+        conn, _ = srv.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        threading.Thread(target=_serve, args=(conn, received), daemon=True).start()
+
+def messages(n, topics):
+    for i in range(n):
+        yield f"edge/device/{i % topics}/health", json.dumps({"seq": i, "status": "ok", "ts": time.time()})
+
+def client_per_publish(port, n, topics):
+    # adaptivecontroller's old scheme: connect, publish, drop the client
+    for topic, payload in messages(n, topics):
+        c = mqtt.Client()
+        c.connect("127.0.0.1", port)
+        c.publish(topic, payload)
+        c.loop(0.01)
+        c.disconnect()
+
+def one_client(port, n, topics):
+    done = threading.Semaphore(0)
+    c = mqtt.Client()
+    c.max_inflight_messages_set(20)
+    c.on_publish = lambda *_: done.release()
+    c.connect("127.0.0.1", port); c.loop_start()
+    for topic, payload in messages(n, topics):
+        c.publish(topic, payload, qos=1)
+    for _ in range(n):
+        done.acquire()
+    c.loop_stop(); c.disconnect()
+
+def edge_publisher(port, n, topics, state=False, **kw):
+    pub = EdgePublisher.connect("127.0.0.1", port, policy="block", **kw)
+    send = pub.publish_state if state else pub.publish
+    for topic, payload in messages(n, topics):
+        send(topic, payload, qos=1)
+    pub.stop()
+
+def run(name, fn, received, *args, **kw):
+    before = received.value
+    c0, t0 = time.process_time(), time.perf_counter()
+    fn(*args, **kw)
+    cpu, wall = time.process_time() - c0, time.perf_counter() - t0
+    time.sleep(0.05)
+    n = args[1]
+    print(f"{name:<22}{n:>9}{received.value - before:>11}{n / wall:>12.0f}{1e6 * cpu / n:>12.1f}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=20000)
+    ap.add_argument("--topics", type=int, default=8)
+    ap.add_argument("--port", type=int, default=18830)
+    args = ap.parse_args()
+    received, ready = mp.Value("q", 0), mp.Event()
+    broker = mp.Process(target=stub_broker, args=(args.port, received, ready), daemon=True)
+    broker.start(); ready.wait()
+    n = args.messages
+    print(f"{'scheme':<22}{'offered':>9}{'delivered':>11}{'msgs/s':>12}{'cpu us/msg':>12}")
+    run("client-per-publish", client_per_publish, received, args.port, min(n, 500), args.topics)
+    run("one client, qos1", one_client, received, args.port, n, args.topics)
+    run("publisher events", edge_publisher, received, args.port, n, args.topics)
+    run("publisher state", edge_publisher, received, args.port, n, args.topics, state=True)
+    run("publisher batched", edge_publisher, received, args.port, n, args.topics,
+        batch_topic=BATCH_TOPIC)
+    broker.terminate()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
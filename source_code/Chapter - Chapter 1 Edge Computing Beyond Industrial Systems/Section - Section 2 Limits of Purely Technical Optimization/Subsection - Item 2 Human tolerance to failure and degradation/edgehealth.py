@@ -1,54 +1,74 @@
 #!/usr/bin/env python3
 # Production-ready health monitor: publishes health and triggers fallback.
 import time, json, subprocess
-import paho.mqtt.client as mqtt
+from edgepublisher import EdgePublisher
+from failurerate import WindowedRate, HysteresisLatch
 
 BROKER = "mqtt.city.example"
 TOPIC = "edge/device/health"
 DEVICE_ID = "intersection-42"
-WINDOW = 300              # seconds
-ALPHA = 0.1               # EWMA smoothing
-THRESHOLD = 1e-3          # failure rate threshold (failures per second)
+WINDOWS = (10, 60, 300)   # seconds
+TRIP_WINDOW = 60          # window the fallback decision is taken on
+FAIL_HIGH = 0.30          # failure fraction that engages fallback
+FAIL_LOW = 0.10           # ...and the fraction it must drop below to release
+MIN_SAMPLES = 10          # probes in the trip window before the fraction can engage fallback
+PROBE_MIN_S = 0.25        # probe cadence while failures are being seen
+PROBE_MAX_S = 5.0         # cadence when everything is quiet
+PUBLISH_EVERY_S = 1.0
 
-client = mqtt.Client(client_id=DEVICE_ID)
-client.connect(BROKER, 1883, 60)
+# status is a state topic: only the newest value matters if the link stalls
+pub = EdgePublisher.connect(BROKER, client_id=DEVICE_ID, max_queue=100)
 
-ewma = 0.0
-last = time.time()
+failures = WindowedRate(WINDOWS)
+latch = HysteresisLatch(FAIL_HIGH, FAIL_LOW, min_samples=MIN_SAMPLES)
 
 def publish(status):
-    payload = {"id": DEVICE_ID, "ts": int(time.time()), "status": status}
-    client.publish(TOPIC, json.dumps(payload), qos=1)
+    payload = {"id": DEVICE_ID, "ts": int(time.time()), "status": status,
+               "failures": failures.snapshot()}
+    pub.publish_state(TOPIC, json.dumps(payload), qos=1)
 
 def trigger_local_fallback():
     # Use systemd service to enable safe-controller; preserves audit trail.
     subprocess.run(["systemctl", "start", "safe-traffic-controller.service"],
                    check=True)
 
+def release_local_fallback():
+    subprocess.run(["systemctl", "stop", "safe-traffic-controller.service"],
+                   check=True)
+
 def record_event(success):
-    global ewma, last
-    now = time.time()
-    dt = now - last
-    last = now
-    x = 0.0 if success else 1.0
-    ewma = ALPHA * x + (1 - ALPHA) * ewma
-    # Convert EWMA (per-event) to rate per second over WINDOW
-    rate = ewma / max(1.0, WINDOW)
-    return rate
+    # Exact failures/s per window; the trip decision uses the failure fraction
+    # so that probing faster while degraded does not itself inflate the signal.
+    failures.record(success)
+    return failures.fraction(TRIP_WINDOW), failures.events(TRIP_WINDOW)
+
+def next_interval(interval, success):
+    # probe fast while anything failed recently, back off geometrically otherwise
+    if not success or latch.active or failures.failures(WINDOWS[0]):
+        return PROBE_MIN_S
+    return min(PROBE_MAX_S, interval * 1.5)
 
 def main_loop():
     publish("starting")
+    interval, last_pub = PROBE_MIN_S, 0.0
     while True:
         # Integrate with ML runtime for a success/failure boolean.
         # Replace the following line with an actual inference health probe.
         success = probe_inference_health()  # implement per-platform
-        rate = record_event(success)
-        if rate > THRESHOLD:
-            publish("degraded")
-            trigger_local_fallback()
-        else:
-            publish("ok")
-        time.sleep(1)
+        frac, samples = record_event(success)
+        if latch.update(frac, samples):
+            # systemctl runs once per transition, not once per degraded sample
+            if latch.active:
+                trigger_local_fallback()
+            else:
+                release_local_fallback()
+            last_pub = 0.0
+        now = time.monotonic()
+        if now - last_pub >= PUBLISH_EVERY_S:
+            publish("degraded" if latch.active else "ok")
+            last_pub = now
+        interval = next_interval(interval, success)
+        time.sleep(interval)
 
 if __name__ == "__main__":
     main_loop()
\ No newline at end of file
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Shared MQTT publisher: one persistent connection, bounded in-flight window,
+# last-value-wins coalescing for state topics, optional binary batching.
+import struct, threading
+from collections import OrderedDict, deque
+import paho.mqtt.client as mqtt
+
+BATCH_MAGIC = b"EB1"
+
+def pack_batch(items):
+    # [magic] then per message: u16 topic length, topic, u32 payload length, payload
+    out = [BATCH_MAGIC]
+    for topic, payload in items:
+        t = topic.encode()
+        p = payload.encode() if isinstance(payload, str) else bytes(payload)
+        out += [struct.pack(">H", len(t)), t, struct.pack(">I", len(p)), p]
+    return b"".join(out)
+
+def unpack_batch(data):
+    if data[:3] != BATCH_MAGIC:
+        raise ValueError("not an edge publisher batch")
+    items, pos = [], 3
+    while pos < len(data):
+        (tl,) = struct.unpack_from(">H", data, pos); pos += 2
+        topic = data[pos:pos+tl].decode(); pos += tl
+        (pl,) = struct.unpack_from(">I", data, pos); pos += 4
+        items.append((topic, data[pos:pos+pl])); pos += pl
+    return items
+
+class EdgePublisher:
+    """Queue-backed publisher shared by every loop of an agent.
+
+    publish() enqueues events; publish_state() keeps only the newest payload per
+    topic until it is sent. A sender thread drains both, never holding more than
+    `inflight` unacknowledged messages. When the event queue is full, `policy`
+    decides: 'drop_oldest', 'drop_new' or 'block'.
+    """
+    def __init__(self, client, max_queue=1000, inflight=20, policy="drop_oldest",
+                 batch_topic=None, batch_max=32, linger_s=0.02):
+        if policy not in ("drop_oldest", "drop_new", "block"):
+            raise ValueError(f"unknown backpressure policy: {policy}")
+        self.client = client
+        self.max_queue, self.inflight, self.policy = max_queue, inflight, policy
+        self.batch_topic, self.batch_max, self.linger_s = batch_topic, batch_max, linger_s
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0}
+        self._events = deque()
+        self._latest = OrderedDict()   # topic -> (payload, qos, retain)
+        self._outstanding = 0
+        self._mids = set()    # qos>0 messages paho has accepted but not yet acked
+        # acks for mids not (yet) tracked: a qos>0 ack racing publish() returning,
+        # or a qos0 send notification; bounded, only the most recent matter
+        self._early = OrderedDict()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        client.max_inflight_messages_set(inflight)
+        client.on_publish = self._on_publish
+
+    @classmethod
+    def connect(cls, host, port=1883, client_id="", tls=None, keepalive=60, **kw):
+        """Build a client with reconnect backoff, connect once and start publishing."""
+        client = mqtt.Client(client_id=client_id)
+        if tls is not None:
+            client.tls_set(**tls)
+        client.reconnect_delay_set(min_delay=1, max_delay=30)
+        client.connect(host, port, keepalive)
+        return cls(client, **kw).start()
+
+    def start(self):
+        self._running = True
+        self.client.loop_start()
+        self._thread = threading.Thread(target=self._run, name="edge-publisher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return  # never started: no sender thread or network loop to stop
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.client.loop_stop()
+        self.client.disconnect()
+
+    def publish(self, topic, payload, qos=1, retain=False):
+        """Enqueue an event; returns False if it was dropped by the backpressure policy."""
+        with self._cond:
+            if len(self._events) >= self.max_queue:
+                if self.policy == "drop_new":
+                    self.stats["dropped"] += 1
+                    return False
+                if self.policy == "drop_oldest":
+                    self._events.popleft()
+                    self.stats["dropped"] += 1
+                else:
+                    while len(self._events) >= self.max_queue and self._running:
+                        self._cond.wait()
+            self._events.append((topic, payload, qos, retain))
+            self._cond.notify_all()
+        return True
+
+    def publish_state(self, topic, payload, qos=1, retain=False):
+        """Set the current value of a state topic; unsent older values are superseded."""
+        with self._cond:
+            if topic in self._latest:
+                self.stats["coalesced"] += 1
+            self._latest[topic] = (payload, qos, retain)
+            self._cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._events and not self._latest
+                                       and self._outstanding == 0, timeout)
+
+    def _on_publish(self, client, userdata, mid):
+        with self._cond:
+            if mid in self._mids:
+                self._mids.discard(mid)
+                self._release(1)
+            else:
+                self._early[mid] = None
+                if len(self._early) > 4 * self.inflight:
+                    self._early.popitem(last=False)
+
+    def _release(self, n):
+        # caller holds _cond
+        self._outstanding = max(0, self._outstanding - n)
+        self._cond.notify_all()
+
+    def _track(self, info, qos):
+        """Keep the window slot only for qos>0 messages paho accepted; qos0 packets
+        get no ack to wait for and may be discarded on reconnect without on_publish."""
+        with self._cond:
+            if qos == 0 or info.rc != mqtt.MQTT_ERR_SUCCESS or info.mid in self._early:
+                self._early.pop(info.mid, None)
+                self._release(1)
+            else:
+                self._mids.add(info.mid)
+
+    def _take(self, n):
+        items = []
+        while self._latest and len(items) < n:
+            topic, (payload, qos, retain) = self._latest.popitem(last=False)
+            items.append((topic, payload, qos, retain))
+        while self._events and len(items) < n:
+            items.append(self._events.popleft())
+        return items
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: not self._running or
+                                    ((self._events or self._latest) and self._outstanding < self.inflight))
+                if not self._running and (not (self._events or self._latest)
+                                          or self._outstanding >= self.inflight):
+                    # stopping: done when drained, or when flush() timed out with the
+                    # window full (broker gone); what is still queued is dropped
+                    self.stats["dropped"] += len(self._events) + len(self._latest)
+                    self._events.clear(); self._latest.clear()
+                    return
+                if self.batch_topic and len(self._events) + len(self._latest) < self.batch_max:
+                    self._cond.wait(self.linger_s)  # let a batch fill a little
+                items = self._take(self.batch_max if self.batch_topic else self.inflight - self._outstanding)
+                sends = 1 if self.batch_topic else len(items)
+                self._outstanding += sends
+                self._cond.notify_all()  # wake producers blocked on a full queue
+            if self.batch_topic:
+                payload = pack_batch([(t, p) for t, p, _, _ in items])
+                qos = max(q for _, _, q, _ in items)
+                self._track(self.client.publish(self.batch_topic, payload, qos=qos), qos)
+            else:
+                for topic, payload, qos, retain in items:
+                    self._track(self.client.publish(topic, payload, qos=qos, retain=retain), qos)
+            self.stats["sent"] += len(items)
\ No newline at end of file
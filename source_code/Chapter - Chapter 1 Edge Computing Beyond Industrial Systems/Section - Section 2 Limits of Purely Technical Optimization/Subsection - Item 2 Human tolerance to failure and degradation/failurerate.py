@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Time-bucketed failure counters over several sliding windows, plus a
+# hysteresis latch for edge-triggered fallback.
+import time
+
+class WindowedRate:
+    """Exact event and failure counts over sliding windows (default 10/60/300 s).
+
+    Time is cut into `bucket_s` buckets held in one ring sized for the longest
+    window; each window keeps a running sum, so record() and the readers are O(1)
+    apart from the per-bucket roll, which costs O(len(windows)) per elapsed bucket.
+    """
+    def __init__(self, windows=(10, 60, 300), bucket_s=1.0, clock=time.monotonic):
+        self.windows = tuple(sorted(windows))
+        self.bucket_s = bucket_s
+        self.clock = clock
+        self._nb = [max(1, int(round(w / bucket_s))) for w in self.windows]
+        self._size = self._nb[-1]
+        self._fail = [0] * self._size
+        self._total = [0] * self._size
+        self._sum_fail = [0] * len(self.windows)
+        self._sum_total = [0] * len(self.windows)
+        self._start = self._bucket(clock())
+        self._head = self._start
+
+    def _bucket(self, t):
+        return int(t // self.bucket_s)
+
+    def _advance(self, b):
+        if b - self._head >= self._size:
+            # idle for longer than the longest window: nothing survives
+            self._fail = [0] * self._size; self._total = [0] * self._size
+            self._sum_fail = [0] * len(self.windows); self._sum_total = [0] * len(self.windows)
+            self._head = b
+            return
+        while self._head < b:
+            self._head += 1
+            for i, nb in enumerate(self._nb):
+                old = (self._head - nb) % self._size
+                self._sum_fail[i] -= self._fail[old]
+                self._sum_total[i] -= self._total[old]
+            slot = self._head % self._size
+            self._fail[slot] = 0; self._total[slot] = 0
+
+    def record(self, success, now=None):
+        b = self._bucket(self.clock() if now is None else now)
+        if b > self._head:
+            self._advance(b)
+        slot = self._head % self._size
+        self._total[slot] += 1
+        for i in range(len(self.windows)):
+            self._sum_total[i] += 1
+        if not success:
+            self._fail[slot] += 1
+            for i in range(len(self.windows)):
+                self._sum_fail[i] += 1
+
+    def _index(self, window, now):
+        b = self._bucket(self.clock() if now is None else now)
+        if b > self._head:
+            self._advance(b)
+        return self.windows.index(window), b
+
+    def failures(self, window, now=None):
+        return self._sum_fail[self._index(window, now)[0]]
+
+    def events(self, window, now=None):
+        return self._sum_total[self._index(window, now)[0]]
+
+    def rate(self, window, now=None):
+        """Failures per second over the last `window` seconds (or since start)."""
+        i, b = self._index(window, now)
+        span = min(self._nb[i], b - self._start + 1) * self.bucket_s
+        return self._sum_fail[i] / span
+
+    def fraction(self, window, now=None):
+        """Share of recorded events in the window that were failures."""
+        i, _ = self._index(window, now)
+        return self._sum_fail[i] / self._sum_total[i] if self._sum_total[i] else 0.0
+
+    def snapshot(self, now=None):
+        return {f"{w}s": {"rate": self.rate(w, now), "fraction": self.fraction(w, now),
+                          "failures": self.failures(w, now), "events": self.events(w, now)}
+                for w in self.windows}
+
+class HysteresisLatch:
+    """Two-threshold latch: set above `high`, cleared below `low`.
+
+    update() returns True only on the transition, so actions tied to it run once
+    per episode instead of once per sample. With `min_samples` the latch cannot set
+    until update() is told at least that many samples back the value, so a single
+    failed probe at startup (fraction 1.0) does not trip it.
+    """
+    def __init__(self, high, low, min_samples=0):
+        if low > high:
+            raise ValueError("low threshold must not exceed high threshold")
+        self.high, self.low = high, low
+        self.min_samples = min_samples
+        self.active = False
+
+    def update(self, value, samples=None):
+        if samples is None:
+            if self.min_samples:
+                raise ValueError("latch has min_samples; pass the sample count")
+            samples = 0
+        if not self.active and value > self.high and samples >= self.min_samples:
+            self.active = True
+            return True
+        if self.active and value < self.low:
+            self.active = False
+            return True
+        return False
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Benchmark: per-call Interpreter construction vs InterpreterPool (cold and warm calls).
+# Uses a real model when --model is given, else a stub with typical edge load/alloc costs.
+import argparse, statistics, time
+import numpy as np
+from interpreterpool import InterpreterPool, tflite
+
+class StubInterpreter:
+    LOAD_S, ALLOC_S, INVOKE_S = 0.030, 0.008, 0.002
+    def __init__(self, model_path):
+        time.sleep(self.LOAD_S)
+    def allocate_tensors(self):
+        time.sleep(self.ALLOC_S)
+    def get_input_details(self):
+        return [{'index': 0, 'shape': np.array([1, 300, 300, 3]), 'dtype': np.uint8}]
+    def get_output_details(self):
+        return [{'index': 1, 'shape': np.array([1, 10]), 'dtype': np.float32}]
+    def get_tensor_details(self):
+        return self.get_input_details() + self.get_output_details()
+    def set_tensor(self, idx, value):
+        self._in = value
+    def invoke(self):
+        time.sleep(self.INVOKE_S)
+    def get_tensor(self, idx):
+        return np.zeros((1, 10), np.float32)
+
+def per_call(factory, path, x):
+    # the previous run_tflite: construct and allocate on every call
+    interp = factory(path)
+    interp.allocate_tensors()
+    interp.set_tensor(interp.get_input_details()[0]['index'], x)
+    interp.invoke()
+    return interp.get_tensor(interp.get_output_details()[0]['index'])
+
+def ms(samples):
+    return f"p50 {1e3 * statistics.median(samples):7.2f} ms  max {1e3 * max(samples):7.2f} ms"
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--model', help='real .tflite model (needs tflite_runtime)')
+    ap.add_argument('--calls', type=int, default=50)
+    args = ap.parse_args()
+    if args.model:
+        factory, path = (lambda p: tflite.Interpreter(model_path=p)), args.model
+    else:
+        factory, path = StubInterpreter, 'stub.tflite'
+    d = factory(path).get_input_details()[0]
+    x = np.zeros(d['shape'], dtype=d['dtype'])
+    pool = InterpreterPool(factory=factory)
+    t0 = time.perf_counter(); pool.run(path, x); cold = time.perf_counter() - t0
+    warm, legacy = [], []
+    for _ in range(args.calls):
+        t0 = time.perf_counter(); pool.run(path, x); warm.append(time.perf_counter() - t0)
+        t0 = time.perf_counter(); per_call(factory, path, x); legacy.append(time.perf_counter() - t0)
+    print(f"per-call construction: {ms(legacy)}")
+    print(f"pool cold (first call): {1e3 * cold:7.2f} ms")
+    print(f"pool warm:             {ms(warm)}")
\ No newline at end of file
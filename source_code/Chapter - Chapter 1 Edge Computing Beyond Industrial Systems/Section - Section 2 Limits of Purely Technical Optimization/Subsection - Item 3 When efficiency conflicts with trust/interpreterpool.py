@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Process-wide TFLite interpreter cache: load + allocate once per model, reuse buffers.
+import os, threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+
+try:
+    import tflite_runtime.interpreter as tflite  # lightweight TFLite runtime
+except ImportError:
+    tflite = None
+
+class _Entry:
+    def __init__(self, interp, nbytes):
+        self.interp = interp
+        self.lock = threading.Lock()  # an Interpreter must not be invoked concurrently
+        inp = interp.get_input_details()[0]
+        out = interp.get_output_details()[0]
+        self.in_idx, self.out_idx = inp['index'], out['index']
+        self.input = np.zeros(inp['shape'], dtype=inp['dtype'])    # preallocated
+        self.output = np.zeros(out['shape'], dtype=out['dtype'])
+        self.nbytes = nbytes + self.input.nbytes + self.output.nbytes
+
+class InterpreterPool:
+    """Model-path keyed interpreters, LRU-evicted once resident bytes exceed max_bytes."""
+    def __init__(self, max_bytes=256 << 20, factory=None):
+        self.max_bytes = max_bytes
+        self.resident = 0
+        self._factory = factory or self._load_tflite
+        self._entries = OrderedDict()
+        self._loading = {}            # model_path -> Future of the entry being loaded
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_tflite(model_path):
+        if tflite is None:
+            raise RuntimeError("tflite_runtime is not installed")
+        return tflite.Interpreter(model_path=model_path)
+
+    @staticmethod
+    def _footprint(model_path, interp):
+        # model file plus every tensor the arena holds; close enough for eviction decisions
+        size = os.path.getsize(model_path) if os.path.exists(model_path) else 0
+        for t in interp.get_tensor_details():
+            size += int(np.prod(t['shape'])) * np.dtype(t['dtype']).itemsize
+        return size
+
+    def get(self, model_path):
+        # the pool lock only guards the maps: a cold load runs outside it, so warm
+        # gets for other models never wait, and concurrent gets of the same cold
+        # model share a single load through its future
+        with self._lock:
+            entry = self._entries.get(model_path)
+            if entry is not None:
+                self._entries.move_to_end(model_path)
+                return entry
+            fut = self._loading.get(model_path)
+            loader = fut is None
+            if loader:
+                fut = self._loading[model_path] = Future()
+        if not loader:
+            return fut.result()
+        try:
+            interp = self._factory(model_path)
+            interp.allocate_tensors()
+            entry = _Entry(interp, self._footprint(model_path, interp))
+        except BaseException as e:
+            with self._lock:
+                del self._loading[model_path]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[model_path]
+            self._entries[model_path] = entry
+            self.resident += entry.nbytes
+            # evict least recently used models; a caller mid-invoke keeps its reference
+            while self.resident > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self.resident -= old.nbytes
+        fut.set_result(entry)
+        return entry
+
+    def run(self, model_path, input_tensor, out=None):
+        """Invoke model_path on input_tensor; result is copied into `out` or a new array."""
+        entry = self.get(model_path)
+        with entry.lock:
+            np.copyto(entry.input, np.reshape(input_tensor, entry.input.shape), casting='unsafe')
+            entry.interp.set_tensor(entry.in_idx, entry.input)
+            entry.interp.invoke()
+            np.copyto(entry.output, entry.interp.get_tensor(entry.out_idx))
+            if out is None:
+                return entry.output.copy()
+            np.copyto(out, entry.output)
+            return out
+
+    def warm(self, model_paths):
+        # load, allocate and run each model once at startup so the first real call is warm
+        for path in model_paths:
+            entry = self.get(path)
+            self.run(path, entry.input)
+
+POOL = InterpreterPool()
\ No newline at end of file
@@ -2,7 +2,7 @@
 # Production-ready edge agent: minimal dependencies, TLS MQTT, TFLite inference.
 import time, json, ssl
 import paho.mqtt.client as mqtt
-import tflite_runtime.interpreter as tflite  # lightweight TFLite runtime
+from interpreterpool import POOL  # cached interpreters over the lightweight TFLite runtime
 
 # Config (kept short for clarity)
 MQTT_BROKER = "mec.example.city"
@@ -19,15 +19,9 @@ def compute_trust(requirements):
     score = w[0]*requirements['privacy'] + w[1]*requirements['transparency'] + w[2]*requirements['audit']
     return score
 
-# TFLite helper
+# TFLite helper: load and allocate once per model, then reuse the interpreter
 def run_tflite(model_path, input_tensor):
-    interp = tflite.Interpreter(model_path=model_path)
-    interp.allocate_tensors()
-    input_idx = interp.get_input_details()[0]['index']
-    output_idx = interp.get_output_details()[0]['index']
-    interp.set_tensor(input_idx, input_tensor)
-    interp.invoke()
-    return interp.get_tensor(output_idx)
+    return POOL.run(model_path, input_tensor)
 
 # MQTT TLS client setup
 client = mqtt.Client()
@@ -38,6 +32,7 @@ client.connect(MQTT_BROKER, MQTT_PORT)
 
 # Main loop: capture, evaluate policy, execute local or remote inference
 TRUST_THRESHOLD = 0.7  # policy: minimal composite trust
+POOL.warm([LOCAL_MODEL])  # pay model load and tensor allocation before the 100 ms loop
 while True:
     frame = b'...'  # placeholder: capture frame from camera/ISP
     # estimate runtime trust metrics (example heuristics)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Long-lived placement service: sparse ILP, incremental deltas, warm starts.
+Node joins/leaves and workload churn are repaired greedily at once; the ILP
+then re-optimizes from that placement within a time budget.
+"""
+import time
+import pulp
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+class PlacementService:
+    def __init__(self, default_latency: float = 0.0):
+        self.req: Dict[str, float] = {}                   # workload -> resource demand
+        self.allowed: Dict[str, Set[str]] = {}            # workload -> residency-allowed nodes
+        self.capacity: Dict[str, float] = {}              # node -> capacity
+        self.overcommit: Dict[str, float] = {}            # node -> allowed demand / capacity
+        self.latency: Dict[Tuple[str, str], float] = {}   # (workload, node) -> ms
+        self.latency_nodes: Dict[str, Set[str]] = {}      # workload -> nodes with a latency entry
+        self.latency_workloads: Dict[str, Set[str]] = {}  # node -> workloads with a latency entry
+        self.default_latency = default_latency            # cost of an allowed pair with no entry
+        self.placement: Dict[str, str] = {}
+        self.used: Dict[str, float] = {}
+        self.last_status = "empty"
+
+    # ---- incremental deltas ----
+    def add_node(self, node: str, capacity: float, latencies: Optional[Dict[str, float]] = None,
+                 overcommit: float = 1.0):
+        # re-adding a live node updates its capacity and overcommit in place
+        self.capacity[node] = capacity
+        self.overcommit[node] = overcommit
+        self.used.setdefault(node, 0.0)
+        for w, ms in (latencies or {}).items():
+            self._set_latency(w, node, ms)
+        self._shed(node)
+        self.repair()  # new room may fit workloads that were left unplaced
+
+    def remove_node(self, node: str):
+        self.capacity.pop(node, None)
+        self.overcommit.pop(node, None)
+        self.used.pop(node, None)
+        for w in [w for w, j in self.placement.items() if j == node]:
+            del self.placement[w]
+        # a node that comes back brings fresh latencies; don't keep the dead ones
+        for w in self.latency_workloads.pop(node, ()):
+            del self.latency[(w, node)]
+            self.latency_nodes[w].discard(node)
+        self.repair()
+
+    def add_workload(self, w: str, req: float, allowed: Iterable[str],
+                     latencies: Optional[Dict[str, float]] = None):
+        if w in self.placement:
+            self._unplace(w)
+        self.req[w] = req
+        self.allowed[w] = set(allowed)
+        for j, ms in (latencies or {}).items():
+            self._set_latency(w, j, ms)
+        self.repair()
+
+    def remove_workload(self, w: str):
+        if w in self.placement:
+            self._unplace(w)
+        self.req.pop(w, None)
+        self.allowed.pop(w, None)
+        for j in self.latency_nodes.pop(w, ()):
+            del self.latency[(w, j)]
+            self.latency_workloads[j].discard(w)
+
+    def _set_latency(self, w: str, j: str, ms: float):
+        self.latency[(w, j)] = ms
+        self.latency_nodes.setdefault(w, set()).add(j)
+        self.latency_workloads.setdefault(j, set()).add(w)
+
+    # ---- solving ----
+    def cost(self, w: str, j: str) -> float:
+        return self.latency.get((w, j), self.default_latency)
+
+    def limit(self, j: str) -> float:
+        return self.capacity[j] * self.overcommit[j]
+
+    def pairs(self):
+        # sparse formulation: only residency-allowed pairs on live nodes get a variable
+        return [(w, j) for w, nodes in self.allowed.items() for j in nodes if j in self.capacity]
+
+    def _place(self, w: str, j: str):
+        self.placement[w] = j
+        self.used[j] += self.req[w]
+
+    def _unplace(self, w: str):
+        j = self.placement.pop(w)
+        if j in self.used:
+            self.used[j] -= self.req[w]
+
+    def _shed(self, j: str):
+        # a node that shrank evicts its largest workloads until it fits; repair() rehomes them
+        for w in sorted((w for w, n in self.placement.items() if n == j), key=lambda w: -self.req[w]):
+            if self.used[j] <= self.limit(j):
+                break
+            self._unplace(w)
+
+    def repair(self):
+        """Greedy fill for unplaced workloads, largest demand first; keeps existing choices."""
+        todo = sorted((w for w in self.req if w not in self.placement), key=lambda w: -self.req[w])
+        for w in todo:
+            options = [j for j in self.allowed[w]
+                       if j in self.capacity and self.used[j] + self.req[w] <= self.limit(j)]
+            if options:
+                self._place(w, min(options, key=lambda j: self.cost(w, j)))
+        return self.unplaced()
+
+    def greedy(self):
+        self.placement.clear()
+        self.used = {j: 0.0 for j in self.capacity}
+        return self.repair()
+
+    def unplaced(self) -> Set[str]:
+        return set(self.req) - set(self.placement)
+
+    def total_latency(self) -> float:
+        return sum(self.cost(w, j) for w, j in self.placement.items())
+
+    def solve(self, time_budget_s: float = 10.0) -> Dict[str, str]:
+        """Re-optimize from the current placement; keep the greedy answer if CBC runs out of time."""
+        if self.unplaced():
+            self.repair()
+        start = time.monotonic()
+        pairs = self.pairs()
+        prob = pulp.LpProblem("edge_placement", pulp.LpMinimize)
+        x = {p: pulp.LpVariable(f"x_{n}", cat="Binary") for n, p in enumerate(pairs)}
+        prob += pulp.lpSum(self.cost(w, j) * v for (w, j), v in x.items())
+        by_w: Dict[str, list] = {w: [] for w in self.req}
+        by_j: Dict[str, list] = {j: [] for j in self.capacity}
+        for (w, j), v in x.items():
+            by_w[w].append(v)
+            by_j[j].append(self.req[w] * v)
+            v.setInitialValue(1 if self.placement.get(w) == j else 0)  # warm start
+        for w, vs in by_w.items():
+            if vs:  # a workload with no live allowed node stays unplaced
+                prob += pulp.lpSum(vs) == 1
+        for j, terms in by_j.items():
+            if terms:
+                prob += pulp.lpSum(terms) <= self.limit(j)
+        remaining = time_budget_s - (time.monotonic() - start)
+        if remaining <= 0:
+            self.last_status = "greedy (budget spent building model)"
+            return self.placement
+        status = prob.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=remaining, warmStart=True))
+        if status != pulp.LpStatusOptimal or prob.sol_status not in (pulp.LpSolutionOptimal,
+                                                                    pulp.LpSolutionIntegerFeasible):
+            self.last_status = f"greedy ({pulp.LpStatus[status]})"
+            return self.placement
+        chosen = {w: j for (w, j), v in x.items() if (v.varValue or 0) > 0.5}
+        better = (len(chosen), -sum(self.cost(w, j) for w, j in chosen.items())) >= \
+                 (len(self.placement), -self.total_latency())
+        if better:
+            self.placement = chosen
+            self.used = {j: 0.0 for j in self.capacity}
+            for w, j in chosen.items():
+                self.used[j] += self.req[w]
+        self.last_status = "optimal" if prob.sol_status == pulp.LpSolutionOptimal else "feasible"
+        return self.placement
\ No newline at end of file
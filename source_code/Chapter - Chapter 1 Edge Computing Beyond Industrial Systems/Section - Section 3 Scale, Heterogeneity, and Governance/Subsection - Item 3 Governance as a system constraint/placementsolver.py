@@ -3,8 +3,8 @@
 Placement solver: minimize latency under capacity and residency constraints.
 Integrate with control plane (K3s/KubeEdge) as part of scheduler extension.
 """
-import pulp
 from typing import Dict, List, Set, Tuple
+from placementservice import PlacementService
 
 # Inputs (populate from inventory / policy DB)
 workloads: List[str] = ["cam_1_analytics", "cam_2_analytics", "agg_service"]
@@ -23,29 +23,18 @@ allowed_nodes: Dict[str, Set[str]] = {
     "agg_service": {"mec_node_a","mec_node_b","cloud_region_x"},
 }
 
-# Build ILP
-prob = pulp.LpProblem("edge_placement", pulp.LpMinimize)
-x = pulp.LpVariable.dicts("x", (workloads, nodes), lowBound=0, upBound=1, cat="Binary")
-
-# Objective: minimize total latency
-prob += pulp.lpSum(latency[(i,j)] * x[i][j] for i in workloads for j in nodes if (i,j) in latency)
-
-# Each workload placed exactly once (or adjust for replication policies)
-for i in workloads:
-    prob += pulp.lpSum(x[i][j] for j in nodes) == 1
-
-# Capacity constraints
+# Build sparse ILP: one binary per residency-allowed (workload, node) pair, so
+# governance constraints shape the model instead of adding x[i][j] == 0 rows.
+# Objective minimizes total latency; each workload placed exactly once (or adjust
+# for replication policies); per-node capacity constraints.
+svc = PlacementService()
 for j in nodes:
-    prob += pulp.lpSum(resource_req[i] * x[i][j] for i in workloads) <= capacity[j]
-
-# Residency / governance constraints: disallow placements not in allowed_nodes
+    svc.add_node(j, capacity[j])
 for i in workloads:
-    for j in nodes:
-        if j not in allowed_nodes[i]:
-            prob += x[i][j] == 0
+    svc.add_workload(i, resource_req[i], allowed_nodes[i],
+                     {j: ms for (w, j), ms in latency.items() if w == i})
 
-# Solve and output decisions
-prob.solve(pulp.PULP_CBC_CMD(msg=False))
-placement = {i: next(j for j in nodes if pulp.value(x[i][j]) > 0.5) for i in workloads}
-print("Placement decisions:", placement)
+# Solve and output decisions; later node/workload deltas go through the same service
+placement = svc.solve(time_budget_s=10.0)
+print("Placement decisions:", placement, f"({svc.last_status})")
 # Integrate: annotate Kubernetes PodSpec with nodeSelector and admission validation using OPA
\ No newline at end of file
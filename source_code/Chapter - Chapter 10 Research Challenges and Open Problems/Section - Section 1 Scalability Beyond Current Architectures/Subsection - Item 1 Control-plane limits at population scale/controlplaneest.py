@@ -1,30 +1,124 @@
 #!/usr/bin/env python3
 """Estimate control-plane worker count using Erlang C queueing.
-Suitable for CI checks of edge controller sizing (K3s/KubeEdge)."""
+Suitable for CI checks of edge controller sizing (K3s/KubeEdge).
+Erlang B is iterated in log space, so offered loads of 1e5+ servers neither
+overflow a**n nor underflow the tail; results are memoized per rounded input."""
 import math
+import numpy as np
 
-def erlang_c(lambda_r, mu, c):
-    rho = lambda_r / (c * mu)
+WAIT_TARGET = 0.05   # acceptable probability that a message waits
+MAX_EXTRA = 50       # cores tried beyond the utilization floor
+CACHE_MAX = 100_000  # memoized (lam, mu, target_util) entries
+
+_cache = {}
+
+def log_erlang_b(a, c):
+    # B(0)=1, B(n) = a*B(n-1) / (n + a*B(n-1)); O(c), exact for any c
+    if a == 0:
+        return 0.0 if c == 0 else -math.inf   # no offered load: nothing is blocked
+    lb = 0.0
+    for n in range(1, c + 1):
+        lb = math.log(a) + lb - math.log(n + a * math.exp(lb))
+    return lb
+
+def _erlang_c_from_b(a, c, b):
+    # C = B / (1 - rho*(1 - B)) with rho = a/c; unstable queues always wait
+    rho = a / c
     if rho >= 1.0:
-        return 1.0  # system unstable
+        return 1.0
+    return b / (1.0 - rho * (1.0 - b))
+
+def erlang_c(lambda_r, mu, c):
     a = lambda_r / mu
-    # sum_{n=0}^{c-1} a^n / n!
-    sum_term = sum((a**n) / math.factorial(n) for n in range(c))
-    last = (a**c) / math.factorial(c)
-    numerator = last * (c * mu) / (c * mu - lambda_r)
-    return numerator / (sum_term + numerator)
+    return _erlang_c_from_b(a, c, math.exp(log_erlang_b(a, c)))
+
+def _key(lam, mu, target_util):
+    return (float(f"{lam:.6g}"), float(f"{mu:.6g}"), target_util)
+
+def _remember(key, value):
+    if len(_cache) >= CACHE_MAX:
+        _cache.clear()
+    _cache[key] = value
+    return value
+
+def _cores_for(lam, mu, target_util):
+    key = _key(lam, mu, target_util)
+    if key in _cache:
+        return _cache[key]
+    a = lam / mu
+    if a == 0:
+        return _remember(key, (1, 0.0))   # idle fleet: one core, never waits
+    # minimal cores to keep utilization < target
+    c = max(1, math.ceil(lam / (target_util * mu)))
+    lb = log_erlang_b(a, c - 1)
+    # refine to ensure reasonable wait probability, one recursion step per extra core
+    for n in range(c, c + MAX_EXTRA + 1):
+        lb = math.log(a) + lb - math.log(n + a * math.exp(lb))
+        wc = _erlang_c_from_b(a, n, math.exp(lb))
+        if wc < WAIT_TARGET:
+            break
+    return _remember(key, (n, wc))
 
 def required_cores(N, h, e, proc_time_s, target_util=0.7):
     lam = N * (h + e)
     mu = 1.0 / proc_time_s
-    # minimal cores to keep utilization < target
-    c = max(1, math.ceil(lam / (target_util * mu)))
-    # refine to ensure reasonable wait probability
-    for extra in range(0, 50):
-        wc = erlang_c(lam, mu, c + extra)
-        if wc < 0.05:  # <5% wait prob
-            return c + extra, lam, mu, wc
-    return c + 50, lam, mu, erlang_c(lam, mu, c + 50)
+    cores, wc = _cores_for(lam, mu, target_util)
+    return cores, lam, mu, wc
+
+def required_cores_grid(N, h, e, proc_time_s, target_util=0.7):
+    """Vectorized required_cores over broadcastable arrays; returns (cores, lam, mu, p_wait)."""
+    N, h, e, proc_time_s = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64)
+                                                 for v in (N, h, e, proc_time_s)))
+    lam = N * (h + e)
+    mu = 1.0 / proc_time_s
+    cores = np.zeros(lam.shape, dtype=np.int64)
+    p_wait = np.zeros(lam.shape)
+    flat_lam, flat_mu = lam.ravel(), mu.ravel()
+    keys = [_key(l, m, target_util) for l, m in zip(flat_lam.tolist(), flat_mu.tolist())]
+    todo = {}
+    for i, k in enumerate(keys):
+        if k not in _cache:
+            todo.setdefault(k, i)  # solve each distinct rounded input once
+    if todo:
+        _solve_grid(list(todo), flat_lam[list(todo.values())], flat_mu[list(todo.values())], target_util)
+    hits = [_cache.get(k) for k in keys]
+    miss = [i for i, v in enumerate(hits) if v is None]
+    for i in miss:  # only if the cache was cleared while filling it
+        hits[i] = _cores_for(flat_lam[i], flat_mu[i], target_util)
+    cores.ravel()[:] = [v[0] for v in hits]
+    p_wait.ravel()[:] = [v[1] for v in hits]
+    return cores, lam, mu, p_wait
+
+def _solve_grid(keys, lam, mu, target_util):
+    # advance the log Erlang B recursion for all rows at once; rows leave when sized
+    a = lam / mu
+    idle = a == 0
+    for j in np.flatnonzero(idle):
+        _remember(keys[j], (1, 0.0))   # no offered load: one core, never waits
+    if idle.any():
+        keep = ~idle
+        keys = [k for k, x in zip(keys, keep) if x]
+        lam, mu, a = lam[keep], mu[keep], a[keep]
+    log_a = np.log(a)
+    c0 = np.maximum(1, np.ceil(lam / (target_util * mu))).astype(np.int64)
+    lb = np.zeros(a.shape)
+    idx = np.arange(a.size)
+    n = 0
+    while idx.size:
+        n += 1
+        lb = log_a[idx] + lb - np.log(n + a[idx] * np.exp(lb))
+        test = n >= c0[idx]
+        if not test.any():
+            continue
+        b = np.exp(lb)
+        rho = a[idx] / n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wc = np.where(rho >= 1.0, 1.0, b / (1.0 - rho * (1.0 - b)))
+        done = test & ((wc < WAIT_TARGET) | (n >= c0[idx] + MAX_EXTRA))
+        for j in np.flatnonzero(done):
+            _remember(keys[idx[j]], (n, float(wc[j])))
+        keep = ~done
+        idx, lb = idx[keep], lb[keep]
 
 if __name__ == "__main__":
     # realistic scenario: city-scale endpoints
@@ -37,4 +131,10 @@ if __name__ == "__main__":
     bw_Mbps = (lam * bw_per_msg_bytes * 8) / 1e6
     print(f"Estimated cores: {cores}")
     print(f"Arrival rate: {lam:.1f} msg/s, svc rate/core: {mu:.1f} msg/s")
-    print(f"Probability of wait: {p_wait:.3f}, net BW: {bw_Mbps:.1f} Mbps")
\ No newline at end of file
+    print(f"Probability of wait: {p_wait:.3f}, net BW: {bw_Mbps:.1f} Mbps")
+    # capacity-planning grid: fleet size x per-message processing time, one call
+    fleets = np.array([1e4, 1e5, 1e6, 1e7])[:, None]
+    procs = np.array([0.0005, 0.002, 0.01])[None, :]
+    grid, _, _, _ = required_cores_grid(fleets, h, e, procs)
+    print("Cores by fleet size (rows) x proc time (cols):")
+    print(grid)
\ No newline at end of file
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Benchmark: append-forever WAL (open per write, full replay) vs snapshot + compacted WAL.
+import argparse, json, os, random, shutil, tempfile, time
+from deltaagent import StateStore, now_ts
+
+class LegacyStore:
+    # the original scheme: reopen the WAL per delta, replay every line on start
+    def __init__(self,path): self.path=path; self.store={}; self.load()
+    def load(self):
+        try:
+            with open(self.path,'r') as f:
+                for line in f: self.apply(json.loads(line))
+        except FileNotFoundError: pass
+    def wal(self,delta):
+        with open(self.path,'a') as f: f.write(json.dumps(delta)+'\n')
+    def apply(self,delta):
+        for k,kv in delta.items():
+            cur=self.store.get(k)
+            if (cur is None) or (kv['ts']>cur['ts']): self.store[k]=kv
+    def make_delta(self,updates):
+        delta={k:{'v':v,'ts':now_ts()} for k,v in updates.items()}
+        self.wal(delta); self.apply(delta); return delta
+    def close(self): pass
+
+def disk_bytes(d): return sum(os.path.getsize(os.path.join(d,f)) for f in os.listdir(d))
+
+def run(name,make,updates,keys,tick):
+    d=tempfile.mkdtemp(); rng=random.Random(0)
+    try:
+        store=make(d); t0=time.perf_counter()
+        for i in range(0,updates,tick):
+            # 'tick' updates coalesced into one delta, as the publisher does per tick
+            batch={f'k{rng.randrange(keys)}':i+j for j in range(min(tick,updates-i))}
+            store.make_delta(batch)
+        store.close(); t_write=time.perf_counter()-t0
+        size=disk_bytes(d)
+        t0=time.perf_counter(); store=make(d); t_start=time.perf_counter()-t0
+        n=len(store.store); store.close()
+        print(f"{name:>9} {tick:>5} {updates/t_write:>11.0f} {size/1e6:>8.1f} {t_start:>9.3f} {n:>7}")
+    finally: shutil.rmtree(d)
+
+def main():
+    ap=argparse.ArgumentParser()
+    ap.add_argument('--updates',type=int,default=1_000_000)
+    ap.add_argument('--keys',type=int,default=10_000)
+    args=ap.parse_args()
+    print(f"{'store':>9} {'tick':>5} {'updates/s':>11} {'disk MB':>8} {'startup s':>9} {'keys':>7}")
+    legacy=lambda d: LegacyStore(os.path.join(d,'state.wal'))
+    compact=lambda d: StateStore(os.path.join(d,'state.wal'),os.path.join(d,'state.snap'),fsync='batch')
+    for tick in (1,100):
+        run('legacy',legacy,args.updates,args.keys,tick)
+        run('snapshot',compact,args.updates,args.keys,tick)
+
+if __name__=='__main__': main()
\ No newline at end of file
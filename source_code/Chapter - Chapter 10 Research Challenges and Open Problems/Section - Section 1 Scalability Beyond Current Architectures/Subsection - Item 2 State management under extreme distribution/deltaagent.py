@@ -1,40 +1,93 @@
-import asyncio, json, time
+import asyncio, json, os, time
 from asyncio_mqtt import Client  # pip install asyncio-mqtt
 
 BROKER='mqtt.example.local'
 TOPIC='edge/state/delta'
-PERSIST_FILE='state.wal'  # persistent write-ahead log
+PERSIST_FILE='state.wal'    # persistent write-ahead log (tail since last snapshot)
+SNAPSHOT_FILE='state.snap'  # compacted LWW store
+SNAPSHOT_BYTES=4<<20        # compact once the WAL tail outgrows this and the snapshot
+FSYNC='batch'               # 'always': per record, 'batch': every FLUSH_EVERY s, 'never': leave to the OS
+FLUSH_EVERY=0.2             # seconds between batched WAL flushes
 
 def now_ts(): return int(time.time()*1000)
 
+def _dumps(obj): return json.dumps(obj,separators=(',',':'))
+
 class StateStore:
-    def __init__(self): self.store={}, self.load()
-    def load(self): 
+    def __init__(self,wal_path=PERSIST_FILE,snap_path=SNAPSHOT_FILE,
+                 snapshot_bytes=SNAPSHOT_BYTES,fsync=FSYNC):
+        self.store={}; self.pending={}
+        self.wal_path,self.snap_path=wal_path,snap_path
+        self.snapshot_bytes,self.fsync=snapshot_bytes,fsync
+        self.wal_bytes=self.snap_bytes=0; self.dirty=False; self.last_flush=time.monotonic()
+        self.load()
+        self.f=open(self.wal_path,'a')  # kept open; buffered appends
+    def load(self):
+        # latest snapshot first, then only the WAL tail written after it
+        try:
+            with open(self.snap_path,'r') as f: self.store=json.load(f)
+            self.snap_bytes=os.path.getsize(self.snap_path)
+        except FileNotFoundError: pass
         try:
-            with open(PERSIST_FILE,'r') as f:
-                for line in f: self.apply(json.loads(line))
+            with open(self.wal_path,'r+b') as f:
+                good=0
+                for line in f:
+                    if not line.endswith(b'\n'): break  # torn last record after a crash
+                    try: self.apply(json.loads(line))
+                    except ValueError: break
+                    good+=len(line)
+                # cut the torn tail so the next append starts on a record boundary
+                f.truncate(good)
+            self.wal_bytes=good
         except FileNotFoundError: pass
     def wal(self,delta):
-        with open(PERSIST_FILE,'a') as f: f.write(json.dumps(delta)+'\n')
+        rec=_dumps(delta)+'\n'
+        self.f.write(rec); self.wal_bytes+=len(rec); self.dirty=True
+        if self.fsync=='always': self.flush()
+        elif time.monotonic()-self.last_flush>=FLUSH_EVERY: self.flush()
+        if self.wal_bytes>=max(self.snapshot_bytes,self.snap_bytes): self.snapshot()
+    def flush(self):
+        if not self.dirty: return
+        self.f.flush(); self.dirty=False
+        if self.fsync!='never': os.fsync(self.f.fileno())
+        self.last_flush=time.monotonic()
+    def snapshot(self):
+        # write-then-rename keeps the old snapshot valid until the new one is durable;
+        # replaying a WAL already folded into the snapshot is harmless under LWW
+        self.flush()
+        tmp=self.snap_path+'.tmp'
+        with open(tmp,'w') as f:
+            f.write(_dumps(self.store)); f.flush(); os.fsync(f.fileno())
+        os.replace(tmp,self.snap_path)
+        self.snap_bytes=os.path.getsize(self.snap_path)
+        self.f.close(); self.f=open(self.wal_path,'w')  # compaction: drop the folded tail
+        self.wal_bytes=0
+    def close(self):
+        self.flush(); self.f.close()
     def apply(self,delta):
         # LWW per key: {key:{'v':..., 'ts':...}}
         for k,kv in delta.items():
             cur=self.store.get(k)
             if (cur is None) or (kv['ts']>cur['ts']): self.store[k]=kv
 
-    def make_delta(self,updates):
-        delta={k:{'v':v,'ts':now_ts()} for k,v in updates.items()}
+    def stage(self,updates):
+        # coalesce local writes between ticks; last value per key wins
+        self.pending.update(updates)
+    def make_delta(self,updates=None):
+        if updates is None: updates,self.pending=self.pending,{}
+        ts=now_ts()
+        delta={k:{'v':v,'ts':ts} for k,v in updates.items()}
         self.wal(delta); self.apply(delta); return delta
 
 async def publisher(store):
     async with Client(BROKER) as client:
         while True:
-            # gather local changes periodically; here simulated
+            # one delta message per tick carries every key staged since the last one
             await asyncio.sleep(1.0)
-            updates={}  # populate from sensors/actuators
-            if updates:
-                delta=store.make_delta(updates)
-                await client.publish(TOPIC,json.dumps(delta),qos=1)
+            if store.pending:  # populated via store.stage() from sensors/actuators
+                delta=store.make_delta()
+                await client.publish(TOPIC,_dumps(delta),qos=1)
+            store.flush()  # bound batched-fsync lag when writes go quiet
 
 async def subscriber(store):
     async with Client(BROKER) as client:
@@ -46,6 +99,7 @@ async def subscriber(store):
 
 async def main():
     store=StateStore()
-    await asyncio.gather(publisher(store), subscriber(store))
+    try: await asyncio.gather(publisher(store), subscriber(store))
+    finally: store.close()
 
 if __name__=='__main__': asyncio.run(main())
\ No newline at end of file
@@ -1,19 +1,104 @@
 #!/usr/bin/env python3
-# Minimal production-ready gossip: UDP, SHA256 digests, anti-entropy, asyncio.
-import asyncio, socket, hashlib, json, time
+# Minimal production-ready gossip: UDP, per-key versions, Merkle anti-entropy, asyncio.
+# Peers walk a hash tree down to the differing buckets and exchange only changed keys,
+# split across datagrams, instead of hashing and shipping the whole state. Small or
+# one-sided subtrees skip the walk and swap key versions (or values) straight away.
+import asyncio, base64, collections, socket, hashlib, json, random, time
 BCAST_ADDR = ('224.0.0.251', 50000)   # use multicast for local discovery
 ANTI_ENTROPY = 5.0                    # seconds between anti-entropy rounds
+FANOUT, DEPTH = 16, 3                 # 16**3 = 4096 leaf buckets
+MAX_DGRAM = 1200                      # stay under a typical path MTU
+PEER_TTL = 60.0                       # forget peers silent for this long
+SMALL_SUBTREE = 2 * FANOUT            # both sides' keys; below this, list keys instead of descending
+MAX_REASSEMBLY = 64                   # partially received oversized messages kept at once
 
-def digest(state):
-    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+def _h(data, size):
+    return int.from_bytes(hashlib.blake2b(data.encode(), digest_size=size).digest(), 'big')
+
+class VersionedState:
+    """Per-key LWW store; versions are [lamport, node]; tree levels hold XOR-ed item hashes
+    and, alongside them, how many keys sit under each node."""
+    def __init__(self, node_id, initial=None):
+        self.node_id = node_id
+        self.clock = 0
+        self.entries = {}                                  # key -> (version, value)
+        self.buckets = {}                                  # leaf -> set(keys)
+        self.levels = [[0] * FANOUT**l for l in range(DEPTH + 1)]
+        self.counts = [[0] * FANOUT**l for l in range(DEPTH + 1)]
+        for k, v in (initial or {}).items():
+            self.set(k, v)
+
+    @staticmethod
+    def leaf(key):
+        return _h(key, 8) % FANOUT**DEPTH
+
+    def _put(self, key, ver, value):
+        # XOR makes each update O(DEPTH): remove the old item hash, add the new one
+        leaf = self.leaf(key)
+        d = _h(f'{key}\0{ver[0]}\0{ver[1]}', 16)
+        old = self.entries.get(key)
+        if old is None:
+            self.buckets.setdefault(leaf, set()).add(key)
+        else:
+            d ^= _h(f'{key}\0{old[0][0]}\0{old[0][1]}', 16)
+        self.entries[key] = (ver, value)
+        for l in range(DEPTH, -1, -1):
+            self.levels[l][leaf] ^= d
+            self.counts[l][leaf] += old is None
+            leaf //= FANOUT
+
+    def set(self, key, value):
+        self.clock += 1
+        self._put(key, [self.clock, self.node_id], value)
+
+    def merge(self, key, ver, value):
+        cur = self.entries.get(key)
+        if cur is not None and tuple(ver) <= tuple(cur[0]):
+            return False
+        self.clock = max(self.clock, ver[0])
+        self._put(key, list(ver), value)
+        return True
+
+    def root(self):
+        return self.levels[0][0]
+
+    def node(self, level, i):
+        return [format(self.levels[level][i], 'x'), self.counts[level][i]]
+
+    def keys_under(self, level, i):
+        span = FANOUT**(DEPTH - level)
+        lo, hi = i * span, (i + 1) * span
+        leaves = range(lo, hi) if span < len(self.buckets) else [b for b in self.buckets if lo <= b < hi]
+        return [k for b in leaves for k in self.buckets.get(b, ())]
+
+    def versions(self, level, i):
+        return {k: self.entries[k][0] for k in self.keys_under(level, i)}
+
+    def as_dict(self):
+        return {k: v for k, (_, v) in self.entries.items()}
 
 class GossipAgent:
-    def __init__(self, node_id, state):
+    def __init__(self, node_id, state, transport=None):
+        # every message carries the id; past this a fragment has no room for data
+        if len(json.dumps(node_id).encode()) > MAX_DGRAM // 2:
+            raise ValueError(f"node id longer than {MAX_DGRAM // 2} bytes")
         self.node_id = node_id
-        self.state = state
-        self.state_ts = time.time()
+        self.vstate = VersionedState(node_id, state)
         self.peers = {}                # addr->last_seen
-        self.sock = self._make_socket()
+        self.bytes_sent = 0
+        self._frags = collections.OrderedDict()   # (addr, id) -> {seq: part}
+        self._frag_id = random.getrandbits(32)
+        if transport is None:
+            self.sock = self._make_socket()
+            transport = self._udp_send
+        self.send = transport          # send(data: bytes, addr)
+
+    @property
+    def state(self):
+        return self.vstate.as_dict()
+
+    def update(self, key, value):
+        self.vstate.set(key, value)
 
     def _make_socket(self):
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
@@ -25,6 +110,123 @@ class GossipAgent:
         sock.setblocking(False)
         return sock
 
+    def _udp_send(self, data, addr):
+        try:
+            self.sock.sendto(data, addr)
+        except (BlockingIOError, OSError):
+            pass  # anti-entropy repairs anything dropped here
+
+    def _emit(self, msg, addr):
+        data = json.dumps(msg, separators=(',', ':')).encode()
+        if len(data) > MAX_DGRAM:
+            return self._emit_fragments(data, addr)
+        self._send(data, addr)
+
+    def _send(self, data, addr):
+        self.bytes_sent += len(data)
+        self.send(data, addr)
+
+    def _emit_fragments(self, data, addr):
+        # one item too big for a datagram (a crowded bucket, a large value): ship it in
+        # pieces; losing any piece loses the message, and the next round asks again
+        self._frag_id = (self._frag_id + 1) & 0xffffffff
+        text = base64.b64encode(data).decode()
+        # size the pieces against the real envelope (node id included), with seq/of at
+        # their widest; base64 needs no JSON escaping, so each piece lands <= MAX_DGRAM
+        frame = {'type': 'FRAG', 'node': self.node_id, 'id': self._frag_id,
+                 'seq': len(text), 'of': len(text), 'data': ''}
+        step = MAX_DGRAM - len(json.dumps(frame, separators=(',', ':')).encode())
+        parts = [text[o:o + step] for o in range(0, len(text), step)]
+        for seq, part in enumerate(parts):
+            frame.update(seq=seq, of=len(parts), data=part)
+            self._send(json.dumps(frame, separators=(',', ':')).encode(), addr)
+
+    def _reassemble(self, msg, addr):
+        key = (addr, msg['id'])
+        parts = self._frags.pop(key, {})
+        parts[msg['seq']] = msg['data']
+        if len(parts) < msg['of']:
+            self._frags[key] = parts
+            while len(self._frags) > MAX_REASSEMBLY:
+                self._frags.popitem(last=False)
+            return None
+        return base64.b64decode(''.join(parts[s] for s in range(msg['of'])))
+
+    def _emit_chunked(self, kind, items, addr, **extra):
+        # split a {k: v} payload over as many datagrams as needed; an item that cannot
+        # fit one datagram on its own is fragmented by _emit
+        chunk, size = {}, 64
+        for k, v in items:
+            n = len(json.dumps(v, separators=(',', ':'))) + len(str(k)) + 6
+            if chunk and size + n > MAX_DGRAM:
+                self._emit({'type': kind, 'node': self.node_id, 'items': chunk, **extra}, addr)
+                chunk, size = {}, 64
+            chunk[k] = v
+            size += n
+        if chunk:
+            self._emit({'type': kind, 'node': self.node_id, 'items': chunk, **extra}, addr)
+
+    def digest_message(self):
+        root, keys = self.vstate.node(0, 0)
+        return {'type': 'DIGEST', 'node': self.node_id, 'root': root, 'keys': keys}
+
+    def _reconcile(self, level, items, addr):
+        # items: the peer's [hash, key count] per node at this level
+        vs = self.vstate
+        push, listed, kids = [], [], []
+        for i, (h, n) in items:
+            if int(h, 16) == vs.levels[level][i]:
+                continue
+            if n == 0:
+                push += vs.keys_under(level, i)        # peer has nothing here: just send it
+            elif level == DEPTH or n + vs.counts[level][i] <= SMALL_SUBTREE:
+                listed.append(i)                       # cheaper to list keys than to descend
+            else:
+                kids += [(c, vs.node(level + 1, c)) for c in range(i * FANOUT, (i + 1) * FANOUT)]
+        self._emit_chunked('DELTA', [(k, vs.entries[k]) for k in push], addr)
+        self._emit_chunked('KEYS', [(i, vs.versions(level, i)) for i in listed], addr,
+                           level=level, reply=True)
+        self._emit_chunked('NODES', kids, addr, level=level + 1)
+
+    def on_datagram(self, data, addr):
+        try:
+            msg = json.loads(data.decode())
+        except Exception:
+            return
+        self.peers[addr] = time.time()
+        kind, vs = msg.get('type'), self.vstate
+        if kind == 'FRAG':
+            data = self._reassemble(msg, addr)
+            if data is not None:
+                self.on_datagram(data, addr)
+        elif kind == 'DIGEST':
+            self._reconcile(0, [(0, (msg.get('root', '0'), msg.get('keys', 1)))], addr)
+        elif kind == 'NODES':
+            # compare the peer's hashes with ours; descend only where they differ
+            self._reconcile(msg['level'], [(int(i), v) for i, v in msg['items'].items()], addr)
+        elif kind == 'KEYS':
+            # a reply lists only the keys its sender is missing, so push just those
+            level, reply, push, want = msg['level'], msg.get('reply'), [], []
+            for i, theirs in msg['items'].items():
+                ours = vs.versions(level, int(i))
+                push += [k for k, v in ours.items()
+                         if (k not in theirs and reply) or k in theirs and tuple(v) > tuple(theirs[k])]
+                behind = {k: ours.get(k, [0, '']) for k, v in theirs.items()
+                          if k not in ours or tuple(v) > tuple(ours[k])}
+                if behind:
+                    want.append((int(i), behind))
+            self._emit_chunked('DELTA', [(k, vs.entries[k]) for k in push], addr)
+            if want and reply:
+                self._emit_chunked('KEYS', want, addr, level=level, reply=False)
+        elif kind == 'DELTA':
+            for k, (ver, value) in msg['items'].items():
+                vs.merge(k, ver, value)
+
+    def anti_entropy_target(self):
+        now = time.time()
+        live = [a for a, seen in self.peers.items() if now - seen < PEER_TTL]
+        return random.choice(live) if live else BCAST_ADDR
+
     async def start(self):
         loop = asyncio.get_running_loop()
         loop.create_task(self._recv_loop())
@@ -34,36 +236,20 @@ class GossipAgent:
         loop = asyncio.get_running_loop()
         while True:
             data, addr = await loop.sock_recvfrom(self.sock, 65536)
-            try:
-                msg = json.loads(data.decode())
-            except Exception:
-                continue
-            self.peers[addr] = time.time()
-            if msg.get('type') == 'DIGEST':
-                # reply with state if digest differs
-                if msg.get('digest') != digest(self.state):
-                    await loop.sock_sendto(self.sock, json.dumps({
-                        'type':'STATE','node':self.node_id,'state':self.state,'ts':self.state_ts
-                    }).encode(), addr)
-            elif msg.get('type') == 'STATE':
-                # accept fresher state
-                if msg.get('ts',0) > self.state_ts:
-                    self.state = msg['state']
-                    self.state_ts = msg['ts']
+            self.on_datagram(data, addr)
 
     async def _anti_entropy_loop(self):
-        loop = asyncio.get_running_loop()
         while True:
             await asyncio.sleep(ANTI_ENTROPY)
-            msg = json.dumps({'type':'DIGEST','node':self.node_id,'digest':digest(self.state)}).encode()
-            try:
-                await loop.sock_sendto(self.sock, msg, BCAST_ADDR)
-            except Exception:
-                pass
+            # one random live peer per round (multicast only until peers are known)
+            self._emit(self.digest_message(), self.anti_entropy_target())
 
 if __name__ == '__main__':
     import sys
     node = sys.argv[1] if len(sys.argv)>1 else 'node-'+str(int(time.time()))
     state = {'status':'ok','load':0.0}
     agent = GossipAgent(node, state)
-    asyncio.run(agent.start())  # integrate with local service supervisor (systemd/container)
\ No newline at end of file
+    async def run():
+        await agent.start()
+        await asyncio.Event().wait()  # integrate with local service supervisor (systemd/container)
+    asyncio.run(run())
\ No newline at end of file
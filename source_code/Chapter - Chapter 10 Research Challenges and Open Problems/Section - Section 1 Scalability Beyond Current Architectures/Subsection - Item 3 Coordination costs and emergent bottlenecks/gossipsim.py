@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# In-process gossip simulation: in-memory transport, bytes sent and rounds to converge.
+import argparse, collections, json, random, time
+from gossip import GossipAgent
+
+class MemoryHub:
+    """Delivers datagrams between agents in FIFO order; no sockets involved."""
+    def __init__(self):
+        self.agents = {}
+        self.queue = collections.deque()
+
+    def transport(self, src):
+        return lambda data, dst: self.queue.append((data, src, dst))
+
+    def drain(self):
+        while self.queue:
+            data, src, dst = self.queue.popleft()
+            if dst in self.agents:
+                self.agents[dst].on_datagram(data, src)
+
+def converged(agents):
+    return len({a.vstate.root() for a in agents}) == 1
+
+def run_rounds(hub, agents, rng, max_rounds=200):
+    # one anti-entropy round: every agent pushes a digest to one random peer
+    t0, sent0 = time.perf_counter(), sum(a.bytes_sent for a in agents)
+    for rounds in range(1, max_rounds + 1):
+        for a in agents:
+            a._emit(a.digest_message(), rng.choice(list(a.peers)))
+        hub.drain()
+        if converged(agents):
+            break
+    return rounds, sum(a.bytes_sent for a in agents) - sent0, time.perf_counter() - t0
+
+def simulate(n, keys_per_node, seed=0):
+    rng = random.Random(seed)
+    random.seed(seed)
+    hub = MemoryHub()
+    agents = []
+    for i in range(n):
+        own = {f'n{i}/k{j}': rng.random() for j in range(keys_per_node)}
+        a = GossipAgent(f'n{i}', own, transport=hub.transport(('sim', i)))
+        hub.agents[('sim', i)] = a
+        agents.append(a)
+    for i, a in enumerate(agents):  # discovery is out of scope; every peer is known
+        a.peers = {('sim', j): time.time() for j in range(n) if j != i}
+    cold = run_rounds(hub, agents, rng)
+    # steady state: one node changes one key, measure the cost of spreading it
+    agents[0].update('n0/k0', -1.0)
+    warm = run_rounds(hub, agents, rng)
+    full_state = len(json.dumps(agents[0].state).encode())
+    return cold, warm, full_state
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--keys', type=int, default=20, help='keys owned by each node')
+    ap.add_argument('--nodes', default='8,32,128', help='comma-separated cluster sizes')
+    args = ap.parse_args()
+    print(f"{'nodes':>5} {'keys':>6} {'state KB':>8} {'cold rnds':>9} {'cold MB':>8} {'cold s':>7} "
+          f"{'upd rnds':>8} {'upd KB':>7}")
+    for n in map(int, args.nodes.split(',')):
+        cold, warm, full = simulate(n, args.keys)
+        print(f"{n:>5} {n * args.keys:>6} {full / 1e3:>8.1f} {cold[0]:>9} {cold[1] / 1e6:>8.2f} "
+              f"{cold[2]:>7.2f} {warm[0]:>8} {warm[1] / 1e3:>7.1f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import argparse, time
+import numpy as np
+from localfraction import (minimal_local_fraction, minimal_local_fraction_batch,
+                           bootstrap_local_fraction)
+
+def grid_local_fraction(net, edge, local, sched, D, alpha, resolution=101, seed=None):
+    # the previous O(resolution * N) sweep, kept here as the reference
+    rng = np.random.default_rng(seed)
+    N = min(map(len, (net, edge, local, sched)))
+    idx = rng.choice(len(net), size=N, replace=False)
+    net, edge = net[idx], edge[idx % len(edge)]
+    local, sched = local[idx % len(local)], sched[idx % len(sched)]
+    for x in np.linspace(0.0, 1.0, resolution):
+        if np.mean(sched + x * local + (1.0 - x) * (net + edge) > D) <= alpha:
+            return float(x)
+    return 1.0
+
+def samples(N, seed=1):
+    rng = np.random.default_rng(seed)
+    net = rng.lognormal(np.log(20), 0.6, N)       # heavy-tailed uplink
+    edge = rng.gamma(4.0, 2.0, N)                 # MEC inference
+    local = rng.normal(35.0, 4.0, N).clip(5)      # on-device inference
+    sched = rng.exponential(2.0, N)               # OS scheduling jitter
+    return net, edge, local, sched
+
+def timed(fn, *a, **kw):
+    t0 = time.perf_counter(); out = fn(*a, **kw)
+    return out, time.perf_counter() - t0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--N", type=int, default=1_000_000)
+    args = ap.parse_args()
+    s = samples(args.N)
+    D, alpha = 50.0, 0.01
+    xg, tg = timed(grid_local_fraction, *s, D, alpha, seed=0)
+    xe, te = timed(minimal_local_fraction, *s, D, alpha, seed=0)
+    xr, _ = timed(minimal_local_fraction, *s, D, alpha, resolution=101, seed=0)
+    print(f"N={args.N}: grid x={xg:.4f} {tg:.2f}s | exact x={xe:.6f} {te:.2f}s "
+          f"| exact snapped to grid x={xr:.4f}")
+    Ds, alphas = np.linspace(40, 80, 9), np.array([0.001, 0.005, 0.01, 0.05])
+    grid, tb = timed(minimal_local_fraction_batch, *s, Ds, alphas, seed=0)
+    print(f"batch {len(Ds)}x{len(alphas)} (D, alpha) pairs: {tb:.2f}s")
+    print(np.round(grid, 4))
+    (pt, lo, hi, _), tboot = timed(bootstrap_local_fraction, *(a[:100_000] for a in s), D, alpha, n_boot=100)
+    print(f"bootstrap (N=1e5, 100 reps): x={pt:.4f} 95% CI [{lo:.4f}, {hi:.4f}] {tboot:.2f}s")
\ No newline at end of file
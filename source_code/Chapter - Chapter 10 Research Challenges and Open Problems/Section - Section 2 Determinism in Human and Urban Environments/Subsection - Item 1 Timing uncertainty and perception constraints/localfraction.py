@@ -1,34 +1,97 @@
 import numpy as np
 
-def minimal_local_fraction(net_samples, edge_samples, local_samples,
-                           sched_samples, D, alpha, resolution=101):
-    """
-    Compute minimal x in [0,1] s.t. Pr(L_total > D) <= alpha.
-    net_samples, edge_samples, local_samples, sched_samples: 1D numpy arrays of ms.
-    D: deadline in ms; alpha: allowed tail probability.
-    resolution: discretization of x (default 101 points).
-    """
+def _align(net_samples, edge_samples, local_samples, sched_samples, rng=None):
     # Precompute sample stacks (bootstrap alignment via random permutation)
     N = min(map(len, (net_samples, edge_samples, local_samples, sched_samples)))
     if N < 100:
         raise ValueError("Need >=100 samples for stable tail estimates")
+    rng = np.random.default_rng() if rng is None else rng
     # Randomly sample without replacement for Monte Carlo mixing
-    idx = np.random.choice(len(net_samples), size=N, replace=False)
+    idx = rng.choice(len(net_samples), size=N, replace=False)
     net = net_samples[idx]
     edge = edge_samples[idx % len(edge_samples)]  # tolerate different lengths
     local = local_samples[idx % len(local_samples)]
     sched = sched_samples[idx % len(sched_samples)]
-    xs = np.linspace(0.0, 1.0, resolution)
-    for x in xs:
-        total = sched + x * local + (1.0 - x) * (net + edge)
-        tail = np.mean(total > D)
-        if tail <= alpha:
-            return float(x)  # smallest feasible x due to increasing xs
-    return 1.0  # must run everything locally to meet deadline
+    return sched, local, net + edge
+
+def _breakpoints(sched, local, remote, D):
+    """
+    Each sample's latency is linear in x: sched + remote + x*(local - remote).
+    It misses D on a half-line of x; return the sorted ends of those half-lines.
+    """
+    slope = local - remote
+    over = sched + remote - D        # > 0 means late when x = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = -over / slope            # x where the sample's latency equals D
+    dec, inc = slope < 0, slope > 0  # late for x < t / late for x > t
+    always = int(np.count_nonzero((slope == 0) & (over > 0)))
+    return np.sort(t[dec]), np.sort(t[inc]), always
+
+def _late_counts(dec_t, inc_t, always, xs):
+    # number of samples with L_total > D at each x (strict, as in the grid version)
+    late_dec = dec_t.size - np.searchsorted(dec_t, xs, side="right")
+    late_inc = np.searchsorted(inc_t, xs, side="left")
+    return always + late_dec + late_inc
+
+def _solve(sched, local, remote, D, alphas):
+    dec_t, inc_t, always = _breakpoints(sched, local, remote, D)
+    # the late count only drops where a decreasing sample meets D, so the minimal
+    # feasible x is 0 or one of those breakpoints
+    xs = np.concatenate(([0.0], dec_t[(dec_t > 0.0) & (dec_t <= 1.0)]))
+    best = np.minimum.accumulate(_late_counts(dec_t, inc_t, always, xs))
+    limit = np.floor(np.asarray(alphas, dtype=np.float64) * sched.size + 1e-9)
+    first = np.searchsorted(-best, -limit, side="left")  # best is non-increasing
+    return np.where(first < xs.size, xs[np.minimum(first, xs.size - 1)], 1.0)
+
+def _snap(x, resolution):
+    # reproduce the old grid answer: round up to the next of `resolution` points
+    if resolution is None:
+        return x
+    step = 1.0 / (resolution - 1)
+    return np.minimum(1.0, np.ceil(np.asarray(x) / step - 1e-9) * step)
+
+def minimal_local_fraction(net_samples, edge_samples, local_samples,
+                           sched_samples, D, alpha, resolution=None, seed=None):
+    """
+    Compute minimal x in [0,1] s.t. Pr(L_total > D) <= alpha.
+    net_samples, edge_samples, local_samples, sched_samples: 1D numpy arrays of ms.
+    D: deadline in ms; alpha: allowed tail probability.
+    Exact over the empirical mixture in O(N log N): sort the per-sample x at which
+    the deadline is crossed instead of scanning a grid of x values.
+    resolution: if given, round the answer up to that many grid points (old behaviour).
+    seed: seeds the sample alignment for reproducible results.
+    """
+    sched, local, remote = _align(net_samples, edge_samples, local_samples, sched_samples,
+                                  np.random.default_rng(seed))
+    x = _solve(sched, local, remote, D, [alpha])[0]
+    return float(_snap(x, resolution))  # 1.0: must run everything locally to meet deadline
+
+def minimal_local_fraction_batch(net_samples, edge_samples, local_samples,
+                                 sched_samples, Ds, alphas, seed=None):
+    """Minimal x for every (D, alpha) pair over one sample alignment; shape (len(Ds), len(alphas))."""
+    sched, local, remote = _align(net_samples, edge_samples, local_samples, sched_samples,
+                                  np.random.default_rng(seed))
+    alphas = np.atleast_1d(alphas)
+    return np.stack([_solve(sched, local, remote, D, alphas) for D in np.atleast_1d(Ds)])
+
+def bootstrap_local_fraction(net_samples, edge_samples, local_samples, sched_samples,
+                             D, alpha, n_boot=200, ci=0.95, seed=0):
+    """Seeded bootstrap of the minimal x; returns (point, lo, hi, replicate array)."""
+    rng = np.random.default_rng(seed)
+    sched, local, remote = _align(net_samples, edge_samples, local_samples, sched_samples, rng)
+    point = _solve(sched, local, remote, D, [alpha])[0]
+    reps = np.empty(n_boot)
+    for b in range(n_boot):
+        i = rng.integers(0, sched.size, sched.size)  # resample aligned tuples with replacement
+        reps[b] = _solve(sched[i], local[i], remote[i], D, [alpha])[0]
+    lo, hi = np.quantile(reps, [(1 - ci) / 2, (1 + ci) / 2])
+    return float(point), float(lo), float(hi), reps
 
 # Example usage (to be called from an orchestrator)
 # net_samples = np.load("net_samples.npy")
 # edge_samples = np.load("edge_samples.npy")
 # local_samples = np.load("local_samples.npy")
 # sched_samples = np.load("sched_samples.npy")
-# x = minimal_local_fraction(net_samples, edge_samples, local_samples, sched_samples, D=50, alpha=0.01)
\ No newline at end of file
+# x = minimal_local_fraction(net_samples, edge_samples, local_samples, sched_samples, D=50, alpha=0.01)
+# grid = minimal_local_fraction_batch(net_samples, edge_samples, local_samples, sched_samples,
+#                                     Ds=[30, 50, 80], alphas=[0.001, 0.01, 0.05])
\ No newline at end of file
@@ -1,47 +1,33 @@
 #!/usr/bin/env python3
 # Production-ready adaptive agent for edge gateways.
-# Requires: psutil, paho-mqtt, onnxruntime (optional), pynvml (optional).
+# Requires: numpy, paho-mqtt, onnxruntime (optional), pynvml (optional).
 import time
 import json
-import psutil
-import paho.mqtt.client as mqtt
+from loadsampler import get_sampler
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
 
 BROKER = "mqtt.example.local"          # control-plane broker
 DEVICE_ID = "edge-gateway-01"
-SAMPLE_INTERVAL_MIN = 0.1             # seconds
+SAMPLE_INTERVAL_MIN = 0.05            # seconds
 SAMPLE_INTERVAL_MAX = 1.0
 CPU_HIGH = 0.85                        # high utilization threshold
 CPU_LOW = 0.60                         # low utilization threshold
 MODEL_HEAVY = "detector_resnet.onnx"
 MODEL_LIGHT = "detector_mobilenet.onnx"
+LOAD_WINDOW = 1.0                      # seconds of history behind each decision
 
-client = mqtt.Client(client_id=DEVICE_ID)
-client.connect(BROKER, 1883, 60)
+pub = EdgePublisher.connect(BROKER, client_id=DEVICE_ID)
 
 def publish_policy(policy):
     payload = json.dumps(policy)
-    client.publish(f"edge/control/{DEVICE_ID}", payload, qos=1)
+    # last value wins: a slow broker never sees a backlog of stale policies
+    pub.publish_state(f"edge/control/{DEVICE_ID}", payload, qos=1)
 
-def get_gpu_util():
-    try:
-        import pynvml
-        pynvml.nvmlInit()
-        h = pynvml.nvmlDeviceGetHandleByIndex(0)
-        util = pynvml.nvmlDeviceGetUtilizationRates(h).gpu / 100.0
-        pynvml.nvmlShutdown()
-        return util
-    except Exception:
-        return 0.0
+sampler = get_sampler()
 
-def measure_load(window=1.0):
-    # average CPU percent and GPU percent over window
-    samples = int(max(1, window / 0.1))
-    cpu = 0.0
-    gpu = 0.0
-    for _ in range(samples):
-        cpu += psutil.cpu_percent(interval=0.1) / 100.0
-        gpu += get_gpu_util()
-    return cpu / samples, gpu / samples
+def measure_load(window=LOAD_WINDOW):
+    # average CPU and GPU utilisation over window, read from the background ring
+    return sampler.mean(window)
 
 def decide_action(cpu_load, gpu_load, current_interval, current_model):
     # simple hysteresis rule: adjust sampling and model selection
@@ -60,13 +46,14 @@ def main_loop():
     sample_interval = 0.25
     current_model = MODEL_HEAVY
     while True:
-        cpu_load, gpu_load = measure_load(window=1.0)
+        cpu_load, gpu_load = measure_load()
+        cpu_p90, _ = sampler.percentile(90, LOAD_WINDOW)
         sample_interval, chosen_model = decide_action(
             cpu_load, gpu_load, sample_interval, current_model)
         policy = {
             "sample_interval": sample_interval,
             "model": chosen_model,
-            "cpu": cpu_load, "gpu": gpu_load, "ts": time.time()
+            "cpu": cpu_load, "cpu_p90": cpu_p90, "gpu": gpu_load, "ts": time.time()
         }
         publish_policy(policy)
         current_model = chosen_model
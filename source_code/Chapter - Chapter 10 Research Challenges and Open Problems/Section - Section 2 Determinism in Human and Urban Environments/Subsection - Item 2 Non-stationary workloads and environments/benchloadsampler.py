@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Benchmark: blocking psutil polling (the old measure_load) vs LoadSampler reads.
+# Reports wall time per decision tick and the sampler thread's CPU overhead.
+import argparse, time
+import psutil
+from loadsampler import LoadSampler
+
+def polling_measure(window):
+    samples = int(max(1, window / 0.1))
+    return sum(psutil.cpu_percent(interval=0.1) for _ in range(samples)) / samples / 100.0
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--window", type=float, default=1.0)
+    ap.add_argument("--ticks", type=int, default=3)
+    ap.add_argument("--period", type=float, default=0.05)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    for _ in range(args.ticks):
+        polling_measure(args.window)
+    poll_ms = 1e3 * (time.perf_counter() - t0) / args.ticks
+
+    s = LoadSampler(period_s=args.period, gpu=False).start()
+    time.sleep(args.window)
+    n = 20000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        s.mean(args.window); s.percentile(90, args.window)
+    read_ms = 1e3 * (time.perf_counter() - t0) / n
+
+    idle = 5.0
+    c0 = time.process_time(); time.sleep(idle); overhead = (time.process_time() - c0) / idle
+    s.stop()
+
+    print(f"{'scheme':<26}{'ms/tick':>12}{'max ticks/s':>14}")
+    print(f"{'psutil polling':<26}{poll_ms:>12.1f}{1e3 / poll_ms:>14.1f}")
+    print(f"{'sampler mean+p90':<26}{read_ms:>12.4f}{1e3 / read_ms:>14.0f}")
+    print(f"sampler thread at {1 / args.period:.0f} Hz: {100 * overhead:.3f}% of one core")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
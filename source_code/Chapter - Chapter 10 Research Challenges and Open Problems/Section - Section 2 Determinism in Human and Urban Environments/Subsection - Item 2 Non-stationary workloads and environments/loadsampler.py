@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Background CPU/GPU load sampler: /proc/stat deltas and one NVML handle feed a
+# fixed ring that control loops read without blocking.
+import threading, time
+import numpy as np
+
+PROC_STAT = "/proc/stat"
+
+def read_proc_stat(path=PROC_STAT):
+    """Return cumulative (busy, total) jiffies for the aggregate 'cpu' line."""
+    with open(path, "rb") as f:
+        fields = f.readline().split()[1:]
+    vals = [int(v) for v in fields[:8]]   # user nice system idle iowait irq softirq steal
+    idle = vals[3] + vals[4]
+    total = sum(vals)
+    return total - idle, total
+
+class _Gpu:
+    # opened once for the sampler's lifetime; absent pynvml or GPU reads as 0.0
+    def __init__(self, index=0):
+        self.nvml = None
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            self.handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            self.nvml = pynvml
+        except Exception:
+            pass
+
+    def util(self):
+        if self.nvml is None:
+            return 0.0
+        try:
+            return self.nvml.nvmlDeviceGetUtilizationRates(self.handle).gpu / 100.0
+        except Exception:
+            return 0.0
+
+    def close(self):
+        if self.nvml is not None:
+            self.nvml.nvmlShutdown()
+            self.nvml = None
+
+class LoadSampler:
+    """Samples load every `period_s` into a ring of `capacity` slots.
+
+    One writer thread; readers take the published count, then slice. Means over
+    a window come from the cumulative jiffy counters, so they are exact
+    utilisation over the window rather than an average of per-sample ratios.
+    """
+    def __init__(self, period_s=0.05, capacity=2048, gpu=True, stat_path=PROC_STAT):
+        self.period_s, self.capacity, self.stat_path = period_s, capacity, stat_path
+        self.ts = np.zeros(capacity)
+        self.cpu = np.zeros(capacity)       # utilisation over the preceding period
+        self.gpu = np.zeros(capacity)
+        self.busy = np.zeros(capacity)      # cumulative jiffies, for exact window means
+        self.total = np.zeros(capacity)
+        self.count = 0                      # samples published; slot = count % capacity
+        self._want_gpu = gpu
+        self._gpu = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._gpu = _Gpu() if self._want_gpu else None
+        self._prev = read_proc_stat(self.stat_path)
+        self._sample()  # a first sample so readers never see an empty ring
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._gpu:
+            self._gpu.close()
+
+    def _sample(self):
+        busy, total = read_proc_stat(self.stat_path)
+        db, dt = busy - self._prev[0], total - self._prev[1]
+        self._prev = (busy, total)
+        i = self.count % self.capacity
+        self.ts[i] = time.monotonic()
+        self.cpu[i] = db / dt if dt > 0 else 0.0
+        self.gpu[i] = self._gpu.util() if self._gpu else 0.0
+        self.busy[i], self.total[i] = busy, total
+        self.count += 1                     # publish after the slot is complete
+
+    def _run(self):
+        nxt = time.monotonic()
+        while not self._stop.is_set():
+            nxt += self.period_s
+            self._stop.wait(max(0.0, nxt - time.monotonic()))
+            self._sample()
+
+    def _slots(self, window_s):
+        n = self.count
+        if n == 0:
+            return np.empty(0, dtype=int)
+        k = min(n, self.capacity - 1, max(1, int(np.ceil(window_s / self.period_s))))
+        return np.arange(n - k, n) % self.capacity
+
+    def latest(self):
+        i = (self.count - 1) % self.capacity
+        return float(self.cpu[i]), float(self.gpu[i])
+
+    def mean(self, window_s=1.0):
+        """(cpu, gpu) utilisation in 0..1 over roughly the last `window_s`."""
+        idx = self._slots(window_s)
+        if len(idx) == 0:
+            return 0.0, 0.0
+        first = (idx[0] - 1) % self.capacity if self.count > len(idx) else idx[0]
+        dt = self.total[idx[-1]] - self.total[first]
+        cpu = (self.busy[idx[-1]] - self.busy[first]) / dt if dt > 0 else float(self.cpu[idx[-1]])
+        return float(cpu), float(self.gpu[idx].mean())
+
+    def percentile(self, q, window_s=1.0):
+        """(cpu, gpu) q-th percentile of per-period utilisation over the window."""
+        idx = self._slots(window_s)
+        if len(idx) == 0:
+            return 0.0, 0.0
+        return float(np.percentile(self.cpu[idx], q)), float(np.percentile(self.gpu[idx], q))
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_sampler():
+    """Process-wide sampler, started on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LoadSampler().start()
+        return _shared
\ No newline at end of file
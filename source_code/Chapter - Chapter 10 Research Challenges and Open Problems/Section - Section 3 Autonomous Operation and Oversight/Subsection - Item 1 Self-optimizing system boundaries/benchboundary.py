@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# Benchmark: per-class finite-difference boundary updates vs the vectorised
+# tier optimizer (closed form without queueing, projected gradient with it).
+import argparse, time
+import numpy as np
+from boundaryopt import optimize_split, cost
+
+def fd_two_tier(local, remote, b, eta=0.1, eps=1e-3):
+    # the old update_boundary: four cost evaluations per class per tick
+    out = np.empty_like(b)
+    for i in range(len(b)):
+        Jb = b[i]*local[i] + (1-b[i])*remote[i]
+        Jb_eps = (b[i]+eps)*local[i] + (1-(b[i]+eps))*remote[i]
+        out[i] = min(1.0, max(0.0, b[i] - eta*(Jb_eps - Jb)/eps))
+    return out
+
+def timeit(fn, reps):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        r = fn()
+    return 1e3 * (time.perf_counter() - t0) / reps, r
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--classes", default="10,100,1000")
+    ap.add_argument("--tiers", type=int, default=4)
+    ap.add_argument("--reps", type=int, default=20)
+    args = ap.parse_args()
+    rng = np.random.default_rng(0)
+    K = args.tiers
+    print(f"{'classes':>8}{'fd 2-tier ms':>14}{'linear ms':>11}{'queue ms':>10}{'warm ms':>9}{'gap/J':>10}{'max rho':>9}")
+    for C in map(int, args.classes.split(",")):
+        a = rng.uniform(1, 50, (C, K))
+        lam = rng.uniform(0.1, 2.0, C)
+        work = rng.uniform(0.05, 1.0, C)
+        mu = (lam * work).sum() * np.geomspace(0.3, 3.0, K)   # tight near tiers, roomy far
+        b = rng.uniform(0, 1, C)
+        fd_ms, _ = timeit(lambda: fd_two_tier(a[:, 0], a[:, 1], b), args.reps)
+        lin_ms, _ = timeit(lambda: optimize_split(a, lam), args.reps)
+        q_ms, (x, gap) = timeit(lambda: optimize_split(a, lam, work, mu, 500.0), args.reps)
+        # a tick after a small metric change, warm-started from the last split
+        a2 = a * rng.uniform(0.95, 1.05, a.shape)
+        w_ms, _ = timeit(lambda: optimize_split(a2, lam, work, mu, 500.0, x0=x), args.reps)
+        J = cost(x, a, lam, work, mu, np.full(K, 500.0))
+        rho = ((lam * work) @ x / mu).max()
+        print(f"{C:>8}{fd_ms:>14.3f}{lin_ms:>11.3f}{q_ms:>10.2f}{w_ms:>9.2f}{gap / J:>10.1e}{rho:>9.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Offload split across N tiers for many task classes at once.
+# x[c, k] is the share of class c sent to tier k; each row lies on the simplex.
+# Cost = sum_ck lam_c * x_ck * a_ck  +  sum_k w_k * L_k / (mu_k - L_k),
+# with tier load L_k = sum_c lam_c * work_c * x_ck (M/M/1 number-in-system).
+import numpy as np
+
+RHO_MAX = 0.98  # past this utilisation the queue term is continued linearly
+
+def project_simplex(v):
+    """Euclidean projection of each row of v onto the probability simplex."""
+    v = np.atleast_2d(v)
+    u = -np.sort(-v, axis=1)
+    css = np.cumsum(u, axis=1) - 1.0
+    k = np.arange(1, v.shape[1] + 1)
+    rho = (u - css / k > 0).sum(axis=1)
+    theta = css[np.arange(len(v)), rho - 1] / rho
+    return np.maximum(v - theta[:, None], 0.0)
+
+def linear_split(a):
+    """Exact optimum when there is no congestion term: each class to its cheapest tier."""
+    x = np.zeros_like(a, dtype=float)
+    x[np.arange(len(a)), np.argmin(a, axis=1)] = 1.0
+    return x
+
+def _queue(load, mu, rho_max=RHO_MAX):
+    # returns f(L) = L/(mu-L) and f'(L) = mu/(mu-L)^2, extended linearly past rho_max
+    cap = rho_max * mu
+    l = np.minimum(load, cap)
+    f = l / (mu - l)
+    d = mu / (mu - l) ** 2
+    return f + d * (load - l), d
+
+def cost(x, a, lam, work, mu, w_queue):
+    load = (lam * work) @ x
+    f, _ = _queue(load, mu)
+    return float((lam[:, None] * x * a).sum() + (w_queue * f).sum())
+
+def gradient(x, a, lam, work, mu, w_queue):
+    load = (lam * work) @ x
+    _, d = _queue(load, mu)
+    return lam[:, None] * a + np.outer(lam * work, w_queue * d)
+
+def optimize_split(a, lam, work=None, mu=None, w_queue=1.0, x0=None,
+                   max_iter=200, tol=1e-6):
+    """Minimise the tiered cost over x (classes x tiers, rows on the simplex).
+
+    a: (C, K) per-task linear cost; lam: (C,) arrival rates; work: (C,) service
+    demand per task; mu: (K,) tier capacity in work units/s (None = no queueing,
+    solved in closed form). Projected gradient with backtracking; each iteration
+    is O(C*K log K). Returns (x, gap) where gap is the Frank-Wolfe duality gap,
+    an upper bound on the distance to the optimal cost.
+    """
+    a = np.asarray(a, dtype=float)
+    lam = np.asarray(lam, dtype=float)
+    if mu is None:
+        return linear_split(a), 0.0
+    work = np.ones_like(lam) if work is None else np.asarray(work, dtype=float)
+    mu = np.asarray(mu, dtype=float)
+    w_queue = np.broadcast_to(np.asarray(w_queue, dtype=float), mu.shape)
+    x = linear_split(a) if x0 is None else project_simplex(x0)
+    step = 1.0 / max(1e-12, np.abs(lam[:, None] * a).max())
+    J = cost(x, a, lam, work, mu, w_queue)
+    gap = np.inf
+    for _ in range(max_iter):
+        g = gradient(x, a, lam, work, mu, w_queue)
+        gap = float((g * x).sum() - g.min(axis=1).sum())
+        if gap <= tol * max(1.0, abs(J)):
+            break
+        while True:
+            xn = project_simplex(x - step * g)
+            Jn = cost(xn, a, lam, work, mu, w_queue)
+            # sufficient decrease for the projected step
+            if Jn <= J + (g * (xn - x)).sum() + ((xn - x) ** 2).sum() / (2 * step) or step < 1e-12:
+                break
+            step *= 0.5
+        x, J = xn, Jn
+        step *= 2.0  # let the step grow back after a successful move
+    return x, gap
\ No newline at end of file
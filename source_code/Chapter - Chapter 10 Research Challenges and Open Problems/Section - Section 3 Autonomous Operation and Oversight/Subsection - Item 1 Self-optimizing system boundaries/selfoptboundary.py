@@ -1,71 +1,93 @@
 #!/usr/bin/env python3
 # Lightweight adaptive offload controller for edge nodes.
-import time, math, requests
+import time, threading
+import numpy as np
 import psutil
-from collections import deque
+from boundaryopt import optimize_split
+from loadsampler import get_sampler  # Chapter 10 load sampler, deployed alongside
+from peermonitor import PeerMonitor  # Chapter 11 peer monitor, deployed alongside
 
 # Tunable weights (set by operator policy)
 wL, wE, wP, wR = 0.5, 0.3, 0.15, 0.05
-eta = 0.1  # learning rate
 smoothing = 0.8
-window = deque(maxlen=10)
 
-def measure_metrics(offload_url):
-    # CPU load and available memory
-    cpu = psutil.cpu_percent(interval=None) / 100.0
-    mem = psutil.virtual_memory().available / (1024**2)
-    # RTT to offload endpoint (simple HTTP HEAD)
-    t0 = time.time()
-    try:
-        r = requests.head(offload_url, timeout=0.5)
-        r.raise_for_status()
-        rtt = (time.time() - t0) * 1000.0
-        loss = 0.0
-    except Exception:
-        rtt = 1000.0
-        loss = 1.0
-    # battery approximation (0..1) or fallback to AC
-    batt = psutil.sensors_battery()
-    battery_level = batt.percent / 100.0 if batt else 1.0
-    return {'cpu': cpu, 'mem': mem, 'rtt': rtt, 'loss': loss, 'battery': battery_level}
+# Offload tiers, nearest first: (name, health URL or None for the device, capacity
+# in work units/s, energy J per work unit, privacy penalty, base risk).
+TIERS = [
+    ("device",    None,                                    25.0, 3.0, 0.0, 0.01),
+    ("neighbour", "http://edge-peer.example.local/health",  40.0, 1.5, 0.5, 0.03),
+    ("mec",       "https://edge-mec.example.local/health", 120.0, 1.0, 1.0, 0.05),
+    ("cloud",     "https://cloud.example.com/health",     1000.0, 0.8, 2.0, 0.08),
+]
+# Concurrent task classes: (name, arrivals/s, work units per task, privacy sensitivity)
+TASK_CLASSES = [
+    ("detect",    10.0, 1.0,  1.0),
+    ("track",     30.0, 0.2,  0.5),
+    ("telemetry",  5.0, 0.05, 0.1),
+]
+_, _, MU, ENERGY, PRIVACY, RISK = (np.array(col) for col in zip(*TIERS))
+_, LAM, WORK, SENSITIVITY = (np.array(col) for col in zip(*TASK_CLASSES))
+QUEUE_WEIGHT = wL * 1000.0   # queueing delay (s of tasks in system) in the same ms units
+CPU_DEADBAND = 0.05          # re-optimise only when inputs move by more than this...
+RTT_DEADBAND = 0.10          # ...or RTT changes by this fraction
+PROBE_S = 0.5                # probe round period; CPU is re-read on every round
 
-def local_cost(m):
-    Lloc = max(20.0, 40.0 * (1 + m['cpu']))  # empirical model ms
-    Eloc = 3.0 * (1 + 2*m['cpu'])  # J per inference approx
-    Ploc = 0.0
-    Rloc = 0.01  # low risk
-    return wL*Lloc + wE*Eloc + wP*Ploc + wR*Rloc
+def measure_tiers(monitor):
+    # per-tier RTT (ms) and loss from the shared monitor; the device tier has neither
+    cpu, _ = get_sampler().mean(1.0)
+    rtt = np.array([0.0 if url is None else monitor.rtt(url) * 1000.0 for _, url, *_ in TIERS])
+    loss = np.array([0.0 if url is None else monitor.stats(url)["loss"] for _, url, *_ in TIERS])
+    batt = psutil.sensors_battery()
+    return {'cpu': cpu, 'rtt': rtt, 'loss': loss,
+            'battery': batt.percent / 100.0 if batt else 1.0}
 
-def remote_cost(m):
-    Lrem = max(10.0, m['rtt'] + 10.0)  # ms
-    Erem = 1.0 + 0.1*m['rtt']/100.0
-    Prem = 1.0  # privacy penalty when data leaves device
-    Rrem = 0.05 + 0.5*m['loss']
-    return wL*Lrem + wE*Erem + wP*Prem + wR*Rrem
+def tier_costs(m):
+    """(classes, tiers) linear cost per task and per-tier capacity for metrics m."""
+    energy = ENERGY.copy()
+    energy[0] *= 1 + 2*m['cpu']                   # device energy grows with load
+    mu = MU.copy()
+    mu[0] = max(1.0, MU[0] * (1.0 - m['cpu']))    # and its spare capacity shrinks
+    a = (wL*m['rtt'][None, :] + wE*np.outer(WORK, energy)
+         + wP*np.outer(SENSITIVITY, PRIVACY) + wR*(RISK + 0.5*m['loss'])[None, :])
+    return a, mu
 
-def update_boundary(b, m):
-    # finite-difference gradient estimate
-    eps = 1e-3
-    Jb = b*local_cost(m) + (1-b)*remote_cost(m)
-    Jb_eps = (b+eps)*local_cost(m) + (1-(b+eps))*remote_cost(m)
-    grad = (Jb_eps - Jb)/eps
-    b_new = min(1.0, max(0.0, b - eta*grad))
-    # respect hard constraints: force local if battery low
+def optimize_tiers(m, x0=None):
+    """Optimal split of every task class over TIERS; rows sum to 1."""
     if m['battery'] < 0.15:
-        b_new = 1.0
-    return b_new
+        # respect hard constraints: keep everything local on low battery
+        x = np.zeros((len(TASK_CLASSES), len(TIERS))); x[:, 0] = 1.0
+        return x
+    a, mu = tier_costs(m)
+    x, _ = optimize_split(a, LAM, WORK, mu, QUEUE_WEIGHT, x0=x0)
+    return x
+
+def moved(m, last):
+    if last is None:
+        return True
+    return (abs(m['cpu'] - last['cpu']) > CPU_DEADBAND
+            or np.any(np.abs(m['rtt'] - last['rtt']) > RTT_DEADBAND * np.maximum(last['rtt'], 1.0))
+            or (m['battery'] < 0.15) != (last['battery'] < 0.15))
 
 def main():
-    offload_url = "https://edge-mec.example.local/health"
-    b = 1.0  # start local
+    changed = threading.Event()
+    monitor = PeerMonitor([url for _, url, *_ in TIERS if url], method="HEAD", timeout_s=0.5,
+                          fail_rtt=1.0, interval_s=PROBE_S, on_round=changed.set).start_thread()
+    x = np.zeros((len(TASK_CLASSES), len(TIERS))); x[:, 0] = 1.0  # start local
+    x_opt, last = None, None
     while True:
-        m = measure_metrics(offload_url)
-        b = smoothing*b + (1-smoothing)*update_boundary(b, m)
+        # driven by the monitor: each completed probe round wakes the loop once
+        changed.wait()
+        changed.clear()
+        m = measure_tiers(monitor)
+        if not moved(m, last):
+            continue
+        last = m
+        x_opt = optimize_tiers(m, x0=x_opt)
+        x = smoothing*x + (1-smoothing)*x_opt
         # enforce pod/container resource pinning or local model selection here
         # example: toggle model shard or set environment variable for worker
-        # log and sleep
-        print(f"time={time.time():.0f} b={b:.3f} metrics={m}")
-        time.sleep(1.0)
+        split = {c[0]: dict(zip((t[0] for t in TIERS), np.round(row, 3))) for c, row in zip(TASK_CLASSES, x)}
+        print(f"time={time.time():.0f} split={split} cpu={m['cpu']:.2f}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
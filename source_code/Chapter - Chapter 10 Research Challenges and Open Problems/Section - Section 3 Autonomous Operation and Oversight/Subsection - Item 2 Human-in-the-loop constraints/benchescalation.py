@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Benchmark: blocking requests.post + Timer per message (old evaluate) vs
+# EscalationWorker, under bursty 100 Hz perception input. The operator is a
+# local stub endpoint that never acknowledges, so every incident ends in a
+# safe stop. Reports callback cost, executor lag, prompts/timers/stops and the
+# crossing-to-safe-stop time measured against the configured deadline.
+import argparse, asyncio, multiprocessing as mp, random, threading, time
+import numpy as np
+import requests
+from aiohttp import web
+from escalation import EscalationWorker
+
+def stub_operator(port, delay_s, ready):
+    async def prompt(request):
+        await request.read()
+        await asyncio.sleep(delay_s)
+        return web.json_response({"ok": True})
+    async def main():
+        app = web.Application(); app.router.add_post("/prompt", prompt)
+        runner = web.AppRunner(app, access_log=None); await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        ready.set(); await asyncio.Event().wait()
+    asyncio.run(main())
+
+def schedule(duration, rate_hz, burst, seed=0):
+    # messages arrive in clumps of `burst` at rate_hz/burst; low confidence in
+    # 300 ms episodes spaced 0.8-1.5 s apart
+    rng = random.Random(seed)
+    t, msgs = 0.0, []
+    while t < duration:
+        msgs += [(t, None)] * burst
+        t += burst / rate_hz
+    eps, e = [], 0.2
+    while e < duration:
+        eps.append((e, e + 0.3)); e += 0.3 + rng.uniform(0.8, 1.5)
+    return [(t, any(a <= t < b for a, b in eps)) for t, _ in msgs]
+
+def drive(msgs, callback):
+    # single-threaded executor: a slow callback delays every later message
+    lag, cost = [], []
+    t0 = time.monotonic()
+    for t, low in msgs:
+        wait = t0 + t - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        start = time.monotonic()
+        lag.append(start - (t0 + t))
+        callback(low, start)
+        cost.append(time.monotonic() - start)
+    return np.array(lag), np.array(cost)
+
+def legacy(msgs, url, timeout_s):
+    stops, crossings, prompts, timers = [], [], [0], [0]
+    state = {"low": False}
+    def stop(episode):
+        stops.append((episode, time.monotonic()))
+    def cb(low, now):
+        if low and not state["low"]:
+            crossings.append(now)
+        state["low"] = low
+        if low:
+            try:
+                requests.post(url, json={"vehicle_id": "robot_42"}, timeout=1.0)
+                prompts[0] += 1
+            except requests.RequestException:
+                pass
+            threading.Timer(timeout_s, stop, (len(crossings) - 1,)).start(); timers[0] += 1
+    lag, cost = drive(msgs, cb)
+    time.sleep(timeout_s + 1.0)
+    # first safe stop caused by each crossing's own timers
+    first = [min((t for e, t in stops if e == i), default=np.nan) - c for i, c in enumerate(crossings)]
+    return lag, cost, prompts[0], timers[0], len(stops), np.array(first)
+
+def worker(msgs, url, timeout_s):
+    stops = []
+    w = EscalationWorker(url, timeout_s, lambda inc: stops.append((inc, time.monotonic()))).start()
+    def cb(low, now):
+        if low:
+            w.raise_incident("robot_42", {"vehicle_id": "robot_42"})
+    lag, cost = drive(msgs, cb)
+    time.sleep(timeout_s + 0.5)
+    w.stop()
+    first = np.array([t - inc["raised"] for inc, t in stops])
+    return lag, cost, w.stats["prompts"], w.stats["raised"], len(stops), first
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--duration", type=float, default=6.0)
+    ap.add_argument("--rate", type=float, default=100.0)
+    ap.add_argument("--burst", type=int, default=5)
+    ap.add_argument("--timeout", type=float, default=0.5)
+    ap.add_argument("--operator-ms", type=float, default=50.0)
+    ap.add_argument("--port", type=int, default=18090)
+    args = ap.parse_args()
+    ready = mp.Event()
+    proc = mp.Process(target=stub_operator, args=(args.port, args.operator_ms / 1e3, ready), daemon=True)
+    proc.start(); ready.wait()
+    url = f"http://127.0.0.1:{args.port}/prompt"
+    msgs = schedule(args.duration, args.rate, args.burst)
+    print(f"{len(msgs)} messages, {sum(l for _, l in msgs)} low-confidence, deadline {args.timeout * 1e3:.0f} ms")
+    print(f"{'scheme':<8}{'cb p99 ms':>10}{'lag max ms':>11}{'prompts':>9}{'timers':>8}{'stops':>7}"
+          f"{'cross->stop p50':>16}{'p99 ms':>8}")
+    for name, fn in (("legacy", legacy), ("worker", worker)):
+        lag, cost, prompts, timers, stops, first = fn(msgs, url, args.timeout)
+        first = first[~np.isnan(first)] * 1e3
+        p50, p99 = (np.percentile(first, [50, 99]) if len(first) else (np.nan, np.nan))
+        print(f"{name:<8}{1e3 * np.percentile(cost, 99):>10.3f}{1e3 * lag.max():>11.1f}{prompts:>9}{timers:>8}"
+              f"{stops:>7}{p50:>16.1f}{p99:>8.1f}")
+    proc.terminate()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
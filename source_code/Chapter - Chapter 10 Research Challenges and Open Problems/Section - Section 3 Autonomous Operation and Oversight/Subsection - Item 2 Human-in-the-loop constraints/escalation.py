@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Async operator-escalation worker: one persistent HTTP session, one open
+# incident per key, one deadline timer per incident.
+import asyncio, itertools, threading, time
+import aiohttp
+
+class EscalationWorker:
+    """Runs escalations on its own event loop so perception callbacks never block.
+
+    raise_incident() is safe to call from any thread at any rate: while an
+    incident for `key` is open, further calls only refresh its context. The
+    first call prompts the operator (with retries until the deadline) and arms
+    a single timer; ack() cancels it, otherwise `on_deadline(incident)` runs on
+    the worker thread when it expires.
+    """
+    def __init__(self, endpoint, timeout_s, on_deadline, post_timeout_s=1.0,
+                 retry_s=0.2, log=None):
+        self.endpoint, self.timeout_s = endpoint, timeout_s
+        self.on_deadline, self.post_timeout_s, self.retry_s = on_deadline, post_timeout_s, retry_s
+        self.log = log or (lambda level, msg: None)
+        self.open = {}                  # key -> incident dict
+        self.closed = []                # finished incidents, for latency accounting
+        self.stats = {"raised": 0, "deduplicated": 0, "prompts": 0, "post_errors": 0}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._loop = asyncio.new_event_loop()
+        self._session = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name="escalation", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open_session(), self._loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _open_session(self):
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=self.post_timeout_s))
+
+    def raise_incident(self, key, context):
+        """Open (or refresh) the incident for key; returns True if it was newly opened."""
+        now = time.monotonic()
+        with self._lock:
+            inc = self.open.get(key)
+            if inc is not None:
+                inc["context"] = context
+                self.stats["deduplicated"] += 1
+                return False
+            inc = {"id": f"{key}-{next(self._ids)}", "key": key, "context": context,
+                   "raised": now, "deadline": now + self.timeout_s, "state": "open"}
+            self.open[key] = inc
+            self.stats["raised"] += 1
+        self._loop.call_soon_threadsafe(self._arm, inc)
+        return True
+
+    def ack(self, key):
+        """Operator took control: cancel the deadline for key's incident."""
+        with self._lock:
+            inc = self.open.get(key)
+        if inc is not None:
+            self._loop.call_soon_threadsafe(self._close, inc, "acked")
+
+    def _arm(self, inc):
+        if inc["state"] != "open":
+            return
+        inc["timer"] = self._loop.call_at(self._loop.time() + inc["deadline"] - time.monotonic(),
+                                          self._expire, inc)
+        inc["task"] = self._loop.create_task(self._prompt(inc))
+
+    def _close(self, inc, state):
+        if inc["state"] != "open":
+            return
+        inc["state"], inc["closed"] = state, time.monotonic()
+        for h in (inc.get("timer"), inc.get("task")):
+            if h is not None:
+                h.cancel()
+        with self._lock:
+            if self.open.get(inc["key"]) is inc:
+                del self.open[inc["key"]]
+        self.closed.append(inc)
+
+    def _expire(self, inc):
+        if inc["state"] != "open":
+            return
+        self._close(inc, "expired")
+        self.log("error", f"operator did not respond to {inc['id']} in time")
+        self.on_deadline(inc)
+
+    async def _prompt(self, inc):
+        # the incident id lets the operator side drop duplicate deliveries
+        while inc["state"] == "open":
+            with self._lock:
+                payload = dict(inc["context"], incident_id=inc["id"])
+            try:
+                async with self._session.post(self.endpoint, json=payload) as resp:
+                    await resp.read()
+                    if resp.status == 200:
+                        self.stats["prompts"] += 1
+                        self.log("info", f"operator prompt {inc['id']} delivered")
+                        return
+                    self.log("error", f"operator prompt failed {resp.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.log("error", f"signaling error: {e}")
+            self.stats["post_errors"] += 1
+            await asyncio.sleep(self.retry_s)
\ No newline at end of file
@@ -3,16 +3,18 @@
 import threading
 import json
 import time
-import requests  # small blocking HTTP for signaling (replaceable with aiohttp)
 import rclpy
 from rclpy.node import Node
 from std_msgs.msg import Float32, Bool
 from geometry_msgs.msg import Twist
+from escalation import EscalationWorker
 
 OPERATOR_ENDPOINT = "https://ops.example.com/api/prompt"  # secure endpoint
 OPERATOR_TIMEOUT = 5.0  # seconds allowed for human to respond
 CONFIDENCE_THRESHOLD = 0.6
 TTC_THRESHOLD = 2.5  # seconds
+VEHICLE_ID = "robot_42"
+INCIDENT_KEY = f"{VEHICLE_ID}/low-confidence-ttc"  # one open incident at a time
 
 class HumanFallbackManager(Node):
     def __init__(self):
@@ -24,6 +26,9 @@ class HumanFallbackManager(Node):
         self.create_subscription(Float32, '/perception/ttc', self.ttc_cb, 10)
         self.cmd_pub = self.create_publisher(Twist, '/cmd_vel', 10)
         self.safe_stop_pub = self.create_publisher(Bool, '/safe_stop', 10)
+        # prompts, retries and the deadline live on the worker's loop, off the executor
+        self.escalation = EscalationWorker(OPERATOR_ENDPOINT, OPERATOR_TIMEOUT,
+                                           self._operator_timeout, log=self._log).start()
         self.get_logger().info("HumanFallbackManager initialized")
 
     def conf_cb(self, msg):
@@ -38,36 +43,29 @@ class HumanFallbackManager(Node):
         # If perception confidence low and imminent collision, request operator
         if self.confidence < CONFIDENCE_THRESHOLD and self.ttc < TTC_THRESHOLD:
             if not self.ack_event.is_set():
-                self.get_logger().warn("Escalating to human operator")
-                self.prompt_operator()
-                # start timer thread to await ack
-                timer = threading.Timer(OPERATOR_TIMEOUT, self._operator_timeout)
-                timer.start()
+                # repeated crossings refresh the open incident instead of re-prompting
+                if self.escalation.raise_incident(INCIDENT_KEY, self.prompt_context()):
+                    self.get_logger().warn("Escalating to human operator")
 
-    def prompt_operator(self):
-        payload = {
-            "vehicle_id": "robot_42",
+    def prompt_context(self):
+        return {
+            "vehicle_id": VEHICLE_ID,
             "timestamp": time.time(),
             "confidence": self.confidence,
             "ttc": self.ttc,
             # include compressed sensor context pointer or small image hash
         }
-        # synchronous post; in deployment replace with async client and retries
-        try:
-            resp = requests.post(OPERATOR_ENDPOINT, json=payload, timeout=1.0)
-            if resp.status_code == 200:
-                self.get_logger().info("Operator prompt delivered")
-            else:
-                self.get_logger().error(f"Operator prompt failed {resp.status_code}")
-        except requests.RequestException as e:
-            self.get_logger().error(f"Signaling error: {e}")
+
+    def _log(self, level, msg):
+        getattr(self.get_logger(), level)(msg)
 
     def operator_ack(self):
         # Called by external callback when operator accepts control
         self.ack_event.set()
+        self.escalation.ack(INCIDENT_KEY)
         self.get_logger().info("Operator acknowledged control")
 
-    def _operator_timeout(self):
+    def _operator_timeout(self, incident):
         if not self.ack_event.is_set():
             self.get_logger().error("Operator did not respond in time; executing safe stop")
             self.execute_safe_stop()
@@ -86,5 +84,6 @@ def main(args=None):
     try:
         rclpy.spin(node)
     finally:
+        node.escalation.stop()
         node.destroy_node()
         rclpy.shutdown()
\ No newline at end of file
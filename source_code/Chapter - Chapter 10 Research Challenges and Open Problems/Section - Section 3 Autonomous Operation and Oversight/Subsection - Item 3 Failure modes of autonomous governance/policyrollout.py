@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 # Production-ready: uses paho-mqtt and cryptography libraries.
-import time, json, threading, logging
+import json, logging, socket
 import paho.mqtt.client as mqtt
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import padding
+from rolloutengine import RolloutAgent
 
 BROKER = "mqtt.example.city"
 TOPIC_UPDATE = "edge/policy/update"
 TOPIC_STATUS = "edge/policy/status"
 CANARY_TIMEOUT = 300  # seconds
+CHECK_INTERVAL = 5    # seconds between canary safety checks
+POLICY_PATH = "/var/lib/edge_policy.json"
+SAFE_POLICY_PATH = "/etc/edge_policy.default.json"  # factory policy shipped with the image
+NODE_ID = socket.gethostname()
 PUBLIC_KEY_PEM = open("gov_pub.pem","rb").read()
 
 pubkey = serialization.load_pem_public_key(PUBLIC_KEY_PEM)
@@ -28,7 +33,7 @@ def verify_signature(payload: bytes, signature: bytes) -> bool:
 
 def apply_policy(policy: dict):
     # Atomically deploy policy to local store and signal actuators via REST/CoAP.
-    with open("/var/lib/edge_policy.json","w") as f:
+    with open(POLICY_PATH,"w") as f:
         json.dump(policy, f)
     # TODO: call actuator proxies; placeholder:
     log.info("Applied policy version %s", policy["version"])
@@ -38,33 +43,35 @@ def rollback_policy(old_version: dict):
     apply_policy(old_version)
     log.warning("Rolled back to version %s", old_version["version"])
 
+def publish_status(status: dict):
+    if status["status"] != "canary_ok":
+        log.warning("Rollout %s: %s", status.get("version"), status["status"])
+    client.publish(TOPIC_STATUS, json.dumps(status), qos=1)
+
+def load_current(path=POLICY_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# Update, wave and abort messages arrive as signed bytes + b"\n" + hex signature
+# (see rolloutengine.frame). The agent verifies off-thread and runs canaries on its
+# own loop, so this callback returns immediately and the client keeps flowing.
+agent = RolloutAgent(NODE_ID, verify_signature, apply_policy,
+                     # implement sensor checks; looked up per check, as before, so the
+                     # placeholder does not break import
+                     lambda: check_local_safety_metrics(),
+                     publish_status, current=load_current(), rollback=rollback_policy,
+                     check_interval=CHECK_INTERVAL, canary_timeout=CANARY_TIMEOUT,
+                     safe_default=load_current(SAFE_POLICY_PATH))
+
 def on_message(client, userdata, msg):
-    # Incoming update contains payload and base64 signature
-    envelope = json.loads(msg.payload.decode())
-    payload = json.dumps(envelope["policy"]).encode()
-    sig = bytes.fromhex(envelope["signature_hex"])
-    if not verify_signature(payload, sig):
-        log.error("Invalid signature for update")
-        return
-    policy = envelope["policy"]
-    # Canary logic: deploy locally as canary first
-    old = json.load(open("/var/lib/edge_policy.json"))
-    apply_policy(policy)
-    start = time.time()
-    # Wait for monitoring metric to confirm safe operation
-    while time.time() - start < CANARY_TIMEOUT:
-        status = check_local_safety_metrics()  # implement sensor checks
-        if status["safe"]:
-            client.publish(TOPIC_STATUS, json.dumps({"node":NODE_ID,"status":"canary_ok","version":policy["version"]}))
-            return
-        time.sleep(5)
-    # Timeout -> rollback and alert
-    rollback_policy(old)
-    client.publish(TOPIC_STATUS, json.dumps({"node":NODE_ID,"status":"rolled_back","version":old["version"]}))
+    agent.on_raw(msg.payload)
 
 client = mqtt.Client()
 client.on_message = on_message
 client.connect(BROKER)
-client.subscribe(TOPIC_UPDATE)
+client.subscribe(TOPIC_UPDATE, qos=1)
 client.loop_start()
 # keep running in production process manager (systemd, k8s)
\ No newline at end of file
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# Staged policy rollout: non-blocking node agent and fleet coordinator.
+# Wire format for every governance message is the signed bytes followed by
+# b"\n" and the hex signature, so verification runs on exactly what was signed.
+import asyncio, hashlib, json, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+WAVES = (1, 10, 100)          # percent of the fleet per rollout wave
+BUCKETS = 10000               # wave membership resolution (basis points)
+SEEN_MAX = 4096               # raw-message digests remembered for de-duplication
+
+def frame(payload: bytes, signature: bytes) -> bytes:
+    return payload + b"\n" + signature.hex().encode()
+
+def unframe(raw: bytes):
+    payload, _, sig_hex = raw.rpartition(b"\n")
+    return payload, bytes.fromhex(sig_hex.decode())
+
+def node_bucket(node_id: str) -> int:
+    """Stable position of a node in [0, BUCKETS); a wave of p% covers buckets < p*100."""
+    return int.from_bytes(hashlib.sha256(node_id.encode()).digest()[:4], "big") % BUCKETS
+
+def in_wave(node_id: str, percent: float) -> bool:
+    return node_bucket(node_id) < percent * BUCKETS / 100
+
+class RolloutAgent:
+    """Per-node rollout state machine; on_raw() is safe to call from the MQTT thread.
+
+    Messages are verified on `pool` and handled on `loop`, so the network
+    callback only hashes and hands off. Several versions may be in flight; the
+    newest one entering canary supersedes an older canary, and rollbacks
+    always return to the last version that passed its canary. With no current
+    policy (first boot) that is `safe_default`; without either, canaries are
+    refused rather than applied with nothing to roll back to.
+    """
+    def __init__(self, node_id, verify, apply, check_safety, publish_status, current=None,
+                 rollback=None, loop=None, pool=None, check_interval=5.0, canary_timeout=300.0,
+                 safe_default=None):
+        self.node_id, self.bucket = node_id, node_bucket(node_id)
+        self.verify, self.apply, self.check_safety = verify, apply, check_safety
+        self.rollback = rollback or apply
+        self.publish_status = publish_status
+        self.check_interval, self.canary_timeout = check_interval, canary_timeout
+        self.good = current if current is not None else safe_default  # rollback target
+        self.versions = {}                  # version -> {"policy", "percent", "state", "task"}
+        self._seen = OrderedDict()          # digests of raw messages already accepted
+        self._own_loop = loop is None
+        self.loop = loop or asyncio.new_event_loop()
+        self.pool = pool or ThreadPoolExecutor(max_workers=2, thread_name_prefix="verify")
+        if self._own_loop:
+            threading.Thread(target=self.loop.run_forever, name="rollout", daemon=True).start()
+
+    def on_raw(self, raw: bytes):
+        digest = hashlib.sha256(raw).digest()
+        if digest in self._seen:
+            return                           # QoS 1 redelivery or fleet-wide fan-out echo
+        self._seen[digest] = None
+        if len(self._seen) > SEEN_MAX:
+            self._seen.popitem(last=False)
+        fut = self.pool.submit(self._decode, raw)
+        fut.add_done_callback(lambda f: self.loop.call_soon_threadsafe(self._handle, f))
+
+    def _decode(self, raw):
+        payload, sig = unframe(raw)
+        if not self.verify(payload, sig):
+            raise ValueError("invalid signature")
+        return json.loads(payload)
+
+    def _handle(self, fut):
+        try:
+            msg = fut.result()
+        except Exception as e:
+            self.publish_status({"node": self.node_id, "status": "rejected", "error": str(e)})
+            return
+        v = msg["version"]
+        st = self.versions.setdefault(v, {"policy": None, "percent": 0, "state": "pending", "task": None})
+        kind = msg["type"]
+        if kind == "update":
+            st["policy"] = msg["policy"]
+            if st["state"] == "pending":
+                st["state"] = "verified"
+        elif kind == "wave":
+            st["percent"] = max(st["percent"], msg["percent"])
+        elif kind == "abort":
+            self._abort(v, st)
+            return
+        if st["state"] == "verified" and self.bucket < st["percent"] * BUCKETS / 100:
+            self._start_canary(v, st)
+
+    def _start_canary(self, v, st):
+        if self.good is None:
+            st["state"] = "refused"
+            self.publish_status({"node": self.node_id, "status": "rejected", "version": v,
+                                 "error": "no known-good policy to roll back to"})
+            return
+        for other, o in self.versions.items():
+            if o["state"] == "canary":
+                o["task"].cancel()
+                o["state"] = "superseded"
+        st["previous"] = self.good
+        self.apply(st["policy"])
+        st["state"] = "canary"
+        st["task"] = self.loop.create_task(self._canary(v, st))
+
+    async def _canary(self, v, st):
+        deadline = self.loop.time() + self.canary_timeout
+        while self.loop.time() < deadline:
+            if asyncio.iscoroutinefunction(self.check_safety):
+                status = await self.check_safety()
+            else:
+                status = await self.loop.run_in_executor(None, self.check_safety)
+            if status["safe"]:
+                st["state"], self.good = "ok", st["policy"]
+                self.publish_status({"node": self.node_id, "status": "canary_ok", "version": v})
+                return
+            await asyncio.sleep(self.check_interval)
+        self._rollback(v, st, "rolled_back")
+
+    def _rollback(self, v, st, state):
+        st["state"] = state
+        if self.good is not None:
+            self.rollback(self.good)
+        self.publish_status({"node": self.node_id, "status": state, "version": v,
+                             "restored": self.good and self.good.get("version")})
+
+    def _abort(self, v, st):
+        if st["state"] == "canary":
+            st["task"].cancel()
+            self._rollback(v, st, "aborted")
+        elif st["state"] == "ok":
+            # the fleet rejected a version that passed locally: step back from it
+            if self.good is st["policy"]:
+                self.good = st["previous"]
+                self._rollback(v, st, "aborted")
+            else:
+                st["state"] = "aborted"      # already superseded by a newer good version
+        else:
+            st["state"] = "aborted"
+
+class FleetRollout:
+    """Coordinator: publishes signed update/wave/abort messages and advances waves
+    on aggregated canary health. on_status() may be called from any thread.
+
+    A wave advances once every node in it has reported (a failing node only
+    reports when its canary times out), or, if `soak_s` is set, once the wave
+    has soaked that long; failures are weighed against the nodes that reported.
+    Failures arriving after completion still abort, which rolls the fleet back.
+    """
+    def __init__(self, node_ids, sign, publish, waves=WAVES, ok_ratio=0.95, fail_ratio=0.02,
+                 wave_timeout=600.0, soak_s=None, on_done=None, clock=time.monotonic):
+        self.buckets = sorted(node_bucket(n) for n in node_ids)
+        self.sign, self.publish, self.waves = sign, publish, tuple(waves)
+        self.ok_ratio, self.fail_ratio, self.wave_timeout = ok_ratio, fail_ratio, wave_timeout
+        self.soak_s = soak_s
+        self.on_done, self.clock = on_done, clock
+        self.rollouts = {}                   # version -> rollout record
+        self._lock = threading.Lock()
+
+    def _send(self, msg):
+        payload = json.dumps(msg, separators=(",", ":")).encode()
+        self.publish(frame(payload, self.sign(payload)))
+
+    def _expected(self, percent):
+        # nodes whose bucket falls inside the wave
+        limit = percent * BUCKETS / 100
+        lo, hi = 0, len(self.buckets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.buckets[mid] < limit:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def start(self, version, policy):
+        with self._lock:
+            self.rollouts[version] = {"wave": 0, "ok": set(), "failed": set(), "state": "rolling",
+                                      "started": self.clock(), "wave_started": self.clock(),
+                                      "wave_times": []}
+        self._send({"type": "update", "version": version, "policy": policy})
+        self._send({"type": "wave", "version": version, "percent": self.waves[0]})
+
+    def on_status(self, status):
+        with self._lock:
+            r = self.rollouts.get(status.get("version"))
+            if r is None or r["state"] not in ("rolling", "complete"):
+                return
+            if status["status"] == "canary_ok":
+                r["ok"].add(status["node"])
+            elif status["status"] in ("rolled_back", "rejected"):
+                r["failed"].add(status["node"])
+            action = self._evaluate(status["version"], r)
+        self._act(status["version"], action)
+
+    def tick(self):
+        """Check wave timeouts and soak periods; call periodically."""
+        actions = []
+        with self._lock:
+            for v, r in self.rollouts.items():
+                if r["state"] != "rolling":
+                    continue
+                if self.clock() - r["wave_started"] > self.wave_timeout:
+                    r["state"] = "aborted"
+                    actions.append((v, "abort"))
+                else:
+                    action = self._evaluate(v, r)
+                    if action:
+                        actions.append((v, action))
+        for v, a in actions:
+            self._act(v, a)
+
+    def _evaluate(self, v, r):
+        expected = max(1, self._expected(self.waves[r["wave"]]))
+        ok, failed = len(r["ok"]), len(r["failed"])
+        reported = ok + failed
+        if r["state"] == "complete":
+            # late failures (canary timeouts) after the last wave was accepted
+            if failed > self.fail_ratio * reported:
+                r["state"] = "aborted"
+                return "abort"
+            return None
+        if failed > self.fail_ratio * expected:
+            r["state"] = "aborted"
+            return "abort"
+        now = self.clock()
+        soaked = self.soak_s is not None and now - r["wave_started"] >= self.soak_s
+        if reported < expected and not soaked:
+            return None
+        if failed > self.fail_ratio * reported:
+            r["state"] = "aborted"
+            return "abort"
+        if ok >= self.ok_ratio * expected:
+            r["wave_times"].append(now - r["started"])
+            if r["wave"] + 1 == len(self.waves):
+                r["state"] = "complete"
+                return "done"
+            r["wave"] += 1
+            r["wave_started"] = now
+            return "advance"
+        return None
+
+    def _act(self, v, action):
+        if action == "advance":
+            self._send({"type": "wave", "version": v, "percent": self.waves[self.rollouts[v]["wave"]]})
+        elif action == "abort":
+            self._send({"type": "abort", "version": v})
+        if action in ("abort", "done") and self.on_done:
+            self.on_done(v, self.rollouts[v])
\ No newline at end of file
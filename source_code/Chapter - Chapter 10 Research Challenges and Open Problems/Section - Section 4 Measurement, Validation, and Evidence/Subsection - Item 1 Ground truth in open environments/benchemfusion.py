@@ -0,0 +1,57 @@
+import argparse, time, tracemalloc
+import numpy as np
+from emfusion import SparseReports, em_fuse, em_fuse_sparse, OnlineEMFusion
+
+def synth(T, I, active, p_event=0.05, seed=0):
+    # most sensors are silent at any step; `active` reports per step on average
+    rng = np.random.default_rng(seed)
+    y = rng.random(T) < p_event
+    rel = rng.uniform(0.6, 0.95, I)
+    nnz = rng.poisson(active * T)
+    t = np.sort(rng.integers(0, T, nnz))
+    i = rng.integers(0, I, nnz).astype(np.int32)
+    x = np.where(rng.random(nnz) < rel[i], y[t], ~y[t]).astype(np.int8)
+    return SparseReports(t, i, x, T, I), y, rel
+
+def measure(fn, *a, **kw):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*a, **kw)
+    dt = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, dt, peak
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--T", type=int, default=10_000_000)
+    ap.add_argument("--I", type=int, default=1000)
+    ap.add_argument("--active", type=float, default=2.0, help="reports per step")
+    ap.add_argument("--iters", type=int, default=20)
+    args = ap.parse_args()
+    reps, y, rel = synth(args.T, args.I, args.active)
+    nnz = reps.t.size
+    print(f"T={args.T:.0e} I={args.I} reports={nnz:.2e} "
+          f"(dense float64 would be {args.T * args.I * 8 / 1e9:.1f} GB)")
+    # start above chance: with mostly-negative reports the default init lands on the flipped solution
+    (p, r), dt, peak = measure(em_fuse_sparse, reps, max_iter=args.iters, tol=0.0, r_init=0.8)
+    print(f"sparse EM: {args.iters} iters {dt:.1f}s ({dt / args.iters:.2f}s/iter), "
+          f"peak {peak / 1e6:.0f} MB, accuracy {np.mean((p > 0.5) == y):.3f}")
+    # dense path on a slice small enough to hold in memory, for per-cell cost comparison
+    Ts = min(args.T, 20_000)
+    m = reps.t < Ts
+    dense = np.zeros((Ts, args.I))
+    dense[reps.t[m], reps.i[m]] = reps.x[m]
+    _, dtd, peakd = measure(em_fuse, dense, max_iter=args.iters, tol=0.0)
+    print(f"dense EM on T={Ts}: {dtd:.2f}s, peak {peakd / 1e6:.0f} MB "
+          f"(~{dtd * args.T / Ts:.0f}s extrapolated to T={args.T:.0e})")
+    online = OnlineEMFusion(args.I, window=100_000)
+    steps = min(args.T, 200_000)
+    bounds = np.searchsorted(reps.t, np.arange(steps + 1))
+    t0 = time.perf_counter()
+    for s in range(steps):
+        a, b = bounds[s], bounds[s + 1]
+        online.update(reps.i[a:b], reps.x[a:b])
+    dto = time.perf_counter() - t0
+    print(f"online EM: {steps / dto:.0f} steps/s, window {online.window}, "
+          f"reliability MAE {np.mean(np.abs(online.r - rel)):.3f}")
\ No newline at end of file
@@ -1,38 +1,149 @@
+import collections
 import numpy as np
 
-def em_fuse(labels_matrix, max_iter=200, tol=1e-6, eps=1e-9):
+def _posterior(ll1, ll0, p_prior, eps):
+    # use log-sum-exp for numerical stability
+    a = ll1 + np.log(p_prior + eps)
+    b = ll0 + np.log(1 - p_prior + eps)
+    maxab = np.maximum(a, b)
+    denom = np.exp(a - maxab) + np.exp(b - maxab)
+    return np.exp(a - maxab) / (denom + eps)
+
+def em_fuse(labels_matrix, max_iter=200, tol=1e-6, eps=1e-9, r_init=None):
     """
     labels_matrix: (T, I) binary array where rows are time steps.
+    r_init: starting reliability (scalar or (I,)); default is each sensor's positive rate.
     Returns: posteriors p_y (T,), reliabilities r (I,)
     """
     T, I = labels_matrix.shape
+    X = np.asarray(labels_matrix, dtype=np.float64)
     # initialize reliabilities with slight bias to avoid degenerate values
-    r = np.clip(np.mean(labels_matrix, axis=0), 0.01, 0.99)
+    r = np.clip(np.mean(X, axis=0) if r_init is None else np.broadcast_to(r_init, (I,)), 0.01, 0.99)
     # prior for positive event (can be estimated or set from domain)
-    p_prior = np.clip(np.mean(labels_matrix), 0.01, 0.99)
+    p_prior = np.clip(np.mean(X), 0.01, 0.99)
 
     p_y = np.full(T, p_prior)
     for iteration in range(max_iter):
-        r_old = r.copy()
-        # E-step: compute P(y=1 | x) using Bayes, assume independence
-        log_p_x_given_y1 = np.sum(labels_matrix * np.log(r + eps) +
-                                  (1 - labels_matrix) * np.log(1 - r + eps), axis=1)
-        log_p_x_given_y0 = np.sum(labels_matrix * np.log(1 - r + eps) +
-                                  (1 - labels_matrix) * np.log(r + eps), axis=1)
-        # use log-sum-exp for numerical stability
-        a = log_p_x_given_y1 + np.log(p_prior + eps)
-        b = log_p_x_given_y0 + np.log(1 - p_prior + eps)
-        maxab = np.maximum(a, b)
-        denom = np.exp(a - maxab) + np.exp(b - maxab)
-        p_y = np.exp(a - maxab) / (denom + eps)
+        r_old = r
+        # E-step: compute P(y=1 | x) using Bayes, assume independence.
+        # log r and log(1-r) once per iteration; x*L + (1-x)*M = x*(L-M) + M,
+        # so both likelihoods come from a single matrix-vector product.
+        L, M = np.log(r + eps), np.log(1 - r + eps)
+        xw = X @ (L - M)
+        p_y = _posterior(xw + M.sum(), L.sum() - xw, p_prior, eps)
 
         # M-step: update reliabilities r_i
-        # expected agreement between sensor i and latent y
-        r = (p_y * labels_matrix + (1 - p_y) * (1 - labels_matrix)).sum(axis=0) / T
+        # expected agreement p*x + (1-p)*(1-x) = (2p-1)*x + (1-p), summed over t
+        r = ((2 * p_y - 1) @ X + (T - p_y.sum())) / T
         r = np.clip(r, 0.001, 0.999)  # numerical safety
         # optional: update prior
         p_prior = p_y.mean()
 
         if np.max(np.abs(r - r_old)) < tol:
             break
-    return p_y, r
\ No newline at end of file
+    return p_y, r
+
+class SparseReports:
+    """Observed reports only, as parallel arrays: step t, sensor i, label x in {0,1}.
+    Silent sensors are missing rather than negative."""
+    def __init__(self, t, i, x, T, I):
+        self.t = np.asarray(t, dtype=np.int64)
+        self.i = np.asarray(i, dtype=np.int32)
+        self.x = np.asarray(x, dtype=np.int8)
+        self.T, self.I = T, I
+
+    @classmethod
+    def from_dense(cls, labels_matrix):
+        # NaN entries are treated as missing
+        m = np.asarray(labels_matrix, dtype=np.float64)
+        t, i = np.nonzero(~np.isnan(m))
+        return cls(t, i, m[t, i], *m.shape)
+
+def em_fuse_sparse(reports, max_iter=200, tol=1e-6, eps=1e-9, r_init=None):
+    """
+    Missing-aware EM over SparseReports; O(nnz) per iteration, never materializes T x I.
+    Returns: posteriors p_y (T,), reliabilities r (I,)
+    """
+    t, i, T, I = reports.t, reports.i, reports.T, reports.I
+    pos = reports.x == 1
+    tp, ip, tn, in_ = t[pos], i[pos], t[~pos], i[~pos]  # split once; no float copy of x
+    n_obs = np.maximum(np.bincount(i, minlength=I), 1)
+    r = np.bincount(ip, minlength=I) / n_obs if r_init is None else np.broadcast_to(r_init, (I,))
+    r = np.clip(r, 0.01, 0.99)
+    p_prior = np.clip(tp.size / t.size if t.size else 0.5, 0.01, 0.99)
+    p_y = np.full(T, p_prior)
+    for iteration in range(max_iter):
+        r_old = r
+        L, M = np.log(r + eps), np.log(1 - r + eps)
+        # per-step sums over observed sensors only; silent sensors contribute nothing
+        ll1 = np.bincount(tp, weights=L[ip], minlength=T) + np.bincount(tn, weights=M[in_], minlength=T)
+        ll0 = np.bincount(tp, weights=M[ip], minlength=T) + np.bincount(tn, weights=L[in_], minlength=T)
+        p_y = _posterior(ll1, ll0, p_prior, eps)
+
+        # expected agreement: p for positive reports, 1-p for negative ones
+        agree = np.bincount(ip, weights=p_y[tp], minlength=I) + np.bincount(in_, weights=1 - p_y[tn], minlength=I)
+        r = np.clip(agree / n_obs, 0.001, 0.999)
+        p_prior = p_y.mean()
+        if np.max(np.abs(r - r_old)) < tol:
+            break
+    return p_y, r
+
+class OnlineEMFusion:
+    """
+    Sliding-window EM: each step gets its posterior from current reliabilities, then adds
+    its expected agreements to per-sensor sufficient statistics; steps older than
+    `window` are subtracted again. No refit of the history is needed.
+    """
+    def __init__(self, n_sensors, window=10_000, prior_strength=10.0, r0=0.8, p0=0.1, eps=1e-9):
+        self.I, self.window, self.eps = n_sensors, window, eps
+        # pseudo-counts keep new or rarely-reporting sensors near r0
+        self.k0, self.r0 = prior_strength, r0
+        self.agree = np.zeros(n_sensors)
+        self.count = np.zeros(n_sensors)
+        self.pos_sum = 0.0
+        self.p_prior = p0
+        self.steps = collections.deque()  # (sensors, labels, posterior) per step in the window
+        self.r = np.full(n_sensors, r0)
+
+    def _reliability(self, idx):
+        return np.clip((self.agree[idx] + self.k0 * self.r0) / (self.count[idx] + self.k0), 0.001, 0.999)
+
+    def _account(self, sensors, labels, p, sign):
+        a = (2 * p - 1) * labels + (1 - p)
+        np.add.at(self.agree, sensors, sign * a)
+        np.add.at(self.count, sensors, sign)
+        self.pos_sum += sign * p
+        self.r[sensors] = self._reliability(sensors)
+
+    def update(self, sensors, labels):
+        """Fuse one step of reports (sensor ids, 0/1 labels); returns P(y=1) for that step."""
+        sensors = np.asarray(sensors, dtype=np.int64)
+        labels = np.asarray(labels, dtype=np.float64)
+        r = self.r[sensors]
+        L, M = np.log(r + self.eps), np.log(1 - r + self.eps)
+        xw = labels @ (L - M)
+        p = float(_posterior(xw + M.sum(), L.sum() - xw, self.p_prior, self.eps))
+        self.steps.append((sensors, labels, p))
+        self._account(sensors, labels, p, +1)
+        if len(self.steps) > self.window:
+            self._account(*self.steps.popleft(), -1)
+        self.p_prior = min(0.99, max(0.01, self.pos_sum / len(self.steps)))
+        return p
+
+    def refine(self, iters=1):
+        """Optional extra EM passes over the window only, warm-started from current r."""
+        for _ in range(iters):
+            old = list(self.steps)
+            self.steps.clear()
+            self.agree[:] = 0.0; self.count[:] = 0.0; self.pos_sum = 0.0
+            r = self.r.copy()
+            for sensors, labels, _ in old:
+                rs = r[sensors]
+                L, M = np.log(rs + self.eps), np.log(1 - rs + self.eps)
+                xw = labels @ (L - M)
+                p = float(_posterior(xw + M.sum(), L.sum() - xw, self.p_prior, self.eps))
+                self.steps.append((sensors, labels, p))
+                self._account(sensors, labels, p, +1)
+            if self.steps:
+                self.p_prior = min(0.99, max(0.01, self.pos_sum / len(self.steps)))
+        return self.r
\ No newline at end of file
@@ -1,17 +1,16 @@
 #!/usr/bin/env python3
 # Minimal, production-ready telemetry agent for edge nodes.
-import sqlite3, json, time, hmac, hashlib, socket
+import json, time, hmac, hashlib, socket
 import paho.mqtt.client as mqtt
+from edgeoutbox import SqliteOutbox, publish_confirmed  # Chapter 1 outbox, deployed alongside
 
 DB = "/var/lib/edge_telemetry/telemetry.db"
 BROKER = "mqtt.example.city:8883"
 TOPIC = "city/edge/telemetry"
 HMAC_KEY = b"REPLACE_WITH_SECURE_KEY"
 
-# init local DB (durable buffer)
-conn = sqlite3.connect(DB, timeout=30)
-conn.execute("CREATE TABLE IF NOT EXISTS outbox(id INTEGER PRIMARY KEY, payload TEXT, ts INTEGER)")
-conn.commit()
+# init local DB (durable buffer); one summary per 5 min, so commit each row at once
+outbox = SqliteOutbox(DB, table="outbox", batch_rows=1)
 
 def sign(payload: bytes) -> str:
     return hmac.new(HMAC_KEY, payload, hashlib.sha256).hexdigest()
@@ -27,8 +26,13 @@ def collect_summary():
     }
 
 def enqueue(payload: dict):
-    conn.execute("INSERT INTO outbox(payload,ts) VALUES(?,?)", (json.dumps(payload), payload["ts"]))
-    conn.commit()
+    outbox.add(json.dumps(payload), ts=payload["ts"])
+
+def signed(p: str) -> str:
+    payload = json.loads(p)
+    payload_bytes = json.dumps(payload, separators=(",",":")).encode()
+    payload["sig"] = sign(payload_bytes)
+    return json.dumps(payload)
 
 def publish_loop():
     client = mqtt.Client()
@@ -37,21 +41,19 @@ def publish_loop():
     client.loop_start()
     backoff = 1
     while True:
-        rows = conn.execute("SELECT id,payload FROM outbox ORDER BY id LIMIT 20").fetchall()
+        rows = outbox.peek(20)
         if not rows:
             time.sleep(30); continue
-        for rid,p in rows:
-            payload = json.loads(p)
-            payload_bytes = json.dumps(payload, separators=(",",":")).encode()
-            payload["sig"] = sign(payload_bytes)
-            try:
-                client.publish(TOPIC, json.dumps(payload), qos=1)
-                conn.execute("DELETE FROM outbox WHERE id=?", (rid,))
-                conn.commit()
-                backoff = 1
-            except Exception:
-                time.sleep(backoff); backoff = min(300, backoff*2)
-                break
+        try:
+            high = publish_confirmed(client, TOPIC, rows, encode=signed)
+        except Exception:
+            high = 0
+        if high:
+            outbox.ack(high)  # one range delete for the PUBACKed prefix
+        if high == rows[-1][0]:
+            backoff = 1
+        else:
+            time.sleep(backoff); backoff = min(300, backoff*2)
     client.loop_stop()
 
 # Periodic collection loop (run under systemd or container)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Parallel seeded experiment runner: pinned CPU slots, docker or local-process
+backends, a columnar results store, bootstrap CIs and effect sizes.
+"""
+import hashlib, json, os, queue, shlex, subprocess, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+
+# ---------------------------------------------------------------- provenance
+def _read(path, limit=None):
+    try:
+        with open(path, errors="replace") as f:
+            return f.read() if limit is None else "".join(f.readline() for _ in range(limit))
+    except OSError:
+        return None
+
+def _try(cmd):
+    try:
+        return subprocess.check_output(cmd, stderr=subprocess.DEVNULL, timeout=10).decode().strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+@lru_cache(maxsize=None)
+def collect_provenance(images=()):
+    """Host and image provenance, gathered once per process (i.e. per run set)."""
+    u = os.uname()
+    dmesg = _try(["dmesg"])
+    m = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "uname": " ".join(u),
+        "cpuinfo": _read("/proc/cpuinfo", 50),
+        "cmdline": _read("/proc/cmdline"),
+        "affinity": sorted(os.sched_getaffinity(0)),
+        "dmesg": "\n".join(dmesg.splitlines()[-200:]) if dmesg else None,
+        "images": {img: _try(["docker", "inspect", "--format", "{{index .RepoDigests 0}}", img])
+                   for img in images},
+    }
+    m["key"] = hashlib.sha256(json.dumps(m, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return m
+
+# ------------------------------------------------------------------- backends
+class DockerBackend:
+    def __init__(self, image, args="./run_inference.sh {seed}"):
+        self.image, self.args = image, args
+
+    def command(self, run_dir, seed, cpus):
+        return (["docker", "run", "--rm", "--env", f"EXPERIMENT_SEED={seed}",
+                 f"--cpuset-cpus={','.join(map(str, cpus))}", "-v", f"{run_dir}:/work", "-w", "/work",
+                 self.image] + shlex.split(self.args.format(seed=seed)))
+
+class LocalBackend:
+    """Plain process pinned with taskset; argv may use {seed} and {run_dir}.
+
+    Pinning goes through argv rather than preexec_fn, which is unsafe to use
+    from the runner's thread pool.
+    """
+    def __init__(self, argv):
+        self.argv = shlex.split(argv) if isinstance(argv, str) else list(argv)
+
+    def command(self, run_dir, seed, cpus):
+        argv = [a.format(seed=seed, run_dir=run_dir) for a in self.argv]
+        return ["taskset", "-c", ",".join(map(str, cpus))] + argv
+
+def cpu_slots(cpus_per_run, cpus=None):
+    """Disjoint CPU sets of size cpus_per_run from the current affinity mask."""
+    cpus = sorted(cpus if cpus is not None else os.sched_getaffinity(0))
+    n = max(1, len(cpus) // cpus_per_run)
+    return [tuple(cpus[i * cpus_per_run:(i + 1) * cpus_per_run]) or tuple(cpus) for i in range(n)]
+
+# -------------------------------------------------------------- results store
+class ResultsStore:
+    """Append-only columnar store: one raw float64/int32 file per column.
+
+    Rows are (config, seed, run, metric, idx, value); strings are interned to
+    integer codes in schema.json. Appends are streamed per run and load() reads
+    each column back with np.fromfile.
+    """
+    COLUMNS = {"config": np.int32, "seed": np.int32, "run": np.int32,
+               "metric": np.int32, "idx": np.int32, "value": np.float64}
+
+    def __init__(self, path):
+        self.path = Path(path); self.path.mkdir(parents=True, exist_ok=True)
+        schema = self.path / "schema.json"
+        self.codes = json.loads(schema.read_text()) if schema.exists() else {"config": [], "metric": []}
+
+    def _code(self, kind, name):
+        names = self.codes[kind]
+        if name not in names:
+            names.append(name)
+            (self.path / "schema.json").write_text(json.dumps(self.codes))
+        return names.index(name)
+
+    def append(self, config, seed, run, metrics):
+        """metrics: {name: scalar or sequence of samples}."""
+        cols = {c: [] for c in self.COLUMNS}
+        for name, vals in metrics.items():
+            vals = np.atleast_1d(np.asarray(vals, dtype=np.float64))
+            k = len(vals)
+            cols["config"].append(np.full(k, self._code("config", config)))
+            cols["seed"].append(np.full(k, seed)); cols["run"].append(np.full(k, run))
+            cols["metric"].append(np.full(k, self._code("metric", name)))
+            cols["idx"].append(np.arange(k)); cols["value"].append(vals)
+        for c, dtype in self.COLUMNS.items():
+            if cols[c]:
+                with open(self.path / f"{c}.col", "ab") as f:
+                    f.write(np.concatenate(cols[c]).astype(dtype).tobytes())
+
+    def load(self):
+        return {c: np.fromfile(self.path / f"{c}.col", dtype=t) if (self.path / f"{c}.col").exists()
+                else np.empty(0, dtype=t) for c, t in self.COLUMNS.items()}
+
+    def per_run(self, config, metric, stat=np.mean):
+        """One summary value per run (the unit of replication) for config/metric."""
+        d = self.load()
+        if config not in self.codes["config"] or metric not in self.codes["metric"]:
+            return np.empty(0)
+        sel = (d["config"] == self.codes["config"].index(config)) & \
+              (d["metric"] == self.codes["metric"].index(metric))
+        runs, vals = d["run"][sel], d["value"][sel]
+        return np.array([stat(vals[runs == r]) for r in np.unique(runs)])
+
+# ----------------------------------------------------------------- statistics
+def bootstrap_ci(a, stat=np.mean, n_boot=10000, alpha=0.05, seed=0):
+    a = np.asarray(a, dtype=float)
+    idx = np.random.default_rng(seed).integers(0, len(a), (n_boot, len(a)))
+    boots = stat(a[idx], axis=1)
+    return float(np.quantile(boots, alpha / 2)), float(np.quantile(boots, 1 - alpha / 2))
+
+def cohens_d(a, b):
+    a, b = np.asarray(a, float), np.asarray(b, float)
+    na, nb = len(a), len(b)
+    pooled = np.sqrt(((na - 1) * a.var(ddof=1) + (nb - 1) * b.var(ddof=1)) / max(1, na + nb - 2))
+    return float((b.mean() - a.mean()) / pooled) if pooled > 0 else 0.0
+
+def cliffs_delta(a, b):
+    """P(b > a) - P(b < a); rank-based, robust to outliers and skew."""
+    a, b = np.sort(np.asarray(a, float)), np.asarray(b, float)
+    gt = np.searchsorted(a, b, side="left").sum()
+    lt = (len(a) - np.searchsorted(a, b, side="right")).sum()
+    return float((gt - lt) / (len(a) * len(b)))
+
+def compare(a, b, n_boot=10000, alpha=0.05, seed=0):
+    """Baseline a vs candidate b (per-run values): relative change with a bootstrap CI."""
+    a, b = np.asarray(a, float), np.asarray(b, float)
+    rng = np.random.default_rng(seed)
+    ma = a[rng.integers(0, len(a), (n_boot, len(a)))].mean(axis=1)
+    mb = b[rng.integers(0, len(b), (n_boot, len(b)))].mean(axis=1)
+    rel = mb / ma - 1.0
+    return {"n": [len(a), len(b)], "mean": [float(a.mean()), float(b.mean())],
+            "rel_change": float(b.mean() / a.mean() - 1.0),
+            "rel_ci": [float(np.quantile(rel, alpha / 2)), float(np.quantile(rel, 1 - alpha / 2))],
+            "cohens_d": cohens_d(a, b), "cliffs_delta": cliffs_delta(a, b)}
+
+def regressed(result, max_regression=0.05, higher_is_better=True):
+    """True when the CI shows a change worse than max_regression with confidence."""
+    lo, hi = result["rel_ci"]
+    return hi < -max_regression if higher_is_better else lo > max_regression
+
+# --------------------------------------------------------------------- runner
+def _load_metrics(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def run_set(configs, outdir, seeds, cpus_per_run=1, timeout=60, store=None):
+    """Run every config x seed in parallel, one pinned CPU slot per run.
+
+    configs: {name: backend}. Metrics from each run's metrics.json are streamed
+    into `store` as runs finish; by default that is a fresh store under
+    outdir/results/<run set id>, so repeated invocations never mix their rows.
+    Returns (store, provenance, failed runs).
+    """
+    outdir = Path(outdir); outdir.mkdir(parents=True, exist_ok=True)
+    images = tuple(sorted(b.image for b in configs.values() if isinstance(b, DockerBackend)))
+    prov = collect_provenance(images)
+    (outdir / "provenance.json").write_text(json.dumps(prov, indent=2))
+    set_id = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + f"-{os.getpid()}"
+    store = store or ResultsStore(outdir / "results" / set_id)
+    slots = queue.Queue()
+    for s in cpu_slots(cpus_per_run):
+        slots.put(s)
+    jobs = [(name, backend, seed, i) for i, seed in enumerate(seeds) for name, backend in configs.items()]
+    store_lock = threading.Lock()
+
+    def one(job):
+        name, backend, seed, rep = job
+        run_dir = outdir / name / f"run_{rep:03d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        # a run that fails before writing metrics must not inherit an earlier one's
+        (run_dir / "metrics.json").unlink(missing_ok=True)
+        cpus = slots.get()
+        try:
+            argv = backend.command(run_dir, seed, cpus)
+            env = dict(os.environ, EXPERIMENT_SEED=str(seed))
+            t0 = time.perf_counter()
+            with open(run_dir / "experiment.log", "wb") as out:
+                try:
+                    rc = subprocess.run(argv, stdout=out, stderr=subprocess.STDOUT, cwd=run_dir,
+                                        env=env, timeout=timeout).returncode
+                except subprocess.TimeoutExpired:
+                    out.write(b"\n# TIMEOUT\n"); rc = None
+                except OSError as e:   # taskset/docker missing, not executable, ...
+                    out.write(f"\n# LAUNCH FAILED: {e}\n".encode()); rc = None
+            wall = time.perf_counter() - t0
+        finally:
+            slots.put(cpus)
+        metrics = _load_metrics(run_dir / "metrics.json")
+        metrics["wall_s"] = wall
+        with store_lock:
+            store.append(name, seed, rep, {k: v for k, v in metrics.items()
+                                           if isinstance(v, (int, float, list))})
+        return name, seed, rc
+
+    with ThreadPoolExecutor(max_workers=slots.qsize()) as pool:
+        results = list(pool.map(one, jobs))
+    failed = [(n, s) for n, s, rc in results if rc != 0]
+    return store, prov, failed
\ No newline at end of file
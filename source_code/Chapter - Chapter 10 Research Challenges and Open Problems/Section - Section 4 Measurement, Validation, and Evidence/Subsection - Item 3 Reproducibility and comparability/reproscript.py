@@ -1,88 +1,64 @@
 #!/usr/bin/env python3
 """
-Collect system provenance, run a containerized experiment deterministically,
-and compute a simple reproducibility score between two runs.
+Collect system provenance once, run seeded repetitions of a baseline and a
+candidate configuration in parallel on pinned CPUs, and compare them with
+bootstrap confidence intervals and effect sizes. Exits non-zero on a
+confident regression so it can gate CI.
 """
-import json, subprocess, hashlib, time, os, sys, tempfile, shlex
-from pathlib import Path
-import statistics, math
+import argparse, json, math, statistics, sys
+from exprunner import DockerBackend, LocalBackend, run_set, compare, regressed
 
-OUTDIR = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("experiment_out")
-OUTDIR.mkdir(parents=True, exist_ok=True)
-
-def run_cmd(cmd):
-    return subprocess.check_output(shlex.split(cmd)).decode().strip()
-
-def sha256_of_file(path):
-    h = hashlib.sha256()
-    with open(path,'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            h.update(chunk)
-    return h.hexdigest()
-
-# Capture provenance
-manifest = {}
-manifest['timestamp'] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-manifest['uname'] = run_cmd("uname -a")
-manifest['cpuinfo'] = run_cmd("cat /proc/cpuinfo | head -n 50")
-manifest['dmesg'] = run_cmd("dmesg | tail -n 200")
-# container image digest (example)
 IMAGE = "myregistry.local/edge-pedcount:latest"
-manifest['image'] = IMAGE
-try:
-    manifest['image_digest'] = run_cmd(f"docker inspect --format='{{{{index .RepoDigests 0}}}}' {IMAGE}")
-except Exception:
-    manifest['image_digest'] = None
-
-# Save manifest
-manifest_path = OUTDIR / "provenance.json"
-with open(manifest_path, "w") as f:
-    json.dump(manifest, f, indent=2)
-
-# Deterministic container run wrapper (bind mounts, CPU pinning, fixed seed)
-def run_experiment(run_id, seed=42, timeout=60):
-    run_dir = OUTDIR / f"run_{run_id}"
-    run_dir.mkdir(exist_ok=True)
-    log = run_dir / "experiment.log"
-    env = f"EXPERIMENT_SEED={seed}"
-    cmd = (
-        f"docker run --rm --env {env} --cpuset-cpus=0 "
-        f"-v {run_dir}:/work -w /work {IMAGE} ./run_inference.sh {seed}"
-    )
-    with open(log, "wb") as out:
-        proc = subprocess.Popen(shlex.split(cmd), stdout=out, stderr=subprocess.STDOUT)
-        try:
-            proc.wait(timeout=timeout)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            out.write(b"\n# TIMEOUT\n")
-    # return path to output metrics (assumes container writes metrics.json)
-    return run_dir / "metrics.json"
-
-# Execute two runs
-m1 = run_experiment(1, seed=1234)
-m2 = run_experiment(2, seed=1234)
-
-def load_metrics(p):
-    if not p.exists():
-        return {}
-    return json.load(open(p))
-
-metrics1 = load_metrics(m1)
-metrics2 = load_metrics(m2)
 
 # Basic reproducibility scoring: compare primary metric distributions
-def reproducibility_score(a_vals, b_vals, beta=1.0):
+def reproducibility_score(a_vals, b_vals, manifest, beta=1.0):
     mu_sig = (statistics.mean(a_vals)+statistics.mean(b_vals))/2.0
     sigma_noise = statistics.pstdev(a_vals + b_vals)
-    # fake D_cfg: 0 if image_digest equal else 1
-    D_cfg = 0.0 if manifest.get('image_digest') else 1.0
+    # D_cfg: 0 if every image digest is known else 1
+    digests = manifest.get('images', {}).values()
+    D_cfg = 0.0 if digests and all(digests) else 1.0
     return math.exp(-beta*D_cfg) * (mu_sig/(mu_sig+sigma_noise+1e-9))
 
-# Example assumes metrics contain 'fps' samples
-a = metrics1.get('fps_samples', [])
-b = metrics2.get('fps_samples', [])
-score = reproducibility_score(a,b)
-with open(OUTDIR / "repro_score.json",'w') as f:
-    json.dump({'score': score, 'manifest': manifest}, f, indent=2)
-print("Reproducibility score:", score)
\ No newline at end of file
+def backend(spec, args):
+    # "local:<argv>" runs a plain process; anything else is a container image
+    if spec.startswith("local:"):
+        return LocalBackend(spec[len("local:"):])
+    return DockerBackend(spec, args.container_args)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("outdir", nargs="?", default="experiment_out")
+    ap.add_argument("--baseline", default=IMAGE, help="image, or local:<command>")
+    ap.add_argument("--candidate", default=IMAGE, help="image, or local:<command>")
+    ap.add_argument("--container-args", default="./run_inference.sh {seed}")
+    ap.add_argument("--reps", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=1234, help="first seed; runs use seed..seed+reps-1")
+    ap.add_argument("--cpus-per-run", type=int, default=1)
+    ap.add_argument("--timeout", type=float, default=60)
+    ap.add_argument("--metric", default="fps_samples")
+    ap.add_argument("--lower-is-better", action="store_true")
+    ap.add_argument("--max-regression", type=float, default=0.05)
+    args = ap.parse_args()
+
+    configs = {"baseline": backend(args.baseline, args), "candidate": backend(args.candidate, args)}
+    seeds = [args.seed + i for i in range(args.reps)]
+    store, manifest, failed = run_set(configs, args.outdir, seeds, args.cpus_per_run, args.timeout)
+    a = store.per_run("baseline", args.metric)
+    b = store.per_run("candidate", args.metric)
+    report = {"metric": args.metric, "failed_runs": failed, "provenance_key": manifest["key"],
+              "results": str(store.path)}
+    if len(a) < 2 or len(b) < 2:
+        report["error"] = "not enough runs produced the metric"
+        print(json.dumps(report, indent=2))
+        return 2
+    report["comparison"] = compare(a, b)
+    report["score"] = reproducibility_score(list(a), list(b), manifest)
+    report["regressed"] = regressed(report["comparison"], args.max_regression,
+                                    higher_is_better=not args.lower_is_better)
+    with open(f"{args.outdir}/repro_score.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 1 if report["regressed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
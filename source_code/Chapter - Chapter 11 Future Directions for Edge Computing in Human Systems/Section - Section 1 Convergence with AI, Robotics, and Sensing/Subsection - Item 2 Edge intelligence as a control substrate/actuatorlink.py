@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Preallocated UDP command link with ACK-based RTT measured off the control path.
+# Datagram: <seq u32><t_send f64><n u32> then n float32 commands. The actuator
+# acknowledges by echoing the first HEADER.size bytes.
+import socket, struct, threading, time
+import numpy as np
+
+HEADER = struct.Struct("<IdI")
+
+class ActuatorLink:
+    """send() packs into one reusable bytearray; a receiver thread turns ACKs into RTT."""
+    def __init__(self, addr, n_out, alpha=0.1, latency0=0.05, watchdog_timeout=1.0, sock=None):
+        self.addr, self.n_out = addr, n_out
+        self.alpha, self.latency_ema, self.watchdog_timeout = alpha, latency0, watchdog_timeout
+        self.buf = bytearray(HEADER.size + 4 * n_out)
+        self.cmd = np.frombuffer(self.buf, dtype=np.float32, offset=HEADER.size)  # view, no copy
+        self.sock = sock or socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.seq = 0
+        self.acks = 0
+        self.last_ack = time.monotonic()
+        self._ack_buf = bytearray(64)
+        self._running = True
+        self._rx = threading.Thread(target=self._receive, name="actuator-acks", daemon=True)
+        self._rx.start()
+
+    def send(self, out):
+        """Clip `out` into the packet buffer, stamp it and send; no allocation per call."""
+        np.clip(out.reshape(-1), -1.0, 1.0, out=self.cmd)
+        HEADER.pack_into(self.buf, 0, self.seq & 0xFFFFFFFF, time.monotonic(), self.n_out)
+        self.sock.sendto(self.buf, self.addr)
+        self.seq += 1
+
+    def _receive(self):
+        view = memoryview(self._ack_buf)
+        while self._running:
+            try:
+                n, _ = self.sock.recvfrom_into(view)
+            except OSError:
+                return
+            if n < HEADER.size:
+                continue
+            _seq, t_send, _ = HEADER.unpack_from(self._ack_buf)
+            now = time.monotonic()
+            self.latency_ema = self.alpha * (now - t_send) + (1 - self.alpha) * self.latency_ema
+            self.last_ack, self.acks = now, self.acks + 1
+
+    def latency(self):
+        """EWMA RTT, or the time since the last ACK if that is larger (link gone quiet)."""
+        silent = time.monotonic() - self.last_ack
+        return max(self.latency_ema, silent) if silent > self.watchdog_timeout else self.latency_ema
+
+    def close(self):
+        self._running = False
+        self.sock.close()
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Benchmark: old cb_sensor path (np.array + f-string header + blocking probe)
+# vs preallocated ActuatorLink with ACK-based RTT, against a loopback UDP
+# actuator stub. A small matmul stands in for the ONNX controller.
+import argparse, array, collections, multiprocessing as mp, socket, threading, time
+import numpy as np
+from actuatorlink import ActuatorLink, HEADER
+
+def actuator_stub(port, delay_s, ready):
+    # separate process; replies after delay_s of simulated link latency without
+    # serialising packets. Binary commands are ACKed by echoing the header, the
+    # old text commands are not ACKed and 'probe|' datagrams get a 'pong'.
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    s.bind(("127.0.0.1", port))
+    pending, cond = collections.deque(), threading.Condition()
+    def sender():
+        while True:
+            with cond:
+                cond.wait_for(lambda: pending)
+                due, reply, addr = pending.popleft()
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            s.sendto(reply, addr)
+    threading.Thread(target=sender, daemon=True).start()
+    ready.set()
+    buf = bytearray(2048)
+    while True:
+        n, addr = s.recvfrom_into(buf)
+        if buf[:6] == b"probe|":
+            reply = b"pong"
+        elif n >= HEADER.size and b"|" not in buf[:32]:
+            reply = bytes(buf[:HEADER.size])
+        else:
+            continue
+        with cond:
+            pending.append((time.monotonic() + delay_s, reply, addr))
+            cond.notify()
+
+class Legacy:
+    def __init__(self, addr, W):
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addr, self.W, self.seq, self.latency_ema = addr, W, 0, 0.05
+
+    def cb(self, data):
+        t0 = time.monotonic()
+        inp = np.array(data, dtype=np.float32).reshape(1, -1)
+        out = inp @ self.W
+        cmd = np.clip(out.astype(np.float32), -1.0, 1.0)
+        self.udp.sendto(f"{self.seq},{t0}".encode() + b"|" + cmd.tobytes(), self.addr)
+        self.seq += 1
+        try:
+            self.udp.settimeout(0.01)
+            t1 = time.monotonic()
+            self.udp.sendto(b"probe|ping", self.addr)
+            self.udp.recvfrom(256)
+            rtt = time.monotonic() - t1
+        except socket.timeout:
+            rtt = 1.0
+        finally:
+            self.udp.settimeout(None)
+        self.latency_ema = 0.1 * rtt + 0.9 * self.latency_ema
+
+class Preallocated:
+    def __init__(self, addr, W):
+        self.W = W
+        self.inp = np.zeros((1, W.shape[0]), dtype=np.float32)
+        self.out = np.zeros((1, W.shape[1]), dtype=np.float32)
+        self.link = ActuatorLink(addr, W.shape[1])
+
+    def cb(self, data):
+        self.inp[0] = data
+        np.matmul(self.inp, self.W, out=self.out)
+        self.link.send(self.out)
+
+def flat_out(cb, data, seconds):
+    n, t_end = 0, time.perf_counter() + seconds
+    while time.perf_counter() < t_end:
+        cb(data); n += 1
+    return n / seconds
+
+def paced(cb, data, hz, seconds):
+    # fixed-rate loop; jitter is the deviation of each callback start from its slot
+    period = 1.0 / hz
+    n = int(seconds * hz)
+    dev = np.empty(n)
+    t0 = time.perf_counter()
+    for i in range(n):
+        slot = t0 + i * period
+        while time.perf_counter() < slot:
+            pass
+        dev[i] = time.perf_counter() - slot
+        cb(data)
+    return dev * 1e6
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--inputs", type=int, default=64)
+    ap.add_argument("--outputs", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    ap.add_argument("--hz", type=float, default=500.0)
+    ap.add_argument("--ack-delay-ms", type=float, default=1.0, help="simulated link latency")
+    ap.add_argument("--port", type=int, default=19000)
+    args = ap.parse_args()
+    ready = mp.Event()
+    stub = mp.Process(target=actuator_stub, args=(args.port, args.ack_delay_ms / 1e3, ready), daemon=True)
+    stub.start(); ready.wait()
+    addr = ("127.0.0.1", args.port)
+    W = np.random.default_rng(0).normal(size=(args.inputs, args.outputs)).astype(np.float32) * 0.1
+    data = array.array("f", np.random.default_rng(1).normal(size=args.inputs))  # like rclpy
+    print(f"{'path':<14}{'max cb/s':>10}{'us/cb':>8}{'jitter p50 us':>15}{'p99 us':>9}{'rtt ema ms':>12}")
+    for name, ctl in (("legacy", Legacy(addr, W)), ("preallocated", Preallocated(addr, W))):
+        rate = flat_out(ctl.cb, data, args.seconds)
+        dev = paced(ctl.cb, data, args.hz, args.seconds)
+        time.sleep(0.05)
+        rtt = ctl.latency_ema if name == "legacy" else ctl.link.latency()
+        print(f"{name:<14}{rate:>10.0f}{1e6 / rate:>8.1f}{np.percentile(dev, 50):>15.1f}"
+              f"{np.percentile(dev, 99):>9.1f}{1e3 * rtt:>12.3f}")
+    stub.terminate()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
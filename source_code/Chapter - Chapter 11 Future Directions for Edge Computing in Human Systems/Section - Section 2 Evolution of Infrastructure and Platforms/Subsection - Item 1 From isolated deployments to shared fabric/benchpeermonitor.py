@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Benchmark: per-task session + serial RTT probes (old process_task) vs the
+# cached PeerMonitor with one pooled session, against local stub HTTP peers.
+# The decision mirrors offloadagent.choose_target with an idle local CPU, so the
+# bench needs only peermonitor (offloadagent also pulls in Chapter 10's sampler).
+import argparse, asyncio, math, multiprocessing as mp, time
+import aiohttp
+from aiohttp import web
+from peermonitor import PeerMonitor
+
+ALPHA, BETA, RTT_SIGMA = 1.0, 0.1, 1.0     # offloadagent's weights
+LOCAL_COST = ALPHA * (1.0 / 20.0) + BETA * 0.5
+PEERS = []                                 # (url, mu, energy); stub peers, set in main()
+
+def stub_peers(ports, delay_s, ready):
+    async def probe(request):
+        return web.Response(text="ok")
+    async def process(request):
+        await request.read()
+        await asyncio.sleep(delay_s)
+        return web.json_response({"processed_by": request.host})
+    async def main():
+        app = web.Application()
+        app.router.add_get("/process", probe)
+        app.router.add_post("/process", process)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        for p in ports:
+            await web.TCPSite(runner, "127.0.0.1", p).start()
+        ready.set()
+        await asyncio.Event().wait()
+    asyncio.run(main())
+
+async def legacy_task(payload):
+    # today's path: new session per task, every peer probed in turn
+    async with aiohttp.ClientSession() as session:
+        best = ("local", float("inf"))
+        for url, mu, e in PEERS:
+            t0 = time.time()
+            try:
+                async with session.get(url, timeout=1) as resp:
+                    await resp.read()
+                r = time.time() - t0
+            except Exception:
+                r = 2.0
+            cost = ALPHA * (r + 1.0 / max(1e-3, mu * 0.8)) + BETA * e
+            if cost < best[1]:
+                best = (url, cost)
+        async with session.post(best[0], data=payload, timeout=5) as resp:
+            return await resp.json()
+
+def choose_target(monitor):
+    best = ("local", LOCAL_COST)
+    for url, mu, e in PEERS:
+        r = monitor.rtt(url) + RTT_SIGMA * math.sqrt(monitor.stats(url)["var"])
+        cost = ALPHA * (r + 1.0 / max(1e-3, mu * 0.8)) + BETA * e
+        if cost < best[1]:
+            best = (url, cost)
+    return best[0]
+
+async def monitor_task(payload, monitor):
+    async with monitor.session.post(choose_target(monitor), data=payload, timeout=5) as resp:
+        return await resp.json()
+
+async def drive(fn, n, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    async def one():
+        async with sem:
+            await fn(b"image bytes")
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return n / (time.perf_counter() - t0)
+
+async def run(n, concurrency):
+    rows = [("legacy", 1, await drive(legacy_task, n, 1), None)]
+    monitor = await PeerMonitor([u for u, _, _ in PEERS], interval_s=0.5).start()
+    k = 20000
+    t0 = time.perf_counter()
+    for _ in range(k):
+        choose_target(monitor)
+    decide_us = 1e6 * (time.perf_counter() - t0) / k
+    task = lambda p: monitor_task(p, monitor)
+    rows.append(("monitor", 1, await drive(task, n, 1), decide_us))
+    rows.append(("monitor", concurrency, await drive(task, n, concurrency), decide_us))
+    await monitor.stop()
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, default=500)
+    ap.add_argument("--peers", type=int, default=4)
+    ap.add_argument("--delay-ms", type=float, default=2.0)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--port", type=int, default=18080)
+    args = ap.parse_args()
+    ports = [args.port + i for i in range(args.peers)]
+    ready = mp.Event()
+    proc = mp.Process(target=stub_peers, args=(ports, args.delay_ms / 1e3, ready), daemon=True)
+    proc.start(); ready.wait()
+    # fast stub peers so that offloading always beats local processing
+    global PEERS
+    PEERS = [(f"http://127.0.0.1:{p}/process", 500.0, 0.1) for p in ports]
+    rows = asyncio.run(run(args.tasks, args.concurrency))
+    proc.terminate()
+    print(f"{'scheme':<10}{'concurrency':>12}{'tasks/s':>10}{'decide us':>11}")
+    for name, c, tps, dus in rows:
+        print(f"{name:<10}{c:>12}{tps:>10.0f}{'-' if dus is None else f'{dus:.1f}':>11}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
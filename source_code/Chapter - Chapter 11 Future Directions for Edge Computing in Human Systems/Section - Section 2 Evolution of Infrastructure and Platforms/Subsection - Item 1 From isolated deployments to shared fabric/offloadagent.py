@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 # offload_agent.py - runtime policy deciding local vs remote processing.
 import asyncio
-import aiohttp
-import psutil
-import time
+import math
 from typing import List, Tuple
+from loadsampler import get_sampler  # Chapter 10 load sampler, deployed alongside
+from peermonitor import PeerMonitor
 
 # Configure peers and weights (real deployments use service discovery)
 PEERS: List[Tuple[str, float, float]] = [
@@ -17,29 +17,24 @@ LOCAL_E = 0.5     # local energy per task (J)
 
 ALPHA = 1.0  # latency weight
 BETA = 0.1   # energy weight
-
-async def rtt(session: aiohttp.ClientSession, url: str) -> float:
-    start = time.time()
-    try:
-        async with session.get(url, timeout=1) as resp:
-            await resp.read()
-    except Exception:
-        return 2.0  # large RTT if unreachable
-    return time.time() - start
+RTT_SIGMA = 1.0  # plan on mean + k*std of the probed RTT
+PROBE_INTERVAL = 0.5  # seconds between background probe rounds
 
 def cpu_load_cost() -> float:
     # Model: effective service rate linearly degrades with CPU load
-    load = psutil.cpu_percent(interval=None) / 100.0
+    load, _ = get_sampler().mean(0.5)
     mu_eff = max(1.0, LOCAL_MU * (1.0 - load))
     # estimated processing latency
     latency = 1.0 / mu_eff
     return latency, LOCAL_E
 
-async def choose_target(session: aiohttp.ClientSession) -> str:
+def choose_target(monitor: PeerMonitor) -> str:
+    # served from the monitor's cache: no network I/O on the decision path
     local_latency, local_energy = cpu_load_cost()
     best = ("local", ALPHA*local_latency + BETA*local_energy, None)
     for url, mu, e in PEERS:
-        r = await rtt(session, url)
+        p = monitor.stats(url)
+        r = monitor.rtt(url) + RTT_SIGMA * math.sqrt(p["var"])
         # use a conservative queueing approximation
         latency = r + 1.0 / max(1e-3, mu*0.8)  # reserve headroom
         cost = ALPHA*latency + BETA*e
@@ -47,23 +42,24 @@ async def choose_target(session: aiohttp.ClientSession) -> str:
             best = (url, cost, latency)
     return best[0]
 
-async def process_task(task_payload: bytes):
-    async with aiohttp.ClientSession() as session:
-        target = await choose_target(session)
-        if target == "local":
-            # local synchronous processing (placeholder)
-            await asyncio.sleep(0.01)  # simulate work
-            return {"processed_by": "local"}
-        else:
-            async with session.post(target, data=task_payload, timeout=5) as resp:
-                return await resp.json()
+async def process_task(task_payload: bytes, monitor: PeerMonitor):
+    target = choose_target(monitor)
+    if target == "local":
+        # local synchronous processing (placeholder)
+        await asyncio.sleep(0.01)  # simulate work
+        return {"processed_by": "local"}
+    # task POSTs reuse the monitor's pooled keep-alive connections
+    async with monitor.session.post(target, data=task_payload, timeout=5) as resp:
+        return await resp.json()
 
 # Example event loop hook
 async def main_loop():
+    monitor = await PeerMonitor([url for url, _, _ in PEERS],
+                                interval_s=PROBE_INTERVAL).start()
     while True:
         # fetch task from local queue or sensor (placeholder)
         task = b"image bytes"
-        result = await process_task(task)
+        result = await process_task(task, monitor)
         # emit result to bus or actuator
         await asyncio.sleep(0.005)
 
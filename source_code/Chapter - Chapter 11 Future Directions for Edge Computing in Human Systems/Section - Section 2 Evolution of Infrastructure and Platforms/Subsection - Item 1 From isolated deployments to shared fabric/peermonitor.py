@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Background peer-health monitor: concurrent RTT probes on a schedule, EWMA
+# mean/variance per peer, one pooled aiohttp session shared with task traffic.
+import asyncio, threading, time
+import aiohttp
+
+class PeerMonitor:
+    """Probes every peer concurrently each `interval_s` and caches the results.
+
+    rtt()/stats() are plain dict reads, safe from any thread. A failed probe
+    is recorded as `fail_rtt` seconds and counts towards the loss EWMA, so an
+    unreachable peer degrades smoothly instead of flapping. `on_round`, if
+    given, is called after every probe round (on the monitor's loop).
+    """
+    def __init__(self, urls, interval_s=0.5, timeout_s=1.0, alpha=0.2, fail_rtt=2.0,
+                 method="GET", session=None, pool_size=32, on_round=None):
+        self.urls = list(urls)
+        self.interval_s, self.timeout_s, self.alpha = interval_s, timeout_s, alpha
+        self.fail_rtt, self.method, self.pool_size = fail_rtt, method, pool_size
+        self.session = session
+        self.on_round = on_round
+        self._own_session = session is None
+        self.peers = {u: {"rtt": None, "var": 0.0, "loss": 0.0, "up": False, "ts": 0.0}
+                      for u in self.urls}
+        self.rounds = 0
+        self._task = None
+        self._stop = None
+
+    async def start(self):
+        """Start probing on the running loop; the first round completes before returning."""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_s))
+        self._stop = asyncio.Event()
+        await self.probe_all()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        self._stop.set()
+        if self._task:
+            await self._task
+        if self._own_session:
+            await self.session.close()
+
+    def start_thread(self):
+        """Run the monitor on its own event loop for synchronous callers."""
+        ready = threading.Event()
+        def main():
+            async def run():
+                await self.start()
+                ready.set()
+                await self._task
+            asyncio.run(run())
+        threading.Thread(target=main, name="peer-monitor", daemon=True).start()
+        ready.wait(self.timeout_s * 2 + 1.0)
+        return self
+
+    async def _run(self):
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval_s)
+            except asyncio.TimeoutError:
+                await self.probe_all()
+
+    async def _probe(self, url):
+        t0 = time.perf_counter()
+        try:
+            async with self.session.request(self.method, url,
+                                            timeout=aiohttp.ClientTimeout(total=self.timeout_s)) as resp:
+                await resp.read()
+                resp.raise_for_status()
+        except Exception:
+            return url, None
+        return url, time.perf_counter() - t0
+
+    async def probe_all(self):
+        for url, rtt in await asyncio.gather(*(self._probe(u) for u in self.urls)):
+            self._update(url, rtt)
+        self.rounds += 1
+        if self.on_round:
+            self.on_round()
+
+    def _update(self, url, rtt):
+        p, a = self.peers[url], self.alpha
+        ok = rtt is not None
+        x = rtt if ok else self.fail_rtt
+        if p["rtt"] is None:
+            mean, var = x, 0.0
+        else:
+            d = x - p["rtt"]
+            mean = p["rtt"] + a * d
+            var = (1 - a) * (p["var"] + a * d * d)
+        # swap in a fresh dict so readers on other threads never see a half update
+        self.peers[url] = {"rtt": mean, "var": var, "loss": (1 - a) * p["loss"] + a * (not ok),
+                           "up": ok, "ts": time.time()}
+
+    def rtt(self, url):
+        """EWMA RTT in seconds; `fail_rtt` until the peer has been seen."""
+        r = self.peers[url]["rtt"]
+        return self.fail_rtt if r is None else r
+
+    def stats(self, url):
+        return self.peers[url]
\ No newline at end of file
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 # Minimal production-ready trust monitor for edge controllers.
 import json, time, hmac, hashlib, logging
-import paho.mqtt.client as mqtt
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
+from failurerate import WindowedRate  # Chapter 1 failure counters, deployed alongside
 
 # Configuration (use env vars or secure config store in production)
 BROKER = "mqtt.city-broker.local"
@@ -12,6 +13,8 @@ HMAC_KEY = b"replace_with_secure_key"
 
 logging.basicConfig(level=logging.INFO)
 trust = 1.0  # initial trust
+# trust-eroding incidents per second over 1 min / 10 min / 1 h
+incidents = WindowedRate((60, 600, 3600), bucket_s=5)
 
 def sign_payload(payload: bytes) -> str:
     return hmac.new(HMAC_KEY, payload, hashlib.sha256).hexdigest()
@@ -27,19 +30,22 @@ def apply_event(event: dict):
     tau = time.time() - event.get('timestamp', time.time())
     # remediation factor decays with detection latency
     rem_factor = max(0.0, 1.0 - 0.1 * min(tau, 100))
-    trust = max(0.0, trust - delta * (1.0 - rem_factor))
+    loss = delta * (1.0 - rem_factor)
+    trust = max(0.0, trust - loss)
+    incidents.record(loss <= 0.0)
     logging.info("Applied event: delta=%.3f tau=%.1fs trust=%.3f", delta, tau, trust)
 
-def publish_trust(client: mqtt.Client):
-    payload = json.dumps({"trust": trust, "ts": time.time()}).encode()
+def publish_trust(pub: EdgePublisher):
+    payload = json.dumps({"trust": trust, "ts": time.time(),
+                          "incident_rate": {f"{w}s": incidents.rate(w) for w in incidents.windows},
+                          # sample counts, so consumers can ignore rates backed by a few events
+                          "incident_events": {f"{w}s": incidents.events(w) for w in incidents.windows}}).encode()
     sig = sign_payload(payload)
-    client.publish("city/edge/trust", payload + b"\n" + sig.encode(), qos=1)
+    pub.publish_state("city/edge/trust", payload + b"\n" + sig.encode(), qos=1)
 
 def main():
-    client = mqtt.Client(CLIENT_ID)
-    client.tls_set(ca_certs=TLS_CONFIG[0])
-    client.connect(BROKER, PORT)
-    client.loop_start()
+    pub = EdgePublisher.connect(BROKER, PORT, client_id=CLIENT_ID,
+                                tls={"ca_certs": TLS_CONFIG[0]})
     # Replace with real event stream (local queue, webhook, or kafka)
     sample_events = [
         {'visibility':0.8,'severity':0.9,'timestamp':time.time()-5},
@@ -47,10 +53,9 @@ def main():
     ]
     for ev in sample_events:
         apply_event(ev)
-        publish_trust(client)
+        publish_trust(pub)
         time.sleep(1)
-    client.loop_stop()
-    client.disconnect()
+    pub.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -12,6 +12,7 @@ import ssl
 import random
 import time
 from paho.mqtt import client as mqtt
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
 
 # Configuration (move to secure config store in production)
 BROKER = "mqtt.example.city"
@@ -33,18 +34,20 @@ async def simulate_and_publish(num_sensors: int, publish_rate_hz: float):
     client = mqtt.Client(client_id=CLIENT_ID, clean_session=True)
     client.tls_set(TLS_CERT, certfile=None, keyfile=None, tls_version=ssl.PROTOCOL_TLS_CLIENT)
     client.tls_insecure_set(False)
-    client.max_inflight_messages_set(20)
+    client.reconnect_delay_set(min_delay=1, max_delay=30)
     # synchronous loop running in executor to maintain reliability
     loop = asyncio.get_running_loop()
     backoff = 1.0
     while True:
         try:
             client.connect(BROKER, PORT, keepalive=60)
-            client.loop_start()
             break
         except Exception:
             await asyncio.sleep(backoff)
             backoff = min(30.0, backoff * 2.0)
+    # Actuations are events, not state: never coalesced; when the queue is full
+    # the oldest (already past its deadline) is dropped first.
+    pub = EdgePublisher(client, max_queue=256, inflight=20, policy="drop_oldest").start()
     # Simulate sensors reporting and local edge decision
     interval = 1.0 / publish_rate_hz
     while True:
@@ -61,13 +64,12 @@ async def simulate_and_publish(num_sensors: int, publish_rate_hz: float):
                 "deadline_ms": L_MAX_MS
             }
             # Publish with QoS 1 for at-least-once delivery
-            client.publish(TOPIC, payload=json.dumps(msg), qos=1)
+            pub.publish(TOPIC, json.dumps(msg), qos=1)
         # Rate limiting and deadline awareness
         elapsed = time.monotonic() - start
         await asyncio.sleep(max(0.0, interval - elapsed))
     # Cleanup (never reached in many edge loops)
-    client.loop_stop()
-    client.disconnect()
+    pub.stop()
 
 if __name__ == "__main__":
     # Example: coverage of 95% with sensors reaching 30 m
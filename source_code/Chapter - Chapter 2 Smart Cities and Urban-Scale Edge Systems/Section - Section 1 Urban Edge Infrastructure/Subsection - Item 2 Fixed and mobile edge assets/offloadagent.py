@@ -1,24 +1,24 @@
 #!/usr/bin/env python3
-# Minimal production-ready offload agent. Requires psutil, paho-mqtt, requests.
-import time, json, psutil, requests
-import paho.mqtt.client as mqtt
+# Minimal production-ready offload agent. Requires psutil, paho-mqtt, aiohttp.
+import time, json, psutil
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
+from peermonitor import PeerMonitor  # Chapter 11 peer monitor, deployed alongside
 
 MQTT_BROKER = "mqtt.city.example"
 REPORT_TOPIC = "edge/metrics"
 DECISION_TOPIC = "edge/decision"
 CHECK_INTERVAL = 2.0  # seconds
+MEC_ENDPOINTS = ["http://mec1.local/ping", "http://mec2.local/ping"]
+
+# probes run concurrently in the background; unreachable endpoints read as 1.0 s
+mec = PeerMonitor(MEC_ENDPOINTS, interval_s=CHECK_INTERVAL / 2, timeout_s=0.5, fail_rtt=1.0)
 
 def collect_metrics():
     # CPU, memory, battery (if available), and simple network quality probe
     cpu = psutil.cpu_percent(interval=None)
     mem = psutil.virtual_memory().percent
-    try:
-        # simple HTTP RTT probe to local MEC endpoint list
-        endpoints = ["http://mec1.local/ping", "http://mec2.local/ping"]
-        rtts = [requests.get(ep, timeout=0.5).elapsed.total_seconds() for ep in endpoints]
-        best_rtt = min(rtts)
-    except Exception:
-        best_rtt = 1.0  # conservative fallback
+    # smoothed RTT to the MEC endpoints, read from the monitor's cache
+    best_rtt = min(mec.rtt(ep) for ep in MEC_ENDPOINTS)
     metrics = {"cpu": cpu, "mem": mem, "rtt": best_rtt, "ts": time.time()}
     return metrics
 
@@ -31,14 +31,14 @@ def decide(metrics, policy):
     return {"target": "local", "reason": "default"}
 
 def main():
-    client = mqtt.Client()
-    client.connect(MQTT_BROKER)
+    pub = EdgePublisher.connect(MQTT_BROKER)
+    mec.start_thread()
     policy = {"rtt_thresh": 0.050, "cpu_thresh": 70.0, "cpu_offload_cpu": 85.0}
     while True:
         m = collect_metrics()
-        client.publish(REPORT_TOPIC, json.dumps(m))
+        pub.publish_state(REPORT_TOPIC, json.dumps(m), qos=0)
         decision = decide(m, policy)
-        client.publish(DECISION_TOPIC, json.dumps({"decision": decision, "metrics": m}))
+        pub.publish_state(DECISION_TOPIC, json.dumps({"decision": decision, "metrics": m}), qos=0)
         time.sleep(CHECK_INTERVAL)
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Old gateway behaviour (connect/read 0..10/close per unit every 200 ms, publish
+# every poll) vs ModbusSession + PollScheduler + ChangeFilter, against simulated
+# RTU slaves; plus the SQLite outbox with per-iteration connections vs one.
+import argparse, asyncio, json, os, sqlite3, tempfile, time
+from modbussession import RegisterSpec, PollScheduler, ModbusSession, ChangeFilter, Outbox, plan_blocks
+from simslave import SimBus, SimulatedSerialClient
+
+# same map as modbusmqttgateway.REGISTER_MAP (that module needs pymodbus)
+REGISTER_MAP = [
+    RegisterSpec("signal_phase", 0, period_s=0.2),
+    RegisterSpec("phase_elapsed", 1, period_s=0.2),
+    RegisterSpec("detector_occupancy", 2, count=4, period_s=0.2),
+    RegisterSpec("vehicle_count", 6, count=2, period_s=1.0),
+    RegisterSpec("fault_code", 8, period_s=1.0),
+    RegisterSpec("cabinet_temp", 9, period_s=5.0, deadband=1),
+]
+
+def run_old(args, units):
+    bus = SimBus(args.baud, args.turnaround_ms / 1e3)
+    host = {"connect": 0.0}
+    polls = msgs = 0
+    t0 = time.monotonic(); end = t0 + args.seconds
+    while time.monotonic() < end:
+        for u in units:
+            client = SimulatedSerialClient(bus, units=units, connect_s=args.connect_ms / 1e3)
+            client.connect()
+            rr = client.read_holding_registers(0, 10, unit=u)
+            client.close()
+            host["connect"] += client.connect_time_s
+            json.dumps({"ts": time.time(), "regs": rr.registers})
+            polls += 1; msgs += 1
+        time.sleep(0.2)  # poll period, slept after the work as before
+    wall = time.monotonic() - t0
+    return bus, wall, host["connect"], polls / len(units) / wall, msgs
+
+def run_new(args, units):
+    bus = SimBus(args.baud, args.turnaround_ms / 1e3)
+    clients = []
+    def factory():
+        c = SimulatedSerialClient(bus, units=units, connect_s=args.connect_ms / 1e3)
+        clients.append(c); return c
+    session = ModbusSession(factory)
+    specs = [s._replace(name=f"u{u}.{s.name}", unit=u) for u in units for s in REGISTER_MAP]
+    sched, changes = PollScheduler(specs), ChangeFilter(specs)
+    fast = specs[0].name
+    fast_reads = msgs = 0
+    t0 = time.monotonic(); end = t0 + args.seconds
+    while time.monotonic() < end:
+        due = sched.due()
+        if due:
+            values = session.read(due)
+            fast_reads += fast in values
+            changed = changes.update(values)
+            if changed:
+                json.dumps({"ts": time.time(), "regs": changed}); msgs += 1
+        time.sleep(max(0.0, sched.next_due() - time.monotonic()))
+    wall = time.monotonic() - t0
+    connect = sum(c.connect_time_s for c in clients)
+    return bus, wall, connect, fast_reads / wall, msgs
+
+def bench_bus(args):
+    print(f"{'units':>5} {'gateway':>8} {'fast reads/s':>13} {'regs/s':>8} {'req/s':>7} "
+          f"{'bus util':>9} {'connect %':>10} {'msgs/s':>7}")
+    for n in args.units:
+        units = tuple(range(1, n + 1))
+        for name, fn in (("old", run_old), ("new", run_new)):
+            bus, wall, connect, fast, msgs = fn(args, units)
+            print(f"{n:>5} {name:>8} {fast:>13.2f} {bus.registers / wall:>8.1f} "
+                  f"{bus.requests / wall:>7.1f} {bus.utilisation(wall):>8.1%} "
+                  f"{connect / wall:>9.1%} {msgs / wall:>7.1f}")
+    blocks = plan_blocks(REGISTER_MAP)
+    print("blocks when every register is due: " +
+          ", ".join(f"{b.start}+{b.count}" for b in blocks))
+
+def old_outbox(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS outbox(id INTEGER PRIMARY KEY, topic TEXT, payload TEXT)")
+    conn.commit(); conn.close()
+    for i in range(rows):
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO outbox(topic,payload) VALUES(?,?)", ("t", f'{{"i":{i}}}'))
+        conn.commit(); conn.close()
+    while True:
+        conn = sqlite3.connect(path)
+        got = conn.execute("SELECT id,topic,payload FROM outbox ORDER BY id LIMIT 20").fetchall()
+        for rid, topic, payload in got:
+            conn.execute("DELETE FROM outbox WHERE id=?", (rid,)); conn.commit()
+        conn.close()
+        if not got: break
+
+def new_outbox(path, rows):
+    ob = Outbox(path)
+    for i in range(rows):
+        ob.put("t", f'{{"i":{i}}}')
+    while True:
+        got = ob.peek(20)
+        if not got: break
+        ob.ack_through(got[-1][0])
+    ob.close()
+
+def bench_outbox(rows):
+    print(f"\n{'outbox':>8} {'us/row (put+publish)':>21}")
+    with tempfile.TemporaryDirectory() as d:
+        for name, fn in (("old", old_outbox), ("new", new_outbox)):
+            t = time.perf_counter()
+            fn(os.path.join(d, f"{name}.db"), rows)
+            print(f"{name:>8} {(time.perf_counter() - t) / rows * 1e6:>21.1f}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--units", type=int, nargs="+", default=[1, 4])
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--baud", type=int, default=19200)
+    ap.add_argument("--turnaround-ms", type=float, default=5.0)
+    ap.add_argument("--connect-ms", type=float, default=25.0, help="tty open + configure")
+    ap.add_argument("--rows", type=int, default=2000)
+    args = ap.parse_args()
+    bench_bus(args)
+    bench_outbox(args.rows)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 import asyncio
-import sqlite3
 import json
+import time
 from concurrent.futures import ThreadPoolExecutor
 from pymodbus.client.sync import ModbusSerialClient  # sync client used inside executor
 from asyncio_mqtt import Client as MQTTClient
+from modbussession import RegisterSpec, PollScheduler, ModbusSession, ChangeFilter, Outbox
 
 DB_PATH = "gateway_store.db"
 MODBUS_PORT = "/dev/ttyUSB0"
@@ -12,67 +13,82 @@ MODBUS_BAUD = 19200
 MQTT_BROKER = "broker.example.com"
 MQTT_PORT = 8883
 MQTT_TOPIC = "city/traffic/corridor1"
+PUBLISH_BATCH = 20
 
-# small threadpool for blocking pymodbus calls
-executor = ThreadPoolExecutor(max_workers=2)
+# corridor controller register map; adjacent ranges are merged into block reads
+REGISTER_MAP = [
+    RegisterSpec("signal_phase", 0, period_s=0.2),
+    RegisterSpec("phase_elapsed", 1, period_s=0.2),
+    RegisterSpec("detector_occupancy", 2, count=4, period_s=0.2),
+    RegisterSpec("vehicle_count", 6, count=2, period_s=1.0),
+    RegisterSpec("fault_code", 8, period_s=1.0),
+    RegisterSpec("cabinet_temp", 9, period_s=5.0, deadband=1),
+]
 
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("CREATE TABLE IF NOT EXISTS outbox(id INTEGER PRIMARY KEY, topic TEXT, payload TEXT)")
-    conn.commit()
-    conn.close()
+# the RTU bus is half-duplex: one worker, one request in flight
+executor = ThreadPoolExecutor(max_workers=1)
 
-def modbus_read(address, count):
-    # Blocking Modbus RTU read; safe to call from thread executor
-    client = ModbusSerialClient(method='rtu', port=MODBUS_PORT, baudrate=MODBUS_BAUD, timeout=1)
-    if not client.connect():
-        raise ConnectionError("Modbus serial connect failed")
-    rr = client.read_holding_registers(address, count, unit=1)
-    client.close()
-    if rr.isError():
-        raise IOError("Modbus read error")
-    return rr.registers
+def make_client():
+    return ModbusSerialClient(method='rtu', port=MODBUS_PORT, baudrate=MODBUS_BAUD, timeout=1)
 
-async def poll_and_queue():
+async def poll_and_queue(session, outbox, register_map=REGISTER_MAP, topic=MQTT_TOPIC):
+    loop = asyncio.get_running_loop()
+    sched = PollScheduler(register_map, loop.time())
+    changes = ChangeFilter(register_map)
     while True:
-        try:
-            registers = await asyncio.get_event_loop().run_in_executor(executor, modbus_read, 0, 10)
-            payload = json.dumps({"ts": asyncio.get_event_loop().time(), "regs": registers})
-            conn = sqlite3.connect(DB_PATH)
-            conn.execute("INSERT INTO outbox(topic,payload) VALUES(?,?)", (MQTT_TOPIC, payload))
-            conn.commit(); conn.close()
-        except Exception as e:
-            # transient errors logged; backoff before retry
-            await asyncio.sleep(2)
-        await asyncio.sleep(0.2)  # poll period to meet latency budget
+        due = sched.due(loop.time())
+        if due:
+            try:
+                values = await loop.run_in_executor(executor, session.read, due)
+            except Exception as e:
+                # transient errors logged; the session reconnects with backoff
+                await asyncio.sleep(2)
+                continue
+            changed = changes.update(values, loop.time())
+            if changed:
+                outbox.put(topic, json.dumps({"ts": time.time(), "regs": changed}))
+        await asyncio.sleep(max(0.0, sched.next_due() - loop.time()))
 
-async def publish_outbox(mqtt_client):
+async def publish_outbox(mqtt_client, outbox):
     while True:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.execute("SELECT id,topic,payload FROM outbox ORDER BY id LIMIT 20")
-        rows = cur.fetchall()
-        for rid, topic, payload in rows:
-            try:
-                await mqtt_client.publish(topic, payload.encode(), qos=1)
-                conn.execute("DELETE FROM outbox WHERE id=?", (rid,))
-                conn.commit()
-            except Exception:
-                # leave row for retry; break to allow reconnect/backoff
-                break
-        conn.close()
-        await asyncio.sleep(1)
+        outbox.ready.clear()
+        rows = outbox.peek(PUBLISH_BATCH)
+        if rows:
+            results = await asyncio.gather(
+                *(mqtt_client.publish(topic, payload.encode(), qos=1) for _, topic, payload in rows),
+                return_exceptions=True)
+            # acknowledge the delivered prefix in one delete; the rest is retried
+            sent = next((i for i, r in enumerate(results) if isinstance(r, Exception)), len(rows))
+            if sent:
+                outbox.ack_through(rows[sent - 1][0])
+            if sent < len(rows):
+                raise results[sent]    # let main() reconnect with backoff
+            if len(rows) == PUBLISH_BATCH:
+                continue
+        try:
+            await asyncio.wait_for(outbox.ready.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
 
 async def main():
-    init_db()
+    outbox = Outbox(DB_PATH)
+    session = ModbusSession(make_client)
+    # polling keeps filling the outbox while the broker is unreachable
+    poller = asyncio.create_task(poll_and_queue(session, outbox))
     backoff = 1
-    while True:
-        try:
-            async with MQTTClient(MQTT_BROKER, port=MQTT_PORT, tls=True) as mq:
-                backoff = 1
-                await asyncio.gather(poll_and_queue(), publish_outbox(mq))
-        except Exception:
-            await asyncio.sleep(backoff)
-            backoff = min(backoff * 2, 60)
+    try:
+        while True:
+            try:
+                async with MQTTClient(MQTT_BROKER, port=MQTT_PORT, tls=True) as mq:
+                    backoff = 1
+                    await publish_outbox(mq, outbox)
+            except Exception:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+    finally:
+        poller.cancel()
+        session.close()
+        outbox.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
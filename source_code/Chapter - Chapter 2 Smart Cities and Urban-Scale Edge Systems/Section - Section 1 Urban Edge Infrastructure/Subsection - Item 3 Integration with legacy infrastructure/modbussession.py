@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# Building blocks for modbusmqttgateway: register map -> merged block reads,
+# per-register poll rates, one long-lived RTU session, change-only filtering and
+# a single-connection SQLite outbox.
+import asyncio, heapq, sqlite3, threading, time
+from collections import namedtuple
+
+# count > 1 reads a multi-register value (returned as a list); deadband applies to
+# single-register values, 0 means any change is published
+RegisterSpec = namedtuple("RegisterSpec", "name address count period_s unit deadband",
+                          defaults=(1, 1.0, 1, 0))
+
+Block = namedtuple("Block", "unit start count specs")
+
+MAX_READ = 125   # holding registers per function-3 request
+
+def plan_blocks(specs, max_gap=8, max_len=MAX_READ):
+    """Fewest block reads covering `specs`.
+
+    Ranges on the same unit are merged when the hole between them is at most
+    `max_gap` registers: two bytes per skipped register on the wire is cheaper
+    than another request/response pair with its silent intervals and turnaround.
+    """
+    blocks = []
+    for spec in sorted(specs, key=lambda s: (s.unit, s.address)):
+        end = spec.address + spec.count
+        if blocks:
+            b = blocks[-1]
+            b_end = b.start + b.count
+            if (b.unit == spec.unit and spec.address - b_end <= max_gap
+                    and max(end, b_end) - b.start <= max_len):
+                blocks[-1] = Block(b.unit, b.start, max(end, b_end) - b.start, b.specs + [spec])
+                continue
+        blocks.append(Block(spec.unit, spec.address, spec.count, [spec]))
+    return blocks
+
+class PollScheduler:
+    """Per-register deadlines in a heap; due() hands back everything that is due
+    and re-arms it on its own period without accumulating drift."""
+    def __init__(self, specs, now=None):
+        now = time.monotonic() if now is None else now
+        self._heap = [(now, i, s) for i, s in enumerate(specs)]
+        heapq.heapify(self._heap)
+
+    def due(self, now=None):
+        now = time.monotonic() if now is None else now
+        out = []
+        while self._heap and self._heap[0][0] <= now:
+            t, i, s = heapq.heappop(self._heap)
+            out.append(s)
+            t += s.period_s
+            if t <= now:                    # fell behind: skip missed slots
+                t = now + s.period_s
+            heapq.heappush(self._heap, (t, i, s))
+        return out
+
+    def next_due(self):
+        return self._heap[0][0]
+
+class ModbusSession:
+    """One serial client for the gateway's lifetime, reconnected only after errors.
+
+    The RTU bus is half-duplex, so all reads go through one lock (and callers
+    should use a single-thread executor).
+    """
+    def __init__(self, client_factory, max_gap=8, reconnect_s=(0.5, 30.0)):
+        self.client_factory, self.max_gap = client_factory, max_gap
+        self.reconnect_min, self.reconnect_max = reconnect_s
+        self.client = None
+        self.stats = {"requests": 0, "registers": 0, "connects": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        self._backoff = self.reconnect_min
+
+    def _connected(self):
+        if self.client is not None:
+            return self.client
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError("Modbus serial reconnect backing off")
+        client = self.client_factory()
+        self.stats["connects"] += 1
+        if not client.connect():
+            self._fail()
+            raise ConnectionError("Modbus serial connect failed")
+        self.client, self._backoff = client, self.reconnect_min
+        return client
+
+    def _fail(self):
+        self.stats["errors"] += 1
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self._retry_at = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.reconnect_max)
+
+    def read_block(self, unit, start, count):
+        with self._lock:
+            client = self._connected()
+            try:
+                rr = client.read_holding_registers(start, count, unit=unit)
+            except Exception:
+                self._fail(); raise
+            if rr.isError():
+                # exception response: the link is fine, the request was not
+                self.stats["errors"] += 1
+                raise IOError(f"Modbus read error unit={unit} start={start} count={count}")
+            self.stats["requests"] += 1
+            self.stats["registers"] += count
+            return rr.registers
+
+    def read(self, specs):
+        """{name: value} for `specs`, using as few block reads as possible."""
+        values = {}
+        for b in plan_blocks(specs, self.max_gap):
+            regs = self.read_block(b.unit, b.start, b.count)
+            for s in b.specs:
+                off = s.address - b.start
+                values[s.name] = regs[off] if s.count == 1 else regs[off:off + s.count]
+        return values
+
+    def close(self):
+        with self._lock:
+            if self.client is not None:
+                self.client.close()
+                self.client = None
+
+class ChangeFilter:
+    """Keeps what was last published; update() returns only values that changed
+    (beyond deadband), plus everything again once `refresh_s` has passed."""
+    def __init__(self, specs, refresh_s=300.0):
+        self.deadband = {s.name: s.deadband for s in specs}
+        self.refresh_s = refresh_s
+        self._last = {}
+        self._refresh_at = float("-inf")
+
+    def update(self, values, now=None):
+        now = time.monotonic() if now is None else now
+        if now >= self._refresh_at:
+            self._refresh_at = now + self.refresh_s
+            self._last.clear()
+        out = {}
+        for k, v in values.items():
+            old = self._last.get(k)
+            db = self.deadband.get(k, 0)
+            if old is None or (abs(v - old) > db if db and not isinstance(v, list) else v != old):
+                out[k] = self._last[k] = v
+        return out
+
+class Outbox:
+    """Store-and-forward queue on one SQLite connection (WAL, owned by the loop thread).
+
+    Rows are taken oldest first and acknowledged as a prefix, so one range DELETE
+    replaces per-row deletes and commits. `ready` is set whenever rows are added.
+    """
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS outbox(id INTEGER PRIMARY KEY, topic TEXT, payload TEXT)")
+        self.conn.commit()
+        self.ready = asyncio.Event()
+
+    def put(self, topic, payload):
+        self.conn.execute("INSERT INTO outbox(topic,payload) VALUES(?,?)", (topic, payload))
+        self.conn.commit()
+        self.ready.set()
+
+    def peek(self, limit=20):
+        return self.conn.execute(
+            "SELECT id,topic,payload FROM outbox ORDER BY id LIMIT ?", (limit,)).fetchall()
+
+    def ack_through(self, rid):
+        self.conn.execute("DELETE FROM outbox WHERE id <= ?", (rid,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
\ No newline at end of file
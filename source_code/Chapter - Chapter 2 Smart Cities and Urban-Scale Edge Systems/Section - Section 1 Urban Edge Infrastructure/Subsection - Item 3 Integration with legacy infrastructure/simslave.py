@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Simulated Modbus RTU slave behind a pymodbus-like client. Frames cost real time
+# at the configured baud rate (11-bit characters, 3.5-character silences, slave
+# turnaround) and the bus keeps account of how long the line was busy.
+import threading, time
+
+class SimBus:
+    def __init__(self, baud=19200, turnaround_s=0.005):
+        self.baud, self.turnaround_s = baud, turnaround_s
+        self.char_s = 11.0 / baud
+        # 3.5 character times, fixed at 1.75 ms above 19200 baud
+        self.silence_s = 3.5 * self.char_s if baud <= 19200 else 0.00175
+        self.busy_s = 0.0
+        self.requests = 0
+        self.registers = 0
+        self.lock = threading.Lock()
+
+    def transaction_s(self, count):
+        req = 8 * self.char_s                   # addr, fn, start(2), count(2), crc(2)
+        resp = (5 + 2 * count) * self.char_s    # addr, fn, bytes, data, crc(2)
+        return 2 * self.silence_s + req + self.turnaround_s + resp
+
+    def utilisation(self, wall_s):
+        return self.busy_s / wall_s if wall_s > 0 else 0.0
+
+class _Response:
+    def __init__(self, registers=None, code=None):
+        self.registers, self.exception_code = registers or [], code
+    def isError(self):
+        return self.exception_code is not None
+
+class SimulatedSerialClient:
+    """Stand-in for pymodbus ModbusSerialClient(method='rtu').
+
+    connect()/close() cost `connect_s`/`close_s` of host time (opening and
+    configuring the tty) during which the bus carries nothing.
+    """
+    def __init__(self, bus, n_regs=256, units=(1,), connect_s=0.025, close_s=0.005,
+                 clock=time.monotonic):
+        self.bus, self.n_regs, self.units = bus, n_regs, set(units)
+        self.connect_s, self.close_s, self.clock = connect_s, close_s, clock
+        self.connected = False
+        self.connect_time_s = 0.0
+
+    def connect(self):
+        time.sleep(self.connect_s)
+        self.connect_time_s += self.connect_s
+        self.connected = True
+        return True
+
+    def close(self):
+        if self.connected:
+            time.sleep(self.close_s)
+            self.connect_time_s += self.close_s
+        self.connected = False
+
+    def value(self, addr, t):
+        """Deterministic register contents: static, slow, counter and phase registers."""
+        kind = addr % 4
+        if kind == 0:
+            return 1000 + addr
+        if kind == 1:
+            return int(t / 10) & 0xFFFF
+        if kind == 2:
+            return int(t * 0.5 + addr) & 0xFFFF
+        return int(t / 7 + addr) % 4
+
+    def read_holding_registers(self, address, count, unit=1):
+        if not self.connected:
+            raise ConnectionError("port not open")
+        if unit not in self.units:
+            time.sleep(self.bus.transaction_s(0) + 0.1)   # no answer: response timeout
+            raise TimeoutError(f"no response from unit {unit}")
+        ok = 0 <= address and 1 <= count <= 125 and address + count <= self.n_regs
+        dt = self.bus.transaction_s(count if ok else 0)
+        with self.bus.lock:
+            time.sleep(dt)
+            self.bus.busy_s += dt
+            self.bus.requests += 1
+        if not ok:
+            return _Response(code=2)                       # illegal data address
+        self.bus.registers += count
+        t = self.clock()
+        return _Response([self.value(a, t) for a in range(address, address + count)])
\ No newline at end of file
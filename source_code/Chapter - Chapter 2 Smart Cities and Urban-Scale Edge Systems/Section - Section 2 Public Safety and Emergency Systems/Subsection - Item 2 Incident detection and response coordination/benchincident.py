@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# Enqueue-to-dispatch latency with 10k queued incidents (and for isolated alerts on
+# an idle queue): the old scan/delete-then-forward/session-per-item worker vs
+# IncidentQueue + pooled, bounded-concurrency worker, against a local stub dispatcher.
+import argparse, asyncio, json, multiprocessing as mp, os, random, sqlite3, tempfile, time
+from datetime import datetime
+import aiohttp
+import numpy as np
+from aiohttp import web
+from incidentaggregator import worker
+from incidentqueue import IncidentQueue
+
+def stub_dispatcher(port, service_ms, fail_rate, ready):
+    received = []
+    async def dispatch(request):
+        body = await request.json()
+        await asyncio.sleep(service_ms / 1e3)
+        if random.random() < fail_rate:
+            return web.Response(status=503)
+        received.append((time.time() - body["t_enq"], body["priority"]))
+        return web.json_response({"ok": True})
+    async def results(request):
+        out = list(received); received.clear()
+        return web.json_response(out)
+    async def count(request):
+        return web.json_response(len(received))
+    app = web.Application()
+    app.router.add_post("/dispatch", dispatch)
+    app.router.add_get("/results", results)
+    app.router.add_get("/count", count)
+    async def run():
+        runner = web.AppRunner(app, access_log=None); await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port, backlog=1024).start()
+        ready.set()
+        await asyncio.Event().wait()
+    asyncio.run(run())
+
+# --- the previous implementation, verbatim apart from the URL ---
+def old_init_db(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS q(id INTEGER PRIMARY KEY, priority INTEGER, payload TEXT, ts TEXT)")
+    return conn
+
+def old_enqueue(conn, priority, payload):
+    conn.execute("INSERT INTO q(priority, payload, ts) VALUES (?, ?, ?)",
+                 (priority, json.dumps(payload), datetime.utcnow().isoformat()))
+
+def old_dequeue(conn):
+    row = conn.execute("SELECT id, priority, payload FROM q ORDER BY priority DESC, id ASC LIMIT 1").fetchone()
+    if row:
+        conn.execute("DELETE FROM q WHERE id=?", (row[0],))
+        return json.loads(row[2])
+    return None
+
+async def old_worker(conn, url):
+    while True:
+        item = old_dequeue(conn)
+        if not item:
+            await asyncio.sleep(0.5)
+            continue
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json=item, timeout=10) as resp:
+                    resp.raise_for_status()
+                    await resp.json()
+        except Exception:
+            old_enqueue(conn, item.get("priority", 0)-1, item)
+            await asyncio.sleep(1)
+
+# --- harness ---
+class Old:
+    def __init__(self, path): self.conn = old_init_db(path)
+    def put(self, prio, payload): old_enqueue(self.conn, prio, payload)
+    def start(self, url, args): return asyncio.create_task(old_worker(self.conn, url))
+    async def close(self): self.conn.close()
+
+class New:
+    def __init__(self, path): self.q = IncidentQueue(path, lease_s=30.0, retry_base_s=0.05)
+    def put(self, prio, payload): self.q.put(prio, payload)
+    def start(self, url, args):
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.concurrency))
+        return asyncio.create_task(worker(self.q, self.session, args.concurrency, url))
+    async def close(self):
+        await self.session.close(); self.q.close()
+
+async def fetch(session, base, what):
+    async with session.get(f"{base}/{what}") as r:
+        return await r.json()
+
+def summarise(rows):
+    if not rows:
+        return "none dispatched"
+    lat = np.array([r[0] for r in rows]) * 1e3
+    prio = np.array([r[1] for r in rows])
+    p50, p95, p99 = np.percentile(lat, (50, 95, 99))
+    hi = lat[prio >= 8]; lo = lat[prio <= 1]
+    hi99 = f"{np.percentile(hi, 99):.0f}" if len(hi) else "-"
+    lo99 = f"{np.percentile(lo, 99):.0f}" if len(lo) else "-"
+    return f"{p50:>8.0f} {p95:>8.0f} {p99:>8.0f} {hi99:>8} {lo99:>8}"
+
+async def burst(impl_cls, args, base, tmp, ctl):
+    impl = impl_cls(os.path.join(tmp, f"{impl_cls.__name__}_burst.db"))
+    rng = random.Random(4)
+    t = time.perf_counter()
+    for i in range(args.items):
+        prio = rng.randint(0, 9)
+        impl.put(prio, {"incident": i, "priority": prio, "t_enq": time.time()})
+    enq = (time.perf_counter() - t) / args.items * 1e6
+    t0 = time.monotonic()
+    task = impl.start(f"{base}/dispatch", args)
+    n = 0
+    while n < args.items and time.monotonic() - t0 < args.cap_s:
+        await asyncio.sleep(0.1)
+        n = await fetch(ctl, base, "count")
+    wall = time.monotonic() - t0
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    rows = await fetch(ctl, base, "results")
+    await impl.close()
+    return enq, len(rows), wall, rows
+
+async def trickle(impl_cls, args, base, tmp, ctl):
+    impl = impl_cls(os.path.join(tmp, f"{impl_cls.__name__}_trickle.db"))
+    task = impl.start(f"{base}/dispatch", args)
+    await asyncio.sleep(0.6)
+    for i in range(args.trickle):
+        impl.put(9, {"incident": i, "priority": 9, "t_enq": time.time()})
+        await asyncio.sleep(0.3)
+    await asyncio.sleep(1.0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    rows = await fetch(ctl, base, "results")
+    await impl.close()
+    return np.median([r[0] for r in rows]) * 1e3 if rows else float("nan")
+
+async def amain(args, base):
+    async with aiohttp.ClientSession() as ctl:
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"{args.items} queued, stub service {args.service_ms} ms, fail rate {args.fail_rate}")
+            print(f"{'worker':>7} {'enq us':>7} {'sent':>6} {'items/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+                  f"{'p99 ms':>8} {'hi p99':>8} {'lo p99':>8}")
+            for cls in (Old, New):
+                enq, n, wall, rows = await burst(cls, args, base, tmp, ctl)
+                print(f"{cls.__name__.lower():>7} {enq:>7.1f} {n:>6} {n / wall:>8.1f} {summarise(rows)}")
+            print(f"\nidle queue, {args.trickle} isolated alerts")
+            for cls in (Old, New):
+                print(f"{cls.__name__.lower():>7} median latency {await trickle(cls, args, base, tmp, ctl):.1f} ms")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=10000)
+    ap.add_argument("--service-ms", type=float, default=5.0)
+    ap.add_argument("--fail-rate", type=float, default=0.01)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--cap-s", type=float, default=20.0, help="give up draining after this long")
+    ap.add_argument("--trickle", type=int, default=15)
+    ap.add_argument("--port", type=int, default=18080)
+    args = ap.parse_args()
+    ready = mp.Event()
+    stub = mp.Process(target=stub_dispatcher, args=(args.port, args.service_ms, args.fail_rate, ready),
+                      daemon=True)
+    stub.start(); ready.wait(10)
+    try:
+        asyncio.run(amain(args, f"http://127.0.0.1:{args.port}"))
+    finally:
+        stub.terminate()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,55 +1,47 @@
 import asyncio
 import json
-import sqlite3
-from datetime import datetime
 from asyncio_mqtt import Client, MqttError
 import aiohttp
-import backoff
+from incidentqueue import IncidentQueue
 
 DB_PATH = "/var/lib/incident_queue.db"
 MQTT_BROKER = "mec.local"
 MQTT_TOPIC = "incident/alerts"
 DISPATCHER_URL = "https://dispatcher.city/api/v1/dispatch"
 TLS_PARAMS = {"cert": "/etc/ssl/cert.pem"}  # example TLS parameters
+CONCURRENCY = 32       # forwards in flight; also the connection pool size
+LEASE_S = 30.0         # visibility timeout; must exceed the forward timeout
+FORWARD_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
-# durable simple queue using SQLite
-def init_db():
-    conn = sqlite3.connect(DB_PATH, isolation_level=None)
-    conn.execute("CREATE TABLE IF NOT EXISTS q(id INTEGER PRIMARY KEY, priority INTEGER, payload TEXT, ts TEXT)")
-    return conn
+async def forward_to_dispatch(session, payload, url=DISPATCHER_URL):
+    async with session.post(url, json=payload, timeout=FORWARD_TIMEOUT) as resp:
+        resp.raise_for_status()
+        return await resp.json()
 
-def enqueue(conn, priority, payload):
-    conn.execute("INSERT INTO q(priority, payload, ts) VALUES (?, ?, ?)",
-                 (priority, json.dumps(payload), datetime.utcnow().isoformat()))
+async def worker(queue, session, concurrency=CONCURRENCY, url=DISPATCHER_URL):
+    # Leases the next incident whenever a slot frees up; the row is only deleted
+    # once the dispatcher has accepted it, so a crash mid-forward re-sends it.
+    slots = asyncio.Semaphore(concurrency)
+    pending = set()
 
-def dequeue(conn):
-    row = conn.execute("SELECT id, priority, payload FROM q ORDER BY priority DESC, id ASC LIMIT 1").fetchone()
-    if row:
-        conn.execute("DELETE FROM q WHERE id=?", (row[0],))
-        return json.loads(row[2])
-    return None
-
-@backoff.on_exception(backoff.expo, Exception, max_time=300)
-async def forward_to_dispatch(payload):
-    async with aiohttp.ClientSession() as session:
-        async with session.post(DISPATCHER_URL, json=payload, timeout=10) as resp:
-            resp.raise_for_status()
-            return await resp.json()
-
-async def worker(conn):
-    while True:
-        item = dequeue(conn)
-        if not item:
-            await asyncio.sleep(0.5)
-            continue
+    async def forward(item):
         try:
-            await forward_to_dispatch(item)
+            await forward_to_dispatch(session, item.payload, url)
+            queue.ack(item.id, item.lease)
         except Exception:
-            # re-enqueue with slightly lower priority to avoid starvation
-            enqueue(conn, item.get("priority", 0)-1, item)
-            await asyncio.sleep(1)
+            # retried later at slightly lower priority to avoid starvation
+            queue.nack(item.id, item.lease)
+        finally:
+            slots.release()
+
+    while True:
+        await slots.acquire()
+        item = await queue.get()
+        task = asyncio.create_task(forward(item))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
 
-async def mqtt_loop(conn):
+async def mqtt_loop(queue):
     reconnect_interval = 1
     while True:
         try:
@@ -60,7 +52,7 @@ async def mqtt_loop(conn):
                         try:
                             payload = json.loads(msg.payload.decode())
                             # payload must include 'priority' and 'incident' fields
-                            enqueue(conn, int(payload.get("priority", 0)), payload)
+                            queue.put(int(payload.get("priority", 0)), payload)
                         except Exception:
                             continue
         except MqttError:
@@ -68,8 +60,11 @@ async def mqtt_loop(conn):
             reconnect_interval = min(reconnect_interval * 2, 30)
 
 async def main():
-    conn = init_db()
-    await asyncio.gather(mqtt_loop(conn), worker(conn))
+    queue = IncidentQueue(DB_PATH, lease_s=LEASE_S)
+    # one pooled session for every forward; keep-alive connections are reused
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(mqtt_loop(queue), worker(queue, session))
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
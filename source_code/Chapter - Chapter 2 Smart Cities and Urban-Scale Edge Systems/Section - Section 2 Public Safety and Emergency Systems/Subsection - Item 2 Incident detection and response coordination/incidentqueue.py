@@ -0,0 +1,124 @@
+# Durable incident priority queue: SQLite keeps the rows (indexed by priority),
+# an in-memory heap mirrors them for O(log n) dequeues, and dequeues are leases
+# that must be acked before the row is deleted.
+import asyncio
+import heapq
+import json
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime
+
+Leased = namedtuple("Leased", "id priority payload attempts lease")
+
+class IncidentQueue:
+    """Highest priority first, FIFO within a priority.
+
+    get() leases an item for `lease_s` seconds; ack() deletes it, nack() demotes
+    it by one priority level and makes it visible again after a backoff, and a
+    lease that runs out puts the item back untouched. ack()/nack() take the
+    item's `lease` token (its deadline), so a forward whose lease expired cannot
+    settle the redelivery's lease. Leases are in memory only: after a restart
+    every row still in the table is delivered again.
+    """
+    def __init__(self, path, lease_s=30.0, retry_base_s=1.0, retry_max_s=60.0):
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS q(id INTEGER PRIMARY KEY, priority INTEGER, payload TEXT, ts TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS q_priority ON q(priority DESC, id)")
+        self.lease_s, self.retry_base_s, self.retry_max_s = lease_s, retry_base_s, retry_max_s
+        self._ready = []        # (-priority, id)
+        self._items = {}        # id -> [priority, payload, attempts]
+        self._leases = {}       # id -> lease deadline
+        self._timers = []       # (when, id, kind) for lease expiry and retry backoff
+        self._wake = asyncio.Event()
+        rows = self.conn.execute("SELECT id, priority, payload FROM q ORDER BY priority DESC, id")
+        for rid, prio, payload in rows:
+            self._items[rid] = [prio, json.loads(payload), 0]
+            self._ready.append((-prio, rid))
+        heapq.heapify(self._ready)
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def in_flight(self):
+        return len(self._leases)
+
+    def put(self, priority, payload):
+        cur = self.conn.execute("INSERT INTO q(priority, payload, ts) VALUES (?, ?, ?)",
+                                (priority, json.dumps(payload), datetime.utcnow().isoformat()))
+        rid = cur.lastrowid
+        self._items[rid] = [priority, payload, 0]
+        heapq.heappush(self._ready, (-priority, rid))
+        self._wake.set()
+        return rid
+
+    def _fire_timers(self, now):
+        while self._timers and self._timers[0][0] <= now:
+            when, rid, kind = heapq.heappop(self._timers)
+            if kind == "lease":
+                # stale if the lease was acked, nacked or renewed since
+                if self._leases.get(rid) != when:
+                    continue
+                del self._leases[rid]
+            elif rid not in self._items or rid in self._leases:
+                continue
+            heapq.heappush(self._ready, (-self._items[rid][0], rid))
+
+    def get_nowait(self, now=None):
+        now = time.monotonic() if now is None else now
+        self._fire_timers(now)
+        if not self._ready:
+            return None
+        _, rid = heapq.heappop(self._ready)
+        prio, payload, attempts = self._items[rid]
+        deadline = now + self.lease_s
+        self._leases[rid] = deadline
+        heapq.heappush(self._timers, (deadline, rid, "lease"))
+        return Leased(rid, prio, payload, attempts, deadline)
+
+    async def get(self):
+        """Next item, waiting on put(), nack() backoffs and lease expiry; never polls."""
+        while True:
+            item = self.get_nowait()
+            if item is not None:
+                return item
+            self._wake.clear()
+            timeout = max(0.0, self._timers[0][0] - time.monotonic()) if self._timers else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _settle(self, rid, lease):
+        # True if `lease` is still the live lease on rid; ends it
+        if self._leases.get(rid) != lease:
+            return False
+        del self._leases[rid]
+        return True
+
+    def ack(self, rid, lease):
+        if not self._settle(rid, lease):
+            return False      # lease expired meanwhile; the redelivery will ack
+        self.conn.execute("DELETE FROM q WHERE id=?", (rid,))
+        del self._items[rid]
+        return True
+
+    def nack(self, rid, lease, demote=1):
+        """Failed forward: lower the priority (so one bad incident cannot starve
+        the rest) and retry after exponential backoff."""
+        if not self._settle(rid, lease):
+            return False
+        entry = self._items[rid]
+        entry[0] -= demote
+        entry[2] += 1
+        self.conn.execute("UPDATE q SET priority=? WHERE id=?", (entry[0], rid))
+        delay = min(self.retry_base_s * 2 ** (entry[2] - 1), self.retry_max_s)
+        heapq.heappush(self._timers, (time.monotonic() + delay, rid, "retry"))
+        self._wake.set()   # get() may need a shorter timeout now
+        return True
+
+    def close(self):
+        self.conn.close()
\ No newline at end of file
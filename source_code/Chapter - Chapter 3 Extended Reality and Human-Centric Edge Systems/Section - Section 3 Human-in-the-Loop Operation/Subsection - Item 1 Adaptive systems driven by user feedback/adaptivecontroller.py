@@ -1,5 +1,6 @@
 import json, time, math, random
 import paho.mqtt.client as mqtt  # robust MQTT client for edge messaging
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
 
 STATE_PATH = "/var/lib/edge_adapt/state.json"
 MQTT_BROKER = "localhost"
@@ -20,7 +21,8 @@ class AdaptiveController:
         self.client.on_message = self._on_msg
         self.client.connect(MQTT_BROKER)
         self.client.subscribe(TOPIC_FEEDBACK)
-        self.client.loop_start()
+        # policy goes out over the same connection; bursts of feedback coalesce
+        self.pub = EdgePublisher(self.client, max_queue=16).start()
 
     def _load_state(self):
         try:
@@ -67,4 +69,4 @@ class AdaptiveController:
             elif self.ema_reward > 0.2:
                 self.current["offload"] = min(MAX_OFFLOAD, self.current["offload"]+0.05)
         # publish policy to local render manager
-        mqtt.Client().connect(MQTT_BROKER).publish("xr/policy", json.dumps(self.current))
\ No newline at end of file
+        self.pub.publish_state("xr/policy", json.dumps(self.current), qos=0)
\ No newline at end of file
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# Serial edgeinfer loop (read + preprocess + sess.run inside the coroutine) vs the
+# capture-thread / latest-frame / bound-session pipeline, on a synthetic camera and
+# a small generated SSD-shaped ONNX model. Reports fps, frame age and event-loop lag.
+import argparse, asyncio, threading, time, tracemalloc
+import cv2
+import numpy as np
+import onnx
+import onnxruntime as ort
+from onnx import helper, TensorProto, numpy_helper
+from framepipeline import (LatestFrame, Preprocessor, BoundSession, PipelineStats,
+                           capture_loop, infer_loop)
+
+def build_model(n_boxes=100):
+    """(1,3,300,300) -> boxes (N,n,4), scores (N,n), labels (N,n) via two strided convs."""
+    rng = np.random.default_rng(0)
+    init = [numpy_helper.from_array(rng.normal(0, .1, (16, 3, 3, 3)).astype(np.float32), "w1"),
+            numpy_helper.from_array(rng.normal(0, .1, (32, 16, 3, 3)).astype(np.float32), "w2"),
+            numpy_helper.from_array(rng.normal(0, .1, (32, n_boxes * 4)).astype(np.float32), "wb"),
+            numpy_helper.from_array(rng.normal(0, .1, (32, n_boxes)).astype(np.float32), "ws"),
+            numpy_helper.from_array(np.array([-1, n_boxes, 4], np.int64), "bshape"),
+            numpy_helper.from_array(np.array([0.5], np.float32), "half")]
+    nodes = [helper.make_node("Conv", ["x", "w1"], ["c1"], strides=[2, 2]),
+             helper.make_node("Relu", ["c1"], ["r1"]),
+             helper.make_node("Conv", ["r1", "w2"], ["c2"], strides=[2, 2]),
+             helper.make_node("Relu", ["c2"], ["r2"]),
+             helper.make_node("GlobalAveragePool", ["r2"], ["g"]),
+             helper.make_node("Flatten", ["g"], ["f"]),
+             helper.make_node("MatMul", ["f", "wb"], ["b"]),
+             helper.make_node("Reshape", ["b", "bshape"], ["boxes"]),
+             helper.make_node("MatMul", ["f", "ws"], ["s"]),
+             helper.make_node("Sigmoid", ["s"], ["scores"]),
+             helper.make_node("Greater", ["scores", "half"], ["gt"]),
+             helper.make_node("Cast", ["gt"], ["labels"], to=TensorProto.INT64)]
+    g = helper.make_graph(nodes, "ssd_stub",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, ["N", 3, 300, 300])],
+        [helper.make_tensor_value_info("boxes", TensorProto.FLOAT, ["N", n_boxes, 4]),
+         helper.make_tensor_value_info("scores", TensorProto.FLOAT, ["N", n_boxes]),
+         helper.make_tensor_value_info("labels", TensorProto.INT64, ["N", n_boxes])],
+        init)
+    m = helper.make_model(g, opset_imports=[helper.make_opsetid("", 13)])
+    m.ir_version = 8
+    so = ort.SessionOptions(); so.intra_op_num_threads = 1
+    return ort.InferenceSession(m.SerializeToString(), so, providers=["CPUExecutionProvider"])
+
+class PaddedSession:
+    """Adds a GIL-free wait to every run, standing in for a slower GPU model."""
+    def __init__(self, sess, pad_s):
+        self.sess, self.pad_s = sess, pad_s
+    def __getattr__(self, k):
+        return getattr(self.sess, k)
+    def run(self, *a, **kw):
+        time.sleep(self.pad_s); return self.sess.run(*a, **kw)
+    def run_with_iobinding(self, *a, **kw):
+        time.sleep(self.pad_s); return self.sess.run_with_iobinding(*a, **kw)
+
+class FakeCamera:
+    """Frame k is ready at t0 + k/fps and queued like an unbounded appsink; read()
+    returns the oldest unread frame and pays `decode_s` of conversion work."""
+    def __init__(self, fps, decode_s, shape=(1080, 1920, 3)):
+        self.period, self.decode_s = 1.0 / fps, decode_s
+        self.src = np.random.default_rng(1).integers(0, 255, shape, np.uint8)
+        self.t0 = time.monotonic()
+        self.k = 0
+        self.last_ts = self.t0
+    def read(self, image=None):
+        ready = self.t0 + self.k * self.period
+        wait = ready - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.k += 1
+        self.last_ts = ready
+        time.sleep(self.decode_s)
+        if image is None or image.shape != self.src.shape:
+            image = np.empty_like(self.src)
+        np.copyto(image, self.src)
+        return True, image
+
+def old_preprocess(frame):
+    img = cv2.resize(frame, (300,300))
+    img = img[:, :, ::-1].astype(np.float32)  # BGR->RGB
+    img = (img / 127.5) - 1.0
+    return np.expand_dims(np.transpose(img, (2,0,1)), 0)
+
+async def heartbeat(lags, period=0.01):
+    while True:
+        t = time.monotonic()
+        await asyncio.sleep(period)
+        lags.append(time.monotonic() - t - period)
+
+def summary(ages, lags, frames, dur):
+    a = np.percentile(ages, (50, 95, 99)) * 1e3 if ages else [float("nan")] * 3
+    return frames / dur, a, np.percentile(lags, 99) * 1e3 if lags else float("nan")
+
+async def run_serial(sess, args):
+    cap = FakeCamera(args.fps, args.decode_ms / 1e3)
+    name = sess.get_inputs()[0].name
+    ages, lags, frames = [], [], 0
+    hb = asyncio.create_task(heartbeat(lags))
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        ret, frame = cap.read()
+        inp = old_preprocess(frame)
+        outs = sess.run(None, {name: inp})
+        int((outs[1] > 0.5).sum())
+        ages.append(time.monotonic() - cap.last_ts); frames += 1
+        await asyncio.sleep(0)
+    hb.cancel()
+    return summary(ages, lags, frames, args.seconds)
+
+async def run_pipeline(sess, args):
+    cap = FakeCamera(args.fps, args.decode_ms / 1e3)
+    slot, prep, stats = LatestFrame(), Preprocessor((300, 300)), PipelineStats(1 << 16)
+    model = BoundSession(sess, prep.out)
+    ages, lags, latest = [], [], {}
+    def on_result(outs, ts):
+        latest["count"] = int((outs[1] > 0.5).sum())
+        ages.append(time.monotonic() - ts)
+    stop = threading.Event()
+    ws = [threading.Thread(target=capture_loop, args=(cap, slot, stop, lambda: cap.last_ts), daemon=True),
+          threading.Thread(target=infer_loop, args=(slot, prep, model, stats, on_result, stop), daemon=True)]
+    for w in ws: w.start()
+    hb = asyncio.create_task(heartbeat(lags))
+    await asyncio.sleep(args.seconds)
+    snap = stats.snapshot(window_s=args.seconds)
+    stop.set(); hb.cancel()
+    for w in ws: w.join(1.0)
+    return summary(ages, lags, len(ages), args.seconds) + (slot.dropped, snap)
+
+def bench_preprocess(n=300):
+    frame = np.random.default_rng(2).integers(0, 255, (1080, 1920, 3), np.uint8)
+    prep = Preprocessor((300, 300))
+    assert np.allclose(prep(frame), old_preprocess(frame), atol=1e-6)
+    print(f"{'preprocess':>12} {'ms/frame':>9} {'bytes alloc':>12}")
+    for name, fn in (("old", old_preprocess), ("fused", prep)):
+        for _ in range(20): fn(frame)
+        t = time.perf_counter()
+        for _ in range(n): fn(frame)
+        dt = (time.perf_counter() - t) / n
+        tracemalloc.start(); fn(frame); peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+        print(f"{name:>12} {dt*1e3:>9.3f} {peak:>12}")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fps", type=float, default=30.0, help="camera frame rate")
+    ap.add_argument("--decode-ms", type=float, default=10.0, help="per-frame cap.read() cost")
+    ap.add_argument("--model-ms", type=float, default=22.0, help="extra GIL-free model time")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+    bench_preprocess()
+    sess = PaddedSession(build_model(), args.model_ms / 1e3)
+    print(f"\n{'loop':>10} {'fps':>7} {'age p50':>9} {'age p95':>9} {'age p99':>9} "
+          f"{'loop lag p99':>13} {'dropped':>8}")
+    fps, a, lag = asyncio.run(run_serial(sess, args))
+    print(f"{'serial':>10} {fps:>7.1f} {a[0]:>9.1f} {a[1]:>9.1f} {a[2]:>9.1f} {lag:>13.1f} {'-':>8}")
+    fps, a, lag, dropped, snap = asyncio.run(run_pipeline(sess, args))
+    print(f"{'pipeline':>10} {fps:>7.1f} {a[0]:>9.1f} {a[1]:>9.1f} {a[2]:>9.1f} {lag:>13.1f} {dropped:>8}")
+    print(f"\nstats endpoint payload: {snap}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,17 +1,21 @@
-import cv2, time, asyncio, paho.mqtt.client as mqtt
+import cv2, time, asyncio, threading, paho.mqtt.client as mqtt
 import onnxruntime as ort
 import numpy as np
+from aiohttp import web
+from edgepublisher import EdgePublisher  # Chapter 1 shared publisher, deployed alongside
+from framepipeline import (LatestFrame, Preprocessor, BoundSession, PipelineStats,
+                           capture_loop, infer_loop)
 
 # Initialize ONNX Runtime with CUDA provider for GPU inference.
 sess = ort.InferenceSession("person_mobilenet_ssd.onnx",
                             providers=['CUDAExecutionProvider','CPUExecutionProvider'])
-input_name = sess.get_inputs()[0].name
 
 # MQTT telemetry (TLS certs and auth configured in production).
 mqttc = mqtt.Client()
 mqttc.tls_set()  # use device provisioned certs
 mqttc.username_pw_set("edge-node-id", password="secure-token")
 mqttc.connect("broker.local", 8883)
+pub = EdgePublisher(mqttc).start()
 
 # GStreamer RTSP pipeline tuned for low latency on Jetson.
 rtsp_src = ("rtspsrc location=rtsp://camera/stream latency=50 ! "
@@ -20,30 +24,60 @@ rtsp_src = ("rtspsrc location=rtsp://camera/stream latency=50 ! "
 
 cap = cv2.VideoCapture(rtsp_src, cv2.CAP_GSTREAMER)
 
-async def preprocess(frame):
-    # Resize, normalize, and add batch dim. Use vectorized ops.
-    img = cv2.resize(frame, (300,300))
-    img = img[:, :, ::-1].astype(np.float32)  # BGR->RGB
-    img = (img / 127.5) - 1.0
-    return np.expand_dims(np.transpose(img, (2,0,1)), 0)
+COUNT_TOPIC = "store/entrance/count"
+PUBLISH_PERIOD = 0.5   # seconds; avoids network spikes
+SCORE_THRESH = 0.5
+STATS_PORT = 8090
 
-async def infer_loop():
-    last_pub = time.time()
+# capture thread -> latest-frame slot -> inference thread -> aggregator
+slot = LatestFrame()
+prep = Preprocessor((300, 300))          # resize, normalize, RGB NCHW in one buffer
+model = BoundSession(sess, prep.out)     # input and outputs bound once
+stats = PipelineStats()
+latest = {"count": 0, "ts": 0.0}
+
+def on_result(outs, ts):
+    # Simple postprocess: extract boxes and scores (model-specific). Runs on the
+    # inference thread, before the bound outputs are overwritten by the next frame.
+    boxes, scores, labels = outs[0], outs[1], outs[2]
+    latest["count"], latest["ts"] = int((scores > SCORE_THRESH).sum()), ts
+
+async def aggregator():
+    # The only publisher: the newest count every PUBLISH_PERIOD, last value wins.
     while True:
-        ret, frame = cap.read()
-        if not ret:
-            await asyncio.sleep(0.01); continue
-        inp = await preprocess(frame)  # non-blocking placeholder
-        # Synchronous low-latency inference call (fast path).
-        outs = sess.run(None, {input_name: inp})
-        # Simple postprocess: extract boxes and scores (model-specific).
-        boxes, scores, labels = outs[0], outs[1], outs[2]
-        count = int((scores > 0.5).sum())
-        # Publish every 0.5 s to avoid network spikes.
-        if time.time() - last_pub > 0.5:
-            mqttc.publish("store/entrance/count", payload=str(count), qos=1)
-            last_pub = time.time()
-        await asyncio.sleep(0)  # yield to event loop
+        await asyncio.sleep(PUBLISH_PERIOD)
+        if latest["ts"]:
+            pub.publish_state(COUNT_TOPIC, str(latest["count"]), qos=1)
+
+async def stats_handler(request):
+    snap = stats.snapshot()
+    snap["dropped_frames"] = slot.dropped
+    snap["publisher"] = dict(pub.stats)
+    return web.json_response(snap)
+
+async def main():
+    stop = threading.Event()
+    workers = [threading.Thread(target=capture_loop, args=(cap, slot, stop),
+                                name="capture", daemon=True),
+               threading.Thread(target=infer_loop,
+                                args=(slot, prep, model, stats, on_result, stop),
+                                name="infer", daemon=True)]
+    for w in workers:
+        w.start()
+    app = web.Application()
+    app.router.add_get('/stats', stats_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '0.0.0.0', STATS_PORT).start()
+    try:
+        await aggregator()
+    finally:
+        stop.set()
+        for w in workers:
+            w.join(1.0)
+        await runner.cleanup()
+        cap.release()
+        pub.stop()
 
 # Run.
-asyncio.run(infer_loop())
\ No newline at end of file
+asyncio.run(main())
\ No newline at end of file
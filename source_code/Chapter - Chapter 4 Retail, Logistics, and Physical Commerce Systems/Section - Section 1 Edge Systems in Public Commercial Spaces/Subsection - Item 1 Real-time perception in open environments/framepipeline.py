@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Stages for the edgeinfer pipeline: a latest-frame-wins slot between capture and
+# inference, a fused preprocessor that writes straight into a bound NCHW buffer,
+# an I/O-bound ONNX Runtime session, and rolling fps / frame-age statistics.
+import threading, time
+from collections import deque
+import cv2
+import numpy as np
+
+class LatestFrame:
+    """Single-slot handoff. The producer overwrites, the consumer always gets the
+    newest frame; displaced and released frames are recycled as capture buffers."""
+    def __init__(self, spares=3):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._ts = 0.0
+        self._spare = deque(maxlen=spares)
+        self.dropped = 0     # frames overwritten before inference took them
+        self.closed = False
+
+    def spare(self):
+        """A buffer for the next cap.read(), or None to let OpenCV allocate."""
+        with self._cond:
+            return self._spare.popleft() if self._spare else None
+
+    def put(self, frame, ts=None):
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+                self._spare.append(self._frame)
+            self._frame, self._ts = frame, time.monotonic() if ts is None else ts
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """(frame, capture_ts), or None on timeout or close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frame is not None or self.closed, timeout)
+            if self._frame is None:
+                return None
+            item = self._frame, self._ts
+            self._frame = None
+            return item
+
+    def release(self, frame):
+        with self._cond:
+            self._spare.append(frame)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class Preprocessor:
+    """resize -> (x*scale + shift) -> RGB NCHW without per-frame allocations.
+
+    Normalisation is a 256-entry LUT applied by cv2.LUT, and the channel flip and
+    NCHW layout are a single strided copy into `out`, whose address never changes
+    so it can be bound to the session once.
+    """
+    def __init__(self, size=(300, 300), scale=1 / 127.5, shift=-1.0, rgb=True):
+        w, h = size
+        self.size = size
+        self._resized = np.empty((h, w, 3), np.uint8)
+        self._hwc = np.empty((h, w, 3), np.float32)
+        lut = (np.arange(256) * scale + shift).astype(np.float32)
+        self._lut = np.repeat(lut.reshape(1, 256, 1), 3, axis=2)
+        self.out = np.empty((1, 3, h, w), np.float32)
+        chw = self._hwc.transpose(2, 0, 1)
+        self._chw = chw[::-1] if rgb else chw
+
+    def __call__(self, frame):
+        cv2.resize(frame, self.size, dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        cv2.LUT(self._resized, self._lut, dst=self._hwc)
+        np.copyto(self.out[0], self._chw)
+        return self.out
+
+class BoundSession:
+    """Session with the input and outputs bound once.
+
+    Outputs whose shape is fixed apart from the batch dimension are preallocated
+    and bound by pointer, so each run writes into the same arrays. Truly dynamic
+    outputs (e.g. post-NMS box counts) stay ORT-allocated and are copied out.
+    """
+    def __init__(self, sess, inp):
+        self.sess = sess
+        name = sess.get_inputs()[0].name
+        self.binding = sess.io_binding()
+        self.binding.bind_cpu_input(name, inp)
+        probe = sess.run(None, {name: inp})   # concrete shapes for this batch size
+        self.outs = []
+        for meta, o in zip(sess.get_outputs(), probe):
+            if all(isinstance(d, int) for d in meta.shape[1:]):
+                buf = np.empty(o.shape, o.dtype)
+                self.binding.bind_output(meta.name, 'cpu', 0, buf.dtype.type,
+                                         list(buf.shape), buf.ctypes.data)
+                self.outs.append(buf)
+            else:
+                self.binding.bind_output(meta.name, 'cpu')
+                self.outs.append(None)
+        self._dynamic = [i for i, o in enumerate(self.outs) if o is None]
+
+    def run(self):
+        self.sess.run_with_iobinding(self.binding)
+        if not self._dynamic:
+            return self.outs
+        fetched = self.binding.copy_outputs_to_cpu()
+        return [fetched[i] if o is None else o for i, o in enumerate(self.outs)]
+
+class PipelineStats:
+    """Ring of (completion time, frame age) for finished frames."""
+    def __init__(self, capacity=4096):
+        self._done = np.zeros(capacity)
+        self._age = np.zeros(capacity)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def record(self, capture_ts, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            i = self._n % len(self._done)
+            self._done[i], self._age[i] = now, now - capture_ts
+            self._n += 1
+
+    def snapshot(self, window_s=5.0, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            k = min(self._n, len(self._done))
+            done, age = self._done[:k].copy(), self._age[:k].copy()
+        sel = done >= now - window_s
+        n = int(sel.sum())
+        snap = {"frames": n, "fps": 0.0, "age_ms": {"p50": None, "p95": None, "p99": None}}
+        if n > 1:
+            snap["fps"] = round(float((n - 1) / max(np.ptp(done[sel]), 1e-9)), 2)
+        if n:
+            p = (np.percentile(age[sel], (50, 95, 99)) * 1e3).tolist()
+            snap["age_ms"] = {"p50": round(p[0], 2), "p95": round(p[1], 2), "p99": round(p[2], 2)}
+        return snap
+
+def capture_loop(cap, slot, stop, stamp=time.monotonic):
+    """Pull frames at camera rate; never waits for inference."""
+    while not stop.is_set():
+        ret, frame = cap.read(slot.spare())
+        if not ret:
+            time.sleep(0.01); continue
+        slot.put(frame, stamp())
+    slot.close()
+
+def infer_loop(slot, prep, model, stats, on_result, stop):
+    """Take the newest frame, preprocess into the bound buffer, run, hand off."""
+    while not stop.is_set():
+        item = slot.take(timeout=0.1)
+        if item is None:
+            if slot.closed: break
+            continue
+        frame, ts = item
+        prep(frame)
+        slot.release(frame)
+        outs = model.run()
+        stats.record(ts)
+        on_result(outs, ts)
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Frames/s of the dict-of-tuples greedy tracker vs CentroidTracker at 10/100/1000
+# simultaneous people; also counts identity switches against ground truth.
+import argparse, time
+import numpy as np
+from centroidtracker import CentroidTracker, linear_sum_assignment
+
+W, H = 1920, 1080
+
+class LegacyTracker:
+    """peoplecount.update_tracks as it was, including the `bestd,i = d,i` slip."""
+    def __init__(self):
+        self.next_id = 0
+        self.tracks = {}
+    def update(self, centers, now):
+        assigned = set()
+        new_tracks = {}
+        for tid,(cx,cy,last,age) in list(self.tracks.items()):
+            best = None; bestd = 1e9
+            for i,c in enumerate(centers):
+                if i in assigned: continue
+                d = (cx-c[0])**2 + (cy-c[1])**2
+                if d < bestd:
+                    bestd,i = d,i
+                    best = c
+            if best and bestd < 400**2:
+                new_tracks[tid] = (best[0],best[1],now,0)
+                assigned.add(i)
+            else:
+                if age < 5:
+                    new_tracks[tid] = (cx,cy,last,age+1)
+        for i,c in enumerate(centers):
+            if i in assigned: continue
+            new_tracks[self.next_id] = (c[0],c[1],now,0); self.next_id+=1
+        self.tracks = new_tracks
+        return len(self.tracks)
+    def positions(self):
+        return {tid: (v[0], v[1]) for tid, v in self.tracks.items() if v[3] == 0}
+
+def positions(tr):
+    a = tr.active
+    a = a[a["age"] == 0]
+    return {int(i): (float(x), float(y)) for i, x, y in zip(a["id"], a["cx"], a["cy"])}
+
+def scene(n, frames, seed):
+    """People doing a bounded random walk; detections shuffled, with pixel noise."""
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform((0, 0), (W, H), (n, 2))
+    vel = rng.normal(0, 6, (n, 2))
+    for _ in range(frames):
+        vel = 0.9 * vel + rng.normal(0, 2, (n, 2))
+        pos = np.clip(pos + vel, 0, (W - 1, H - 1))
+        order = rng.permutation(n)
+        yield order, np.trunc(pos[order] + rng.normal(0, 1.5, (n, 2)))
+
+def run(make, n, frames, seed, as_list):
+    tr = make()
+    owner = {}            # ground-truth person -> track id
+    switches = 0
+    dt = 0.0
+    for f, (order, centers) in enumerate(scene(n, frames, seed)):
+        arg = [tuple(c) for c in centers.tolist()] if as_list else centers
+        t0 = time.perf_counter()
+        tr.update(arg, f * 0.05)
+        dt += time.perf_counter() - t0
+        pos = tr.positions() if as_list else positions(tr)
+        at = {p: tid for tid, p in pos.items()}
+        for k, person in enumerate(order):
+            tid = at.get(tuple(centers[k]))
+            if tid is None:
+                continue
+            if person in owner and owner[person] != tid:
+                switches += 1
+            owner[person] = tid
+    return frames / dt, switches / frames
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tracks", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--frames", type=int, default=200)
+    ap.add_argument("--legacy-frames", type=int, default=20,
+                    help="frames for the O(T*D) python baseline at 100+ tracks")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    impls = [("legacy", LegacyTracker, True),
+             ("greedy", lambda: CentroidTracker(method="greedy"), False)]
+    if linear_sum_assignment is not None:
+        impls.append(("hungarian", lambda: CentroidTracker(method="hungarian"), False))
+    print(f"{'tracks':>7} {'impl':>10} {'frames/s':>11} {'id switch/frame':>16}")
+    for n in args.tracks:
+        for name, make, legacy in impls:
+            frames = args.frames if not legacy or n < 100 else args.legacy_frames
+            fps, sw = run(make, n, frames, args.seed, legacy)
+            print(f"{n:>7} {name:>10} {fps:>11.1f} {sw:>16.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# Array-backed centroid tracker: NumPy distance matrix, gated Hungarian (SciPy,
+# when installed) or mutual-nearest greedy assignment, structured-array state.
+import time
+import numpy as np
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # optional; greedy assignment is used without it
+    linear_sum_assignment = None
+
+TRACK = np.dtype([("id", np.int64), ("cx", np.float32), ("cy", np.float32),
+                  ("last", np.float64), ("age", np.int32)])
+
+def greedy_assign(d2, gate2):
+    """Globally greedy matching (closest pair first) on a squared-distance matrix.
+
+    Each round accepts every mutual nearest pair, which is exactly the set the
+    closest-first order would take next; rounds repeat on what is left.
+    """
+    d = np.where(d2 <= gate2, d2, np.inf)
+    rows, cols = [], []
+    while d.size:
+        r_best = d.argmin(axis=1)
+        r_val = d[np.arange(d.shape[0]), r_best]
+        live = np.isfinite(r_val)
+        if not live.any():
+            break
+        c_best = d.argmin(axis=0)
+        r = np.nonzero(live & (c_best[r_best] == np.arange(d.shape[0])))[0]
+        c = r_best[r]
+        rows.append(r); cols.append(c)
+        d[r, :] = np.inf
+        d[:, c] = np.inf
+    if not rows:
+        return np.empty(0, int), np.empty(0, int)
+    return np.concatenate(rows), np.concatenate(cols)
+
+def hungarian_assign(d2, gate2):
+    """Minimum total squared distance matching, then drop pairs outside the gate."""
+    big = gate2 * 4 + 1.0
+    r, c = linear_sum_assignment(np.where(d2 <= gate2, d2, big))
+    keep = d2[r, c] <= gate2
+    return r[keep], c[keep]
+
+class CentroidTracker:
+    """Tracks live in rows [0, n) of a structured array; unmatched tracks age out
+    after `max_age` frames, unmatched detections start new tracks."""
+    def __init__(self, max_dist=400.0, max_age=5, capacity=256, method="auto"):
+        if method == "auto":
+            method = "hungarian" if linear_sum_assignment is not None else "greedy"
+        if method == "hungarian" and linear_sum_assignment is None:
+            raise ImportError("hungarian assignment needs scipy")
+        self.gate2 = float(max_dist) ** 2
+        self.max_age, self.method = max_age, method
+        self.tracks = np.zeros(capacity, dtype=TRACK)
+        self.n = 0
+        self.next_id = 0
+
+    @property
+    def active(self):
+        return self.tracks[:self.n]
+
+    def update(self, centers, now=None):
+        """centers: (k, 2) array of pixel centroids. Returns the number of live tracks."""
+        now = time.time() if now is None else now
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        t = self.tracks[:self.n]
+        if self.n and len(centers):
+            dx = t["cx"][:, None] - centers[None, :, 0]
+            dy = t["cy"][:, None] - centers[None, :, 1]
+            d2 = dx * dx + dy * dy
+            assign = hungarian_assign if self.method == "hungarian" else greedy_assign
+            r, c = assign(d2, self.gate2)
+        else:
+            r = c = np.empty(0, int)
+        matched = np.zeros(self.n, bool); matched[r] = True
+        t["cx"][r], t["cy"][r] = centers[c, 0], centers[c, 1]
+        t["last"][r], t["age"][r] = now, 0
+        t["age"][~matched] += 1
+        keep = matched | (t["age"] <= self.max_age)
+        kept = t[keep]
+        used = np.zeros(len(centers), bool); used[c] = True
+        fresh = centers[~used]
+        n = len(kept) + len(fresh)
+        if n > len(self.tracks):
+            self.tracks = np.zeros(max(n, 2 * len(self.tracks)), dtype=TRACK)
+        self.tracks[:len(kept)] = kept
+        new = self.tracks[len(kept):n]
+        new["id"] = np.arange(self.next_id, self.next_id + len(fresh))
+        new["cx"], new["cy"] = fresh[:, 0], fresh[:, 1]
+        new["last"], new["age"] = now, 0
+        self.next_id += len(fresh)
+        self.n = n
+        return n
\ No newline at end of file
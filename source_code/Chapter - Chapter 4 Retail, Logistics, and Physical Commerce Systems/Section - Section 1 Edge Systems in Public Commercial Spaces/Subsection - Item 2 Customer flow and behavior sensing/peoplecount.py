@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 import paho.mqtt.client as mqtt
 from tflite_runtime.interpreter import Interpreter  # lightweight runtime
+from centroidtracker import CentroidTracker
 
 MODEL_PATH = "/opt/models/person_detector.tflite"
 MQTT_BROKER = "192.0.2.10"
@@ -11,9 +12,8 @@ MQTT_TOPIC = "store/entrance/count"
 CAM_INDEX = 0
 CONF_THRESH = 0.5
 
-# simple centroid tracker state
-next_id = 0
-tracks = {}
+# array-backed centroid tracker; Hungarian when scipy is installed, else greedy
+tracker = CentroidTracker(max_dist=400, max_age=5)
 
 def load_interpreter(path):
     interp = Interpreter(model_path=path, num_threads=2)
@@ -29,44 +29,17 @@ def detect(interp, frame):
     interp.invoke()
     out = interp.get_tensor(interp.get_output_details()[0]['index'])
     # out assumed N x 6 boxes: [ymin,xmin,ymax,xmax,score,class]
-    detections = []
-    for d in out[0]:
-        score = float(d[4])
-        if score < CONF_THRESH: continue
-        ymin,xmin,ymax,xmax = map(float, d[0:4])
-        detections.append((xmin,ymin,xmax,ymax,score))
-    return detections
+    out = out[0]
+    out = out[out[:, 4] >= CONF_THRESH]
+    # returned as K x 5: [xmin,ymin,xmax,ymax,score]
+    return out[:, [1, 0, 3, 2, 4]].astype(np.float32)
 
 def update_tracks(detections, frame_shape):
-    global next_id, tracks
-    centers = []
-    for (xmin,ymin,xmax,ymax,_) in detections:
-        fx = int((xmin + xmax)/2 * frame_shape[1])
-        fy = int((ymin + ymax)/2 * frame_shape[0])
-        centers.append((fx,fy))
-    # greedy association by distance
-    assigned = set()
-    new_tracks = {}
-    for tid,(cx,cy,last,age) in list(tracks.items()):
-        best = None; bestd = 1e9
-        for i,c in enumerate(centers):
-            if i in assigned: continue
-            d = (cx-c[0])**2 + (cy-c[1])**2
-            if d < bestd:
-                bestd,i = d,i
-                best = c
-        if best and bestd < 400**2:  # distance threshold
-            new_tracks[tid] = (best[0],best[1],time.time(),0)
-            assigned.add(i)
-        else:
-            if age < 5:
-                new_tracks[tid] = (cx,cy,last,age+1)
-    # add unassigned detections
-    for i,c in enumerate(centers):
-        if i in assigned: continue
-        new_tracks[next_id] = (c[0],c[1],time.time(),0); next_id+=1
-    tracks = new_tracks
-    return len(tracks)
+    d = np.asarray(detections, dtype=np.float32).reshape(-1, 5)
+    centers = np.empty((len(d), 2), dtype=np.float32)
+    centers[:, 0] = np.trunc((d[:, 0] + d[:, 2]) / 2 * frame_shape[1])
+    centers[:, 1] = np.trunc((d[:, 1] + d[:, 3]) / 2 * frame_shape[0])
+    return tracker.update(centers)
 
 def mqtt_connect():
     client = mqtt.Client()
@@ -2,8 +2,8 @@
 # Production-ready: TLS, reconnect, simple checks, configurable by env
 import os, time, json, socket, ssl
 import paho.mqtt.client as mqtt
-import psutil
 import onnxruntime as rt
+from healthcollector import HealthCollector, DeltaEncoder
 
 BROKER = os.getenv("MQTT_BROKER","broker.example.local")
 PORT = int(os.getenv("MQTT_PORT","8883"))
@@ -13,6 +13,10 @@ KEY = os.getenv("TLS_KEY","/etc/ssl/private/device.key")
 CA = os.getenv("TLS_CA","/etc/ssl/certs/ca.pem")
 TOPIC = f"edge/health/{CLIENT_ID}"
 MODEL_PATH = os.getenv("MODEL_PATH","/opt/models/health_probe.onnx")
+SAMPLE_PERIOD = float(os.getenv("SAMPLE_PERIOD","5"))    # local sampling; cheap now
+PROBE_PERIOD = float(os.getenv("PROBE_PERIOD","5"))      # inference latency probe
+HEARTBEAT = float(os.getenv("HEARTBEAT","60"))           # max silence when nothing changes
+KEYFRAME = float(os.getenv("KEYFRAME","600"))            # full state for resync
 
 # prepare ONNX session; failure here is a visibility signal
 try:
@@ -20,18 +24,17 @@ try:
 except Exception as e:
     sess = None
 
+collector = HealthCollector(sess, probe_period=PROBE_PERIOD).start()
+encoder = DeltaEncoder(heartbeat_s=HEARTBEAT, keyframe_s=KEYFRAME)
+
 client = mqtt.Client(client_id=CLIENT_ID)
 client.tls_set(ca_certs=CA, certfile=CERT, keyfile=KEY, tls_version=ssl.PROTOCOL_TLSv1_2)
 client.tls_insecure_set(False)
+# deltas sent while disconnected may be lost; resync subscribers with full state
+client.on_connect = lambda c, u, f, rc: encoder.force_keyframe()
 
 def publish(payload):
-    client.publish(TOPIC, json.dumps(payload), qos=1)
-
-def measure_inference_latency():
-    if not sess: return None
-    import numpy as np
-    dummy = {sess.get_inputs()[0].name: (np.zeros(sess.get_inputs()[0].shape).astype('float32'))}
-    t0 = time.time(); sess.run(None, dummy); return time.time()-t0
+    client.publish(TOPIC, json.dumps(payload, separators=(",", ":")), qos=1)
 
 client.connect(BROKER, PORT)
 client.loop_start()
@@ -39,17 +42,12 @@ client.loop_start()
 backoff = 1
 while True:
     try:
-        payload = {
-            "ts": time.time(),
-            "uptime": int(time.time() - psutil.boot_time()),
-            "cpu_pct": psutil.cpu_percent(interval=0.5),
-            "mem_pct": psutil.virtual_memory().percent,
-            "temp_c": psutil.sensors_temperatures().get('cpu-thermal',[{"current":None}])[0]["current"],
-            "inf_latency": measure_inference_latency()
-        }
-        publish(payload)
+        # only fields that moved past their deadband, or a heartbeat/keyframe
+        payload = encoder.encode(collector.sample())
+        if payload:
+            publish(payload)
         backoff = 1
-        time.sleep(5)  # telemetry cadence; tune for bandwidth/energy
+        time.sleep(SAMPLE_PERIOD)
     except (socket.error, ssl.SSLError, mqtt.WebsocketConnectionError):
         time.sleep(backoff)
         backoff = min(backoff*2, 300)
\ No newline at end of file
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# Health collection for edgehealth: a latency probe on its own schedule feeding a
+# rolling histogram, non-blocking host metrics, and a delta encoder that decides
+# when a node actually has something to tell the broker.
+import threading, time
+import numpy as np
+import psutil
+
+class LatencyHistogram:
+    """Rolling histogram over the last `window` samples, log-spaced buckets.
+
+    Percentiles are read from cumulative bucket counts (upper bucket edge), so
+    record() and percentiles() cost the same however many samples are held.
+    """
+    def __init__(self, lo_s=1e-4, hi_s=10.0, buckets=80, window=256):
+        self.edges = np.geomspace(lo_s, hi_s, buckets)
+        self.counts = np.zeros(buckets + 1, np.int64)   # last bucket: > hi_s
+        self._ring = np.full(window, -1, np.int64)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        b = int(np.searchsorted(self.edges, seconds))
+        with self._lock:
+            i = self._n % len(self._ring)
+            old = self._ring[i]
+            if old >= 0:
+                self.counts[old] -= 1
+            self._ring[i] = b
+            self.counts[b] += 1
+            self._n += 1
+
+    def percentiles(self, qs=(50, 95, 99)):
+        """Seconds per quantile, or Nones before the first sample."""
+        with self._lock:
+            cum = np.cumsum(self.counts)
+        total = cum[-1]
+        if not total:
+            return [None] * len(qs)
+        idx = np.searchsorted(cum, np.ceil(np.asarray(qs) / 100.0 * total))
+        top = np.append(self.edges, np.inf)
+        return [float(top[i]) for i in idx]
+
+def probe_feed(sess):
+    """Build the probe input once; symbolic dimensions are pinned to 1."""
+    feed = {}
+    for meta in sess.get_inputs():
+        shape = [d if isinstance(d, int) and d > 0 else 1 for d in meta.shape]
+        dtype = np.int64 if "int64" in meta.type else np.float32
+        feed[meta.name] = np.zeros(shape, dtype)
+    return feed
+
+class HealthCollector:
+    """Cheap sample() for the publish loop; the slow parts run elsewhere.
+
+    The inference probe runs on its own thread every `probe_period` seconds,
+    cpu_percent is the non-blocking delta since the previous call, boot time is
+    read once and temperatures are re-read only every `temp_period` seconds.
+    """
+    def __init__(self, sess, probe_period=5.0, temp_period=30.0, sensor='cpu-thermal',
+                 hist=None):
+        self.sess = sess
+        self.probe_period, self.temp_period, self.sensor = probe_period, temp_period, sensor
+        self.hist = hist or LatencyHistogram()
+        self.probe_errors = 0   # consecutive failed probes
+        self._feed = probe_feed(sess) if sess else None
+        self._boot = psutil.boot_time()
+        self._temp, self._temp_at = None, float("-inf")
+        self._stop = threading.Event()
+        self._thread = None
+        psutil.cpu_percent(interval=None)   # prime: the first call has no baseline
+
+    def start(self):
+        if self.sess is not None:
+            self._thread = threading.Thread(target=self._probe_loop, name="health-probe",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.probe_period + 1.0)
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                self.sess.run(None, self._feed)
+                self.hist.record(time.perf_counter() - t0)
+                self.probe_errors = 0
+            except Exception:
+                self.probe_errors += 1
+            self._stop.wait(self.probe_period)
+
+    def _temperature(self, now):
+        if now - self._temp_at >= self.temp_period:
+            self._temp_at = now
+            read = getattr(psutil, "sensors_temperatures", None)
+            try:
+                entries = read().get(self.sensor) if read else None
+                self._temp = entries[0].current if entries else None
+            except OSError:
+                self._temp = None
+        return self._temp
+
+    def sample(self, now=None):
+        now = time.time() if now is None else now
+        p50, p95, p99 = self.hist.percentiles()
+        ms = lambda s: None if s is None else round(s * 1e3, 3)
+        return {
+            "uptime": int(now - self._boot),
+            "cpu_pct": psutil.cpu_percent(interval=None),
+            "mem_pct": psutil.virtual_memory().percent,
+            "temp_c": self._temperature(time.monotonic()),
+            "inf_ok": self.sess is not None and self.probe_errors == 0,
+            "inf_p50_ms": ms(p50), "inf_p95_ms": ms(p95), "inf_p99_ms": ms(p99),
+        }
+
+# field -> (absolute, relative) change that counts as news; fields not listed
+# are sent whenever they differ at all
+DEADBANDS = {"cpu_pct": (5.0, 0.0), "mem_pct": (2.0, 0.0), "temp_c": (1.0, 0.0),
+             "inf_p50_ms": (0.5, 0.2), "inf_p95_ms": (0.5, 0.2), "inf_p99_ms": (0.5, 0.2)}
+SKIP = ("uptime",)   # derivable from the keyframe's ts/uptime
+
+class DeltaEncoder:
+    """Turns samples into keyframes and deltas, or None when nothing is worth sending.
+
+    A payload goes out when some field moves past its deadband (so a busy node
+    reports every sample), otherwise only as a heartbeat every `heartbeat_s`.
+    Every `keyframe_s`, and after force_keyframe() (e.g. on reconnect), the full
+    state is sent so receivers can resynchronise after a missed seq.
+    """
+    def __init__(self, deadbands=DEADBANDS, heartbeat_s=60.0, keyframe_s=600.0, skip=SKIP):
+        self.deadbands, self.heartbeat_s, self.keyframe_s = deadbands, heartbeat_s, keyframe_s
+        self.skip = skip
+        self.seq = 0
+        self._sent = {}
+        self._last_tx = self._last_key = float("-inf")
+
+    def force_keyframe(self):
+        self._last_key = float("-inf")
+
+    def _moved(self, k, old, new):
+        if old is None or new is None or k not in self.deadbands:
+            return old != new
+        a, r = self.deadbands[k]
+        return abs(new - old) > max(a, r * abs(old))
+
+    def encode(self, sample, now=None):
+        now = time.time() if now is None else now
+        if now - self._last_key >= self.keyframe_s:
+            self._sent = dict(sample)
+            self._last_key = self._last_tx = now
+            self.seq += 1
+            return {"seq": self.seq, "ts": now, "key": 1, "v": dict(sample)}
+        delta = {k: v for k, v in sample.items()
+                 if k not in self.skip and (k not in self._sent or self._moved(k, self._sent[k], v))}
+        if not delta and now - self._last_tx < self.heartbeat_s:
+            return None
+        self._sent.update(delta)
+        self._last_tx = now
+        self.seq += 1
+        return {"seq": self.seq, "ts": now, "v": delta}
+
+def apply_delta(state, payload):
+    """Receiver side: fold a payload into `state`. Returns False on a seq gap that
+    a later keyframe has to repair (the delta is still applied)."""
+    ok = payload.get("key") or payload["seq"] == state.get("_seq", 0) + 1
+    if payload.get("key"):
+        state.clear()
+    state.update(payload["v"])
+    state["_seq"], state["_ts"] = payload["seq"], payload["ts"]
+    return bool(ok)
\ No newline at end of file
@@ -4,6 +4,7 @@ import time, json
 import numpy as np
 from smbus2 import SMBus
 import paho.mqtt.client as mqtt
+from failurerate import WindowedRate  # Chapter 1 failure counters, deployed alongside
 
 I2C_BUS = 1
 SENSOR_ADDR = 0x40
@@ -14,6 +15,9 @@ MQTT_TOPIC = 'farm/edge/health'
 alpha = 0.05                      # EWMA smoothing
 ewma_bias = 0.0
 ewma_var = 1.0
+OUTLIER_SIGMA = 3.0               # residual beyond this many std counts as a fault
+# one sample a minute, so windows of 10 min / 1 h / 6 h with 1 min buckets
+faults = WindowedRate((600, 3600, 21600), bucket_s=60)
 
 def read_sensor(bus):
     # Replace with specific sensor read; this reads two bytes.
@@ -38,22 +42,36 @@ def main():
     client.loop_start()
     try:
         while True:
-            y = read_sensor(bus)
+            try:
+                y = read_sensor(bus)
+            except OSError as e:
+                faults.record(False)      # I2C read failed
+                # still report: silence is indistinguishable from a dead node
+                publish(client, {'timestamp': int(time.time()), 'status': 'degraded',
+                                 'value': None, 'error': f'i2c read failed: {e}',
+                                 'faults': faults.snapshot()})
+                time.sleep(60)
+                continue
             ref = get_spatial_reference()
             if ref is not None:
                 residual = y - ref
+                faults.record(abs(residual - ewma_bias) <= OUTLIER_SIGMA * np.sqrt(ewma_var))
                 ewma_bias = alpha * residual + (1-alpha) * ewma_bias
                 ewma_var = alpha * (residual - ewma_bias)**2 + (1-alpha) * ewma_var
                 health = {
                     'timestamp': int(time.time()),
+                    'status': 'ok',
                     'value': y,
                     'ref': ref,
                     'ewma_bias': float(ewma_bias),
-                    'ewma_std': float(np.sqrt(ewma_var))
+                    'ewma_std': float(np.sqrt(ewma_var)),
+                    'faults': faults.snapshot()
                 }
             else:
                 # Fallback to internal variance check
-                health = {'timestamp': int(time.time()), 'value': y, 'ewma_bias': None}
+                faults.record(True)
+                health = {'timestamp': int(time.time()), 'status': 'ok', 'value': y, 'ewma_bias': None,
+                          'faults': faults.snapshot()}
             publish(client, health)
             time.sleep(60)            # sampling cadence; tune per deployment
     finally: